@@ -0,0 +1,73 @@
+"""
+Analytics Benchmark
+Online per-snapshot statistics vs recomputing them from the full history
+
+Also checks that the online results, persisted through JSON state at
+every run, equal the full recomputation.
+
+Usage:
+    python -m benchmarks.bench_analytics
+"""
+
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.analytics import PerformanceStats, full_stats, update_analytics
+
+
+def make_history(n, seed=0, start=datetime(2024, 1, 1)):
+    rng = random.Random(seed)
+    values = {'AgentClaude': 1000.0, 'RoboQuant': 1000.0, 'WhaleHunter': 1000.0}
+    history = []
+    for i in range(n):
+        for name in values:
+            if rng.random() < 0.7:  # Flat periods while out of the market
+                values[name] *= math.exp(rng.gauss(0, 0.02))
+        history.append({
+            'timestamp': (start + timedelta(hours=12 * i)).isoformat(),
+            'btc_price': 42000.0,
+            'bots': dict(values)
+        })
+    return history
+
+
+def check(online, reference):
+    for key, expected in reference.items():
+        value = online[key]
+        if isinstance(expected, float) and math.isnan(expected):
+            assert math.isnan(value), (key, value, expected)
+        else:
+            assert math.isclose(value, expected, rel_tol=1e-9, abs_tol=1e-15), (key, value, expected)
+
+
+def main():
+    print(f"{'snapshots':>10} {'online/snapshot':>16} {'full recompute':>15} {'speedup':>8}")
+    for n in [1_000, 10_000, 100_000]:
+        history = make_history(n)
+        
+        # One run per snapshot, with the state round-tripped through JSON
+        state = {}
+        start = time.perf_counter()
+        for snapshot in history:
+            update_analytics(state, [snapshot])
+            state = json.loads(json.dumps(state))
+        online_s = (time.perf_counter() - start) / n
+        
+        start = time.perf_counter()
+        references = {name: full_stats(history, name) for name in history[0]['bots']}
+        full_s = time.perf_counter() - start
+        
+        for name, reference in references.items():
+            stats = PerformanceStats()
+            stats.load_state(state['analytics'][name])
+            check(stats.summary(), reference)
+        
+        print(f"{n:>10,} {online_s * 1e6:>13.1f} µs {full_s * 1000:>12.1f} ms {full_s / online_s:>7.0f}x")
+    print("✅ Online statistics match the full recomputation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Backfill Benchmark
+Throughput of the paginated backfill against a slow, rate-limited exchange
+
+Fetches 60 days of 1m candles (87 pages) from a ThrottledExchange with
+200 ms latency, a 20 requests/s limit and 2% failed requests, with a
+growing number of workers, and checks the stored series is complete.
+
+Usage:
+    python -m benchmarks.bench_backfill
+"""
+
+import contextlib
+import io
+import shutil
+import tempfile
+
+import numpy as np
+
+from src.backfill import backfill
+from src.fakes import ThrottledExchange
+from src.market import TIMEFRAME_MS, MarketDataClient
+from src.store import CandleStore
+
+
+DAYS = 60
+
+
+def run(workers, rate=None):
+    exchange = ThrottledExchange(latency=0.2, rate_limit=20.0, failure_rate=0.02)
+    step = TIMEFRAME_MS['1m']
+    end = exchange.now_ms - exchange.now_ms % step
+    start = end - DAYS * 86_400_000
+    root = tempfile.mkdtemp()
+    try:
+        store = CandleStore(root)
+        with contextlib.redirect_stdout(io.StringIO()):  # Retry warnings
+            stats = backfill(store, 'BTC/USDT', '1m', start=start, end=end, client=MarketDataClient(exchange),
+                             workers=workers, rate=rate, backoff=0.1)
+        timestamps = store.read('BTC/USDT', '1m')['timestamp']
+        assert len(timestamps) == DAYS * 1440, len(timestamps)
+        assert timestamps[0] == start and np.all(np.diff(timestamps) == step)
+    finally:
+        shutil.rmtree(root)
+    return stats, exchange
+
+
+def main():
+    print(f"{'workers':>8} {'limiter':>10} {'pages/s':>8} {'candles/s':>10} {'requests':>9} {'retries':>8} {'429s':>5} {'seconds':>8}")
+    for workers, rate in [(1, None), (4, None), (8, None), (8, 1000.0)]:
+        stats, exchange = run(workers, rate)
+        label = 'exchange' if rate is None else 'off'
+        print(f"{workers:>8} {label:>10} {stats['pages'] / stats['seconds']:>8.1f} "
+              f"{stats['candles'] / stats['seconds']:>10,.0f} {stats['requests']:>9} {stats['retries']:>8} "
+              f"{exchange.rejected:>5} {stats['seconds']:>8.1f}")
+    print("✅ Every run stored the full series in order without duplicates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Candle Buffer Benchmark
+Memory and per-tick conversion cost of list candles vs the ring buffer
+
+Usage:
+    python -m benchmarks.bench_candles
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.candles import CandleBuffer
+from src.features import FeatureStore
+from src.fakes import FakeExchange
+from src.store import CandleStore
+
+
+def per_call(func, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def allocated(build):
+    """Bytes allocated by build() that are still alive."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return value, size
+
+
+def main():
+    exchange = FakeExchange()
+    candles = exchange.fetch_ohlcv('BTC/USDT', '1m', limit=1000)
+    next_candle = exchange.candle('BTC/USDT', '1m', candles[-1][0] + 60_000)
+    
+    print("Memory of 1,000 candles")
+    payload = json.dumps(candles)
+    _, list_bytes = allocated(lambda: json.loads(payload))  # Fresh floats, as parsed from the exchange
+    buffer, buffer_bytes = allocated(lambda: CandleBuffer(capacity=1000))
+    buffer.extend(candles)
+    print(f"  list of lists   {list_bytes / 1024:8.1f} KiB")
+    print(f"  CandleBuffer    {buffer_bytes / 1024:8.1f} KiB (mirrored, capacity 1000)")
+    
+    print("\nReading the data the way bots do")
+    view = buffer.view(100)
+    listed = FeatureStore([list(row) for row in candles[-100:]])
+    assert view.close[-2] == listed.close[-2] and view[-2][4] == listed[-2][4]
+    print(f"  view[-2][4]          {per_call(lambda: view[-2][4], 20000):8.2f} µs (list rows built once per view)")
+    print(f"  view.close[-2]       {per_call(lambda: view.close[-2], 20000):8.2f} µs")
+    
+    # What each tick costs to hand the newest 100 candles to the bots
+    root = tempfile.mkdtemp()
+    try:
+        store = CandleStore(root)
+        store.append('BTC/USDT', '1m', candles)
+        rows = [list(row) for row in candles]
+        
+        def list_tick():
+            rows.append(list(next_candle))
+            rows.pop(0)
+            return FeatureStore(rows[-100:])
+        
+        def store_tick():
+            store.append('BTC/USDT', '1m', [next_candle])
+            return FeatureStore(store.read_rows('BTC/USDT', '1m', limit=100))
+        
+        def buffer_tick():
+            buffer.append(next_candle)
+            return buffer.view(100)
+        
+        print("\nPer tick: append one candle, give the newest 100 to the bots")
+        for label, tick in [('list + FeatureStore', list_tick), ('store rows (main)', store_tick), ('CandleBuffer view', buffer_tick)]:
+            print(f"  {label:<20} {per_call(tick):8.1f} µs")
+    finally:
+        shutil.rmtree(root)
+    
+    print("\npandas DataFrame of 1,000 candles")
+    columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+    print(f"  from list of lists   {per_call(lambda: pd.DataFrame(rows, columns=columns), 200):8.1f} µs")
+    print(f"  CandleBuffer.frame() {per_call(buffer.frame, 200):8.1f} µs (zero-copy: "
+          f"{np.shares_memory(buffer.frame().to_numpy(), buffer.array())})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Chart Benchmark
+Chart generation time against history length
+
+Usage:
+    python -m benchmarks.bench_chart
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.utils import generate_chart
+
+
+def make_history(n, start=datetime(2024, 1, 1)):
+    """Synthetic 12-hour snapshots for the three bots."""
+    history = []
+    for i in range(n):
+        history.append({
+            'timestamp': (start + timedelta(hours=12 * i)).isoformat(),
+            'btc_price': 100000.0,
+            'bots': {
+                'AgentClaude': 1000.0 + (i % 97) - 48,
+                'RoboQuant': 1000.0 + (i % 61) - 30,
+                'WhaleHunter': 1000.0 + (i % 37) - 18
+            }
+        })
+    return history
+
+
+def main(sizes=(100, 1_000, 10_000, 100_000)):
+    print(f"{'snapshots':>10} {'cold (s)':>10} {'warm (s)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'status.png')
+        cache = os.path.join(tmp, 'cache.npz')
+        for n in sizes:
+            history = make_history(n)
+            if os.path.exists(cache):
+                os.remove(cache)
+            
+            start = time.perf_counter()
+            generate_chart(history, output_file=output, cache_file=cache)
+            cold = time.perf_counter() - start
+            
+            # Next run: one new snapshot, everything else cached
+            history.extend(make_history(1, start=datetime(2024, 1, 1) + timedelta(hours=12 * n)))
+            start = time.perf_counter()
+            generate_chart(history, output_file=output, cache_file=cache)
+            warm = time.perf_counter() - start
+            
+            print(f"{n:>10} {cold:>10.3f} {warm:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Decision Latency Benchmark
+Sequential vs concurrent bot decisions with stubbed slow and hung bots
+
+Usage:
+    python -m benchmarks.bench_decisions
+"""
+
+import io
+import contextlib
+import time
+
+from src.bots import TradingBot
+from src.runner import decide_all
+
+
+class SlowBot(TradingBot):
+    """Stub bot whose decide() blocks like a network round-trip."""
+    
+    def __init__(self, name, delay, decision="BUY", timeout=None):
+        super().__init__(name, timeout=timeout)
+        self.delay = delay
+        self.decision = decision
+    
+    def decide(self, current_price, historical_data):
+        time.sleep(self.delay)
+        return self.decision
+
+
+def sequential(bots):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return {name: bot.decide(100.0, []) for name, bot in bots.items()}
+
+
+def main():
+    scenarios = {
+        '3 bots x 0.5s': {f"bot{i}": SlowBot(f"bot{i}", 0.5) for i in range(3)},
+        '10 bots x 0.2s': {f"bot{i}": SlowBot(f"bot{i}", 0.2) for i in range(10)},
+        '1 hung bot (1s timeout)': {
+            'fast': SlowBot('fast', 0.1),
+            'hung': SlowBot('hung', 3600, timeout=1.0),
+            'medium': SlowBot('medium', 0.3, decision="SELL")
+        }
+    }
+    
+    print(f"{'scenario':<26} {'sequential (s)':>15} {'concurrent (s)':>15}  decisions")
+    for label, bots in scenarios.items():
+        if 'hung' in bots:
+            seq = float('inf')  # Would never finish
+        else:
+            start = time.perf_counter()
+            sequential(bots)
+            seq = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        decisions, _ = decide_all(bots, 100.0, [])
+        conc = time.perf_counter() - start
+        
+        print(f"{label:<26} {seq:>15.2f} {conc:>15.2f}  {decisions}")
+
+
+if __name__ == "__main__":
+    main()
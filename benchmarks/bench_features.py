@@ -0,0 +1,39 @@
+"""
+Feature Store Benchmark
+Many indicator bots deciding on shared vs per-bot indicator computation
+
+Usage:
+    python -m benchmarks.bench_features
+"""
+
+import contextlib
+import io
+import time
+
+from src.bots import RoboQuant
+from src.fakes import FakeExchange
+from src.features import FeatureStore, clear_cache
+
+
+def main():
+    candles = FakeExchange().fetch_ohlcv('BTC/USDT', '1h', limit=1000)
+    price = candles[-1][4]
+    # Several strategies sharing a handful of RSI periods
+    bots = [RoboQuant(streaming=False, length=length) for length in (7, 14, 21, 28) for _ in range(25)]
+    
+    print(f"{len(bots)} RSI bots, {len(candles)} candles")
+    for label, shared in [('per-bot', False), ('shared', True)]:
+        clear_cache()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            features = FeatureStore(candles)
+            for bot in bots:
+                if not shared:
+                    clear_cache()
+                bot.decide(price, features if shared else list(candles))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<8} {elapsed * 1000:8.1f} ms ({elapsed / len(bots) * 1e6:7.1f} µs per bot)")
+
+
+if __name__ == "__main__":
+    main()
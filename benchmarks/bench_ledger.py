@@ -0,0 +1,59 @@
+"""
+Portfolio Ledger Benchmark
+PortfolioLedger.apply vs a loop of VirtualWallets over the same decisions
+
+Usage:
+    python -m benchmarks.bench_ledger [--wallets 10000] [--steps 200]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from src.bots import SIGNAL_CODES
+from src.ledger import PortfolioLedger
+from src.runner import execute_decision
+from src.wallet import VirtualWallet
+
+DECISIONS = {code: name for name, code in SIGNAL_CODES.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--wallets', type=int, default=10_000)
+    parser.add_argument('--steps', type=int, default=200)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    prices = 40_000 * np.exp(np.cumsum(rng.normal(0, 0.01, args.steps)))
+    codes = rng.choice([-1, 0, 1], size=(args.steps, args.wallets), p=[0.1, 0.8, 0.1]).astype(np.int8)
+    names = np.vectorize(DECISIONS.get, otypes=[object])(codes)
+    
+    wallets = [VirtualWallet() for _ in range(args.wallets)]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for step, price in enumerate(prices.tolist()):
+            for wallet, decision in zip(wallets, names[step]):
+                execute_decision(wallet, decision, price)
+    loop = time.perf_counter() - start
+    
+    ledger = PortfolioLedger(args.wallets)
+    start = time.perf_counter()
+    for step, price in enumerate(prices):
+        ledger.apply(codes[step], 'BTC', price)
+    vectorized = time.perf_counter() - start
+    
+    values = [wallet.get_total_value({'BTC': prices[-1]}) for wallet in wallets]
+    assert np.allclose(ledger.get_total_value({'BTC': prices[-1]}), values, rtol=1e-12)
+    updates = args.wallets * args.steps
+    print(f"{args.wallets:,} wallets x {args.steps} steps")
+    print(f"   VirtualWallet loop  {loop:>7.3f}s  ({updates / loop / 1e6:,.2f}M wallet-steps/s)")
+    print(f"   PortfolioLedger     {vectorized:>7.3f}s  ({updates / vectorized / 1e6:,.2f}M wallet-steps/s)")
+    print(f"✅ Same final values, {loop / vectorized:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Monte Carlo Benchmark
+100k seeded copies of the random strategies over a year of hourly candles
+
+Also checks that the vectorized wallets match backtest.simulate run on
+the same decision streams, one path at a time, and that the result does
+not depend on the number of workers.
+
+Usage:
+    python -m benchmarks.bench_montecarlo [--paths 100000]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.backtest import max_drawdown, simulate, simulate_batch
+from src.bots import AgentClaude, WhaleHunter
+from src.montecarlo import format_report, monte_carlo
+
+
+def hourly_year(seed=0):
+    """Random-walk hourly candles for one year."""
+    rng = np.random.default_rng(seed)
+    rows = 365 * 24
+    close = 42000 * np.exp(np.cumsum(rng.normal(0, 0.006, rows)))
+    timestamps = np.arange(rows, dtype=np.float64) * 3_600_000
+    return np.column_stack([timestamps, close, close, close, close, np.ones(rows)])
+
+
+def check(ohlcv, checked=20):
+    """Paths of simulate_batch equal simulate() on their own decision streams."""
+    close = ohlcv[:, 4]
+    sampler = WhaleHunter(seed=1).signal_sampler(1000, np.random.default_rng(1))
+    drawn = []
+    
+    def recording(n_candles):
+        signals = sampler(n_candles)
+        drawn.append(signals[:, :checked].copy())
+        return signals
+    
+    result = simulate_batch(close, recording, 1000, chunk_size=100)
+    signals = np.concatenate(drawn)
+    for path in range(checked):
+        expected = simulate(close, signals[:, path])
+        # Fees and slippage are folded into one rate per candle, so only the last bits differ
+        assert np.isclose(result['final_value'][path], expected['final_value'], rtol=1e-9, atol=0)
+        assert result['trades'][path] == expected['trades']
+        assert np.isclose(result['max_drawdown'][path], max_drawdown(expected['equity']), rtol=1e-9, atol=1e-12)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--paths', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    
+    ohlcv = hourly_year()
+    check(ohlcv)
+    short = ohlcv[:500]
+    serial = monte_carlo(WhaleHunter(), short, n_paths=60_000, seed=3, workers=1)
+    parallel = monte_carlo(WhaleHunter(), short, n_paths=60_000, seed=3, workers=2)
+    assert np.array_equal(serial['final_value'], parallel['final_value'])
+    print("✅ Vectorized wallets match backtest.simulate path by path, for any worker count\n")
+    
+    for bot in [WhaleHunter(), AgentClaude()]:
+        start = time.perf_counter()
+        result = monte_carlo(bot, ohlcv, n_paths=args.paths, seed=7, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        print(format_report(bot.name, result))
+        print(f"   ⏱️ {elapsed:.1f}s with {args.workers} worker(s) "
+              f"({args.paths * len(ohlcv) / elapsed / 1e6:,.0f}M path-candles/s)\n")
+
+
+if __name__ == "__main__":
+    main()
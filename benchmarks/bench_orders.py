@@ -0,0 +1,102 @@
+"""
+Order Engine Benchmark
+Heap-indexed order book vs scanning every open order per candle
+
+Usage:
+    python -m benchmarks.bench_orders
+"""
+
+import random
+import time
+
+from src.fakes import FakeExchange
+from src.orders import ORDER_KINDS, OrderBook
+from src.wallet import VirtualWallet
+
+
+def make_candles(n, volatility=0.002):
+    ex = FakeExchange(volatility=volatility)
+    step = 3_600_000
+    return [ex.candle('BTC/USDT', '1h', i * step) for i in range(n)]
+
+
+def place_random(book, wallets, n_orders, price, seed=0):
+    """Spread orders of every kind within ±20% of `price` over the wallets."""
+    rng = random.Random(seed)
+    kinds = list(ORDER_KINDS)
+    for i in range(n_orders):
+        kind = rng.choice(kinds)
+        level = price * rng.uniform(0.8, 1.2)
+        amount = 10.0 if kind == 'limit_buy' else rng.choice([None, 0.0001])
+        wallets[i % len(wallets)].place_order('BTC', kind, level, amount)
+
+
+def make_wallets(n_wallets, book):
+    wallets = [VirtualWallet(initial_usd=1e9, order_book=book) for _ in range(n_wallets)]
+    for wallet in wallets:
+        wallet.holdings['BTC'] = 1e3
+    return wallets
+
+
+def scan_candle(book, candle):
+    """Reference engine: check every open order against the candle."""
+    _, open_price, high, low, _ = candle[:5]
+    fills = []
+    for order in list(book.orders.values()):
+        direction = ORDER_KINDS[order.kind][1]
+        if direction == 'below' and low <= order.price:
+            fill = min(order.price, open_price)
+        elif direction == 'above' and high >= order.price:
+            fill = max(order.price, open_price)
+        else:
+            continue
+        del book.orders[order.id]
+        if order.wallet.fill_order(order, fill):
+            order.status = 'filled'
+            fills.append(order)
+        else:
+            order.status = 'rejected'
+    return fills
+
+
+def run(n_orders, n_wallets, candles, engine):
+    book = OrderBook()
+    wallets = make_wallets(n_wallets, book)
+    
+    start = time.perf_counter()
+    place_random(book, wallets, n_orders, candles[0][1])
+    place_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    filled = 0
+    for candle in candles:
+        filled += len(engine(book, candle))
+    process_s = time.perf_counter() - start
+    return place_s, process_s, filled, len(book)
+
+
+def main():
+    candles = make_candles(2_000)
+    heap_engine = lambda book, candle: book.process_candle('BTC', candle)
+    
+    print(f"{'engine':<6} {'orders':>9} {'wallets':>8} {'place/s':>12} {'candles/s':>11} {'filled':>8} {'open':>8}")
+    for n_orders, n_wallets in [(10_000, 100), (100_000, 1_000), (500_000, 1_000)]:
+        engines = [('heap', heap_engine)] + ([('scan', scan_candle)] if n_orders <= 10_000 else [])
+        for name, engine in engines:
+            place_s, process_s, filled, still_open = run(n_orders, n_wallets, candles, engine)
+            print(f"{name:<6} {n_orders:>9,} {n_wallets:>8,} {n_orders / place_s:>12,.0f} "
+                  f"{len(candles) / process_s:>11,.0f} {filled:>8,} {still_open:>8,}")
+    
+    # Placement and cancellation churn on a large book
+    book = OrderBook()
+    wallets = make_wallets(1_000, book)
+    place_random(book, wallets, 200_000, candles[0][1])
+    start = time.perf_counter()
+    for order_id in list(book.orders)[::2]:
+        book.cancel(order_id)
+    cancel_s = time.perf_counter() - start
+    print(f"\ncancelled 100,000 of 200,000 orders in {cancel_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Strategy Registry Benchmark
+Cost of a cold run with 200 registered strategies, by how many are due
+
+Each dummy strategy lives in its own module whose import does some work
+(standing in for the libraries a real strategy pulls in). Every run is
+measured in a fresh interpreter, like a cron invocation: build the
+registry, import and create the due bots, decide once. All 200 due is
+what every run cost when create_bots() built every strategy.
+
+Usage:
+    python -m benchmarks.bench_registry
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+N_STRATEGIES = 200
+
+MODULE = '''import math
+
+from src.bots import TradingBot
+
+TABLE = [math.sin(i) for i in range(20_000)]  # Stands in for importing the strategy's dependencies
+
+
+class Dummy(TradingBot):
+    def __init__(self, name, period=20):
+        super().__init__(name)
+        self.period = period
+    
+    def decide(self, current_price, historical_data):
+        closes = self.features(historical_data).close[-self.period:]
+        return "BUY" if current_price > closes.mean() else "HOLD"
+'''
+
+
+def child(config_path, now):
+    """One cold run: registry, due bots, one decision each. Prints JSON timings."""
+    started = time.perf_counter()
+    from src.fakes import FakeExchange
+    from src.runner import decide_all
+    from src.strategies import StrategyRegistry
+    
+    registry = StrategyRegistry()
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    registry.configure(config['strategies'])
+    candles = FakeExchange().fetch_ohlcv('BTC/USDT', '1h', limit=100)
+    setup = time.perf_counter()
+    
+    due = registry.due(config['schedule'], now)
+    bots = registry.create_bots(due)
+    created = time.perf_counter()
+    
+    decisions, _ = decide_all(bots, candles[-1][4], candles, timeout=10.0)
+    done = time.perf_counter()
+    assert len(decisions) == len(due)
+    print(json.dumps({
+        'registered': len(registry.strategies),
+        'due': len(due),
+        'setup': setup - started,
+        'create': created - setup,
+        'decide': done - created,
+        'modules': sum(1 for name in sys.modules if name.startswith('dummy_strategies.'))
+    }))
+
+
+def write_strategies(root):
+    package = os.path.join(root, 'dummy_strategies')
+    os.makedirs(package)
+    open(os.path.join(package, '__init__.py'), 'w').close()
+    for i in range(N_STRATEGIES):
+        with open(os.path.join(package, f"s{i:03d}.py"), 'w') as f:
+            f.write(MODULE)
+
+
+def write_config(root, active, now):
+    """200 strategies: `active` decide every run, the rest daily and already decided today."""
+    strategies = {}
+    schedule = {}
+    for i in range(N_STRATEGIES):
+        name = f"Dummy{i:03d}"
+        strategies[name] = {
+            'target': f"dummy_strategies.s{i:03d}:Dummy",
+            'interval': 0 if i < active else '1d',
+            'options': {'period': 10 + i % 40}
+        }
+        if i >= active:
+            schedule[name] = now
+    path = os.path.join(root, f"strategies_{active}.json")
+    with open(path, 'w') as f:
+        json.dump({'strategies': strategies, 'schedule': schedule}, f)
+    return path
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], float(sys.argv[3]))
+        return
+    
+    now = 1_700_000_000.0
+    with tempfile.TemporaryDirectory() as root:
+        write_strategies(root)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.getcwd(), os.environ.get('PYTHONPATH', '')]))
+        
+        print(f"{N_STRATEGIES} registered strategies, one cold run each")
+        print(f"{'due':>5} {'modules':>8} {'setup':>9} {'create':>9} {'decide':>9} {'total':>9}")
+        for active in [N_STRATEGIES, 50, 10, 1]:
+            path = write_config(root, active, now)
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_registry', '--child', path, str(now)],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            total = result['setup'] + result['create'] + result['decide']
+            print(f"{result['due']:>5} {result['modules']:>8} {result['setup'] * 1000:>6.0f} ms "
+                  f"{result['create'] * 1000:>6.0f} ms {result['decide'] * 1000:>6.0f} ms {total * 1000:>6.0f} ms")
+    print("✅ Only due strategies were imported and run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Snapshot Benchmark
+Load and save times of JSON state vs binary snapshots as history grows
+
+Usage:
+    python -m benchmarks.bench_snapshot
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.snapshot import read_snapshot, record_dtype, to_snapshots, write_snapshot
+from src.utils import load_state, save_state
+
+
+BOTS = ['AgentClaude', 'RoboQuant', 'WhaleHunter']
+STATE = {'bots': {name: {'usd_balance': 1000.0, 'holdings': {}} for name in BOTS}, 'strategies': {}}
+
+
+def make_records(n, seed=0):
+    rng = np.random.default_rng(seed)
+    records = np.zeros(n, dtype=record_dtype(len(BOTS)))
+    records['timestamp'] = 1_704_067_200_000_000 + np.arange(n) * 43_200_000_000
+    records['btc_price'] = 42_000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    records['bots'] = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, (n, len(BOTS))), axis=0))
+    return records
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    json_path = os.path.join(directory, 'data.json')
+    snap_path = os.path.join(directory, 'data.snap')
+    
+    print(f"{'snapshots':>10} {'json save':>10} {'json load':>10} {'snap save':>10} "
+          f"{'mmap load':>10} {'+verify':>10} {'load_state':>11} {'MB':>7}")
+    for n in [10_000, 100_000, 1_000_000, 5_000_000]:
+        records = make_records(n)
+        
+        json_save = json_load = '-'
+        if n <= 100_000:  # Pretty-printed JSON gets impractical beyond this
+            state = dict(STATE, history=to_snapshots(records, BOTS))
+            seconds, _ = timed(lambda: save_state(state, json_path))
+            json_save = f"{seconds * 1000:.0f} ms"
+            seconds, loaded = timed(lambda: load_state(json_path))
+            json_load = f"{seconds * 1000:.0f} ms"
+            assert len(loaded['history']) == n
+        
+        save_s, _ = timed(lambda: write_snapshot(snap_path, STATE, records, bots=BOTS))
+        mmap_s, snapshot = timed(lambda: read_snapshot(snap_path, verify=False))
+        verify_s, _ = timed(lambda: read_snapshot(snap_path))
+        state_s, loaded = timed(lambda: load_state(snap_path, names=BOTS))
+        assert len(loaded['history']) == n
+        assert np.array_equal(snapshot['history'], records)
+        size_mb = os.path.getsize(snap_path) / 1e6
+        del snapshot, loaded
+        
+        print(f"{n:>10,} {json_save:>10} {json_load:>10} {save_s * 1000:>7.0f} ms "
+              f"{mmap_s * 1000:>7.2f} ms {verify_s * 1000:>7.0f} ms {state_s * 1000:>8.0f} ms {size_mb:>7.1f}")
+    
+    for path in (json_path, snap_path):
+        if os.path.exists(path):
+            os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Startup Benchmark
+Cold-start cost of a cron run: import time and time to first decision
+
+Each measurement runs in a fresh interpreter so nothing is cached.
+Exits with status 1 if a heavy dependency is imported by `import main`
+or a budget is exceeded, so it can guard against regressions in CI.
+
+Usage:
+    python -m benchmarks.bench_startup [--import-budget 0.3] [--decision-budget 1.0]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only loaded on the code paths that actually need them
+HEAVY_MODULES = ['pandas', 'pandas_ta', 'matplotlib', 'ccxt', 'anthropic', 'numpy']
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+heavy = [m for m in %r if m in sys.modules]
+print(json.dumps({'import_s': elapsed, 'heavy': heavy}))
+""" % (HEAVY_MODULES,)
+
+DECISION_PROBE = """
+import io, json, sys, time, contextlib
+start = time.perf_counter()
+import main
+from src.bots import RoboQuant
+from src.fakes import FakeExchange
+from src.market import MarketDataClient
+from src.utils import get_historical_prices
+
+client = MarketDataClient(FakeExchange())
+with contextlib.redirect_stdout(io.StringIO()):
+    candles = get_historical_prices(limit=100, client=client)
+    decision = RoboQuant().decide(candles[-1][4], candles)
+elapsed = time.perf_counter() - start
+print(json.dumps({'decision_s': elapsed, 'decision': decision, 'modules': len(sys.modules)}))
+"""
+
+
+def probe(code):
+    """Run code in a fresh interpreter and return its JSON output."""
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--import-budget', type=float, default=0.3, help='Max seconds for `import main`')
+    parser.add_argument('--decision-budget', type=float, default=1.0, help='Max seconds to first decision')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    imports = [probe(IMPORT_PROBE) for _ in range(args.repeat)]
+    decisions = [probe(DECISION_PROBE) for _ in range(args.repeat)]
+    
+    import_s = min(r['import_s'] for r in imports)
+    decision_s = min(r['decision_s'] for r in decisions)
+    heavy = imports[0]['heavy']
+    
+    print(f"import main:        {import_s * 1000:8.1f} ms (budget {args.import_budget * 1000:.0f} ms)")
+    print(f"first decision:     {decision_s * 1000:8.1f} ms (budget {args.decision_budget * 1000:.0f} ms)")
+    print(f"heavy on import:    {', '.join(heavy) or 'none'}")
+    
+    failures = []
+    if heavy:
+        failures.append(f"heavy modules imported by main: {heavy}")
+    if import_s > args.import_budget:
+        failures.append("import budget exceeded")
+    if decision_s > args.decision_budget:
+        failures.append("decision budget exceeded")
+    
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
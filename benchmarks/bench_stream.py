@@ -0,0 +1,122 @@
+"""
+Streaming Simulation Benchmark
+Peak RSS and throughput of the chunked pipeline as the dataset grows
+
+Each size is simulated in a fresh process so its peak RSS is its own.
+
+Usage:
+    python -m benchmarks.bench_stream                   # 1M, 10M and 100M minute candles
+    python -m benchmarks.bench_stream --max-rows 10000000
+"""
+
+import argparse
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from src.store import CandleStore
+
+
+SYMBOL, TIMEFRAME = 'BTC/USDT', '1m'
+
+
+def write_series(store, n, chunk_size=1_000_000, seed=0):
+    """Random-walk minute candles, generated and appended chunk by chunk."""
+    rng = np.random.default_rng(seed)
+    last_close = 42_000.0
+    for offset in range(0, n, chunk_size):
+        size = min(chunk_size, n - offset)
+        close = last_close * np.exp(np.cumsum(rng.normal(0, 0.0008, size)))
+        open_ = np.concatenate([[last_close], close[:-1]])
+        spread = 1 + rng.random(size) * 0.0005
+        chunk = np.column_stack([
+            (offset + np.arange(size)) * 60_000.0,
+            open_,
+            np.maximum(open_, close) * spread,
+            np.minimum(open_, close) / spread,
+            close,
+            rng.random(size) * 10
+        ])
+        store.append(SYMBOL, TIMEFRAME, chunk)
+        last_close = close[-1]
+
+
+def peak_rss_mb():
+    """High-water RSS of this process (VmHWM), in MB."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def reset_peak_rss():
+    """Restart the high-water mark from the current RSS (Linux); a
+    subprocess otherwise inherits the parent's peak."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def child(root, chunk_size):
+    """Simulate RoboQuant over the stored series and report peak RSS."""
+    from src.bots import RoboQuant
+    from src.stream import simulate_stream
+    
+    reset_peak_rss()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    result = simulate_stream(RoboQuant(streaming=False), CandleStore(root).iter_chunks(SYMBOL, TIMEFRAME, chunk_size))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'seconds': elapsed,
+        'candles': result['candles'],
+        'trades': result['trades'],
+        'baseline_rss_mb': baseline,
+        'peak_rss_mb': peak_rss_mb()
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Peak RSS of the streaming simulation')
+    parser.add_argument('--max-rows', type=int, default=100_000_000)
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        child(args.child, args.chunk_size)
+        return
+    
+    print(f"chunk size {args.chunk_size:,} candles")
+    print(f"{'candles':>12} {'seconds':>8} {'candles/s':>11} {'trades':>9} {'import MB':>10} {'peak RSS MB':>12}")
+    for n in [1_000_000, 10_000_000, 100_000_000]:
+        if n > args.max_rows:
+            break
+        root = tempfile.mkdtemp()
+        try:
+            write_series(CandleStore(root), n)
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_stream', '--child', root, '--chunk-size', str(args.chunk_size)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+        finally:
+            shutil.rmtree(root)
+        print(f"{result['candles']:>12,} {result['seconds']:>8.1f} {result['candles'] / result['seconds']:>11,.0f} "
+              f"{result['trades']:>9,} {result['baseline_rss_mb']:>10.0f} {result['peak_rss_mb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Parameter Sweep Benchmark
+Scaling of the RoboQuant sweep at 1, 2, 4 and 8 worker processes
+
+Usage:
+    python -m benchmarks.bench_sweep [--rows 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.sweep import sweep
+
+
+def synthetic_ohlcv(rows, seed=0):
+    """Random-walk candles, 1 minute apart."""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, rows)))
+    timestamps = np.arange(rows, dtype=np.float64) * 60_000
+    return np.column_stack([timestamps, close, close, close, close, np.ones(rows)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    
+    ohlcv = synthetic_ohlcv(args.rows)
+    grid = dict(lengths=(7, 10, 14, 21), oversold=(20, 25, 30, 35), overbought=(65, 70, 75, 80))
+    combos = len(grid['lengths']) * len(grid['oversold']) * len(grid['overbought'])
+    print(f"{args.rows:,} candles, {combos} parameter sets")
+    print(f"{'workers':>8} {'time (s)':>10} {'speedup':>8}")
+    
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = sweep(ohlcv, workers=workers, **grid)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>10.2f} {baseline / elapsed:>7.2f}x")
+    
+    best = results[0]
+    print(f"Best: length={best['length']} oversold={best['oversold']} overbought={best['overbought']} "
+          f"final=${best['final_value']:.2f} drawdown={best['max_drawdown']:.1%} score={best['score']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
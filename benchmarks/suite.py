@@ -0,0 +1,220 @@
+"""
+Benchmark Suite
+End-to-end and per-phase timings against a fake exchange and LLM
+
+Everything runs offline in a temporary directory: market data comes
+from FakeExchange and AgentClaude talks to FakeAnthropic. Results are
+printed and can be written as JSON baselines to compare commits.
+
+Usage:
+    python -m benchmarks.suite                          # run and print
+    python -m benchmarks.suite --save-baseline main     # store benchmarks/baselines/main.json
+    python -m benchmarks.suite --compare main           # flag regressions against it
+    python -m benchmarks.suite --output results.json    # machine-readable results
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+
+def timed(func, repeat=5):
+    """Median wall time of func() over `repeat` calls, output suppressed."""
+    samples = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def make_snapshots(n, start=datetime(2024, 1, 1)):
+    return [
+        {
+            'timestamp': (start + timedelta(hours=12 * i)).isoformat(),
+            'btc_price': 100000.0 + i,
+            'bots': {'AgentClaude': 1000.0 + i % 7, 'RoboQuant': 1000.0 - i % 5, 'WhaleHunter': 1000.0}
+        }
+        for i in range(n)
+    ]
+
+
+def bench_end_to_end(results, repeat):
+    """Full main() runs: first run on empty state, then warm runs."""
+    import main
+    from src.fakes import FakeExchange, FakeAnthropic
+    from src.market import MarketDataClient
+    
+    client = MarketDataClient(FakeExchange())
+    llm = FakeAnthropic()
+    results['e2e_first_run_s'] = timed(lambda: main.main(market_client=client, llm_client=llm), repeat=1)
+    results['e2e_run_s'] = timed(lambda: main.main(market_client=client, llm_client=llm), repeat=repeat)
+
+
+def bench_phases(results, repeat):
+    """Each stage of a run in isolation."""
+    from src.bots import create_bots
+    from src.fakes import FakeExchange, FakeAnthropic
+    from src.history import HistoryLog
+    from src.market import MarketDataClient, held_symbols
+    from src.store import CandleStore
+    from src.utils import get_prices, get_historical_prices, load_state, save_state, generate_chart
+    
+    client = MarketDataClient(FakeExchange())
+    store = CandleStore()
+    state = load_state()
+    symbols = held_symbols([b['holdings'] for b in state['bots'].values()])
+    
+    results['phase_load_state_s'] = timed(load_state, repeat)
+    results['phase_fetch_prices_s'] = timed(lambda: get_prices(symbols, client=client), repeat)
+    results['phase_fetch_candles_s'] = timed(lambda: get_historical_prices(limit=100, store=store, client=client), repeat)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        candles = get_historical_prices(limit=100, store=store, client=client)
+    price = candles[-1][4]
+    for name, bot in create_bots(llm_client=FakeAnthropic()).items():
+        results[f"phase_decide_{name}_s"] = timed(lambda: bot.decide(price, candles), repeat)
+    
+    results['phase_save_state_s'] = timed(lambda: save_state(state), repeat)
+    history = HistoryLog()
+    results['phase_history_append_s'] = timed(lambda: history.append(make_snapshots(1)[0]), repeat)
+    snapshots = make_snapshots(500)
+    results['phase_generate_chart_s'] = timed(lambda: generate_chart(snapshots), repeat=max(1, repeat // 2))
+
+
+def bench_wallet(results, ops=20_000):
+    """VirtualWallet buy/sell throughput (operations per second)."""
+    from src.wallet import VirtualWallet
+    
+    wallet = VirtualWallet(initial_usd=1e12)
+    
+    def run():
+        for _ in range(ops // 2):
+            wallet.buy('BTC', 100000.0, 1000.0)
+            wallet.sell('BTC', 100000.0)
+    
+    results['wallet_ops_per_s'] = ops / timed(run, repeat=3)
+
+
+def bench_state_io(results, sizes):
+    """State and history I/O as the number of snapshots grows."""
+    from src.history import HistoryLog
+    from src.utils import load_state, save_state
+    
+    for n in sizes:
+        snapshots = make_snapshots(n)
+        
+        # Legacy layout: whole history inside data.json
+        legacy = {'bots': {}, 'history': snapshots}
+        results[f"legacy_save_{n}_s"] = timed(lambda: save_state(legacy, 'legacy.json'), repeat=3)
+        results[f"legacy_load_{n}_s"] = timed(lambda: load_state('legacy.json'), repeat=3)
+        
+        # Current layout: append-only log next to a small data.json
+        history = HistoryLog(f"history_{n}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            history.extend(snapshots)
+        results[f"history_append_{n}_s"] = timed(lambda: history.append(snapshots[-1]), repeat=3)
+        results[f"history_read_{n}_s"] = timed(history.read, repeat=3)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(BASELINE_DIR)
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print each metric against the baseline and return the regressions.
+    
+    Metrics ending in _per_s are throughputs (higher is better), all
+    others are durations (lower is better).
+    """
+    regressions = []
+    print(f"\n{'metric':<34} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for metric, value in results.items():
+        old = baseline['results'].get(metric)
+        if not old:
+            continue
+        ratio = (old / value) if metric.endswith('_per_s') else (value / old)
+        flag = " ❌" if ratio > tolerance else ""
+        print(f"{metric:<34} {old:>12.6g} {value:>12.6g} {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append(metric)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5, help='Samples per timing (median is kept)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='History lengths for the state I/O benchmark')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--save-baseline', metavar='NAME', help='Store results as a named baseline')
+    parser.add_argument('--compare', metavar='NAME', help='Compare against a named baseline')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='Allowed slowdown ratio')
+    args = parser.parse_args()
+    
+    sys.path.insert(0, os.path.dirname(BASELINE_DIR))
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            bench_end_to_end(results, args.repeat)
+            bench_phases(results, args.repeat)
+            bench_wallet(results)
+            bench_state_io(results, args.sizes)
+        finally:
+            os.chdir(cwd)
+    
+    report = {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+    
+    for metric, value in results.items():
+        unit = 'ops/s' if metric.endswith('_per_s') else 'ms'
+        shown = value if unit == 'ops/s' else value * 1000
+        print(f"{metric:<34} {shown:>14,.3f} {unit}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, f"{args.save_baseline}.json"), 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline '{args.save_baseline}' saved")
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json")) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) vs '{args.compare}' ({baseline.get('revision')})")
+            sys.exit(1)
+        print(f"\n✅ No regressions vs '{args.compare}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,19 @@ Simulates a trading competition between 3 different strategies:
 Runs automatically via GitHub Actions every 12 hours.
 """
 
+import os
 from datetime import datetime
 from src.wallet import VirtualWallet
-from src.bots import create_bots
+from src.orders import OrderBook
+from src.strategies import get_registry
+from src.store import CandleStore
+from src.market import held_symbols
+from src.history import HistoryLog
+from src.analytics import PerformanceStats, format_summary, update_analytics
+from src.runner import decide_all, execute_decision, process_orders, DEFAULT_TIMEOUT
+from src.metrics import RunMetrics
 from src.utils import (
-    get_btc_price,
+    get_prices,
     get_historical_prices,
     save_state,
     load_state,
@@ -21,38 +29,87 @@ from src.utils import (
 )
 
 
-def main():
-    """Main execution function."""
+def main(market_client=None, llm_client=None, clock=datetime.now, seed=None, chart=True, metrics=None):
+    """
+    Main execution function.
+    
+    Args:
+        market_client (MarketDataClient): Market data source, shared Binance client by default
+        llm_client: Anthropic-compatible client for AgentClaude, built from the API key by default
+        clock (callable): Returns the current datetime (simulated time in replays)
+        seed (int or str): Seed for the bots' RNGs (None = unseeded)
+        chart (bool): Regenerate status.png at the end of the run
+        metrics (RunMetrics): Run instrumentation, configured from the environment by default
+    """
+    metrics = metrics or RunMetrics.from_env()
+    with metrics.session():
+        run(metrics, market_client, llm_client, clock, seed, chart)
+
+
+def run(metrics, market_client, llm_client, clock, seed, chart):
+    """
+    One trading run, with each phase timed in `metrics` (see main()).
+    """
+    now = clock()
     
     print("=" * 60)
     print("🤖 PAPER TRADING BOT - Trading Competition")
     print("=" * 60)
-    print(f"⏰ Execution Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"⏰ Execution Time: {now.strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     
     # Load previous state
-    state = load_state()
-    if not state:
-        print("❌ Failed to load state. Exiting.")
-        return
+    with metrics.phase('load_state'):
+        state_file = os.getenv('STATE_FILE', 'data.json')
+        registry = get_registry()
+        state = load_state(state_file, now=now, names=registry.enabled())
+        if not state:
+            print("❌ Failed to load state. Exiting.")
+            return
+        
+        # Snapshots live in an append-only log, not in data.json
+        history = HistoryLog(clock=clock)
+        legacy_history = state.pop('history', None)
+        if legacy_history:
+            if not history.read():
+                history.extend(legacy_history)
+                print(f"📦 Migrated {len(legacy_history)} snapshots from {state_file} to {history.directory}/")
+            else:
+                state['history'] = legacy_history  # Saved back with the state, never dropped
+                print(f"⚠️ {len(legacy_history)} snapshots in {state_file} not migrated: "
+                      f"{history.directory}/ already has history")
+        
+        # Performance statistics are updated per snapshot; backfill them once
+        if 'analytics' not in state:
+            update_analytics(state, history.read())
     
     # Fetch current market data
     print("\n📊 Fetching Market Data...")
-    current_price = get_btc_price()
-    
-    if not current_price:
-        print("❌ Failed to fetch BTC price. Exiting.")
-        return
+    with metrics.phase('fetch_data'):
+        symbols = held_symbols([bot_state['holdings'] for bot_state in state['bots'].values()])
+        current_prices = get_prices(symbols, client=market_client)
+        current_price = current_prices.get('BTC')
+        
+        if not current_price:
+            print("❌ Failed to fetch BTC price. Exiting.")
+            return
+        
+        historical_data = get_historical_prices(limit=100, store=CandleStore(), client=market_client)
     
-    historical_data = get_historical_prices(limit=100)
+    # Create only the bots whose decision interval has elapsed (the others hold)
+    schedule = state.get('schedule', {})
+    due = registry.due(schedule, now.timestamp())
+    bots = registry.create_bots(due, llm_client=llm_client, seed=seed, clock=lambda: clock().timestamp())
     
-    # Create bots
-    bots = create_bots()
+    # Restore persisted bot state (e.g. streaming indicators)
+    for bot_name, bot in bots.items():
+        bot.load_state(state.get('strategies', {}).get(bot_name, {}))
     
-    # Initialize wallets for each bot
+    # Initialize wallets for each enabled strategy, with one shared order book
+    order_book = OrderBook()
     wallets = {}
-    for bot_name, bot in bots.items():
-        wallet = VirtualWallet()
+    for bot_name in registry.enabled():
+        wallet = VirtualWallet(order_book=order_book)
         wallet.load_state(state['bots'][bot_name])
         wallets[bot_name] = wallet
     
@@ -61,7 +118,7 @@ def main():
     print("=" * 60)
     
     for bot_name, wallet in wallets.items():
-        total_value = wallet.get_total_value({'BTC': current_price})
+        total_value = wallet.get_total_value(current_prices)
         print(f"{bot_name}: ${total_value:.2f}")
     
     # Execute trading logic for each bot
@@ -69,65 +126,77 @@ def main():
     print("🎯 Executing Trading Decisions")
     print("=" * 60)
     
-    for bot_name, bot in bots.items():
-        print(f"\n--- {bot_name} ---")
-        wallet = wallets[bot_name]
-        
-        # Get bot's decision
-        decision = bot.decide(current_price, historical_data)
-        
-        # Execute decision
-        if decision == "BUY":
-            # Use 90% of available USD balance
-            amount_to_invest = wallet.usd_balance * 0.9
-            if amount_to_invest > 10:  # Minimum $10 trade
-                wallet.buy('BTC', current_price, amount_to_invest)
-            else:
-                print(f"⚠️ Insufficient funds to buy (${wallet.usd_balance:.2f})")
-        
-        elif decision == "SELL":
-            if 'BTC' in wallet.holdings and wallet.holdings['BTC'] > 0:
-                wallet.sell('BTC', current_price)
-            else:
-                print(f"⚠️ No BTC to sell")
-        
-        else:  # HOLD
-            print(f"⏸️ HOLD - No action taken")
+    # Decisions are computed concurrently, then applied in a fixed order
+    with metrics.phase('decide'):
+        timeout = float(os.getenv('DECISION_TIMEOUT', DEFAULT_TIMEOUT))
+        decisions, decision_logs = decide_all(bots, current_price, historical_data, timeout=timeout)
+    
+    with metrics.phase('execute'):
+        # Resting orders trigger on the candles since the last run first
+        state['last_order_candle'] = process_orders(
+            order_book, wallets, historical_data, state.get('last_order_candle')
+        )
         
-        # Show updated balance
-        total_value = wallet.get_total_value({'BTC': current_price})
-        print(f"💰 New Balance: ${total_value:.2f}")
+        for bot_name, wallet in wallets.items():
+            print(f"\n--- {bot_name} ---")
+            if bot_name not in decisions:
+                if bot_name in due:
+                    print("⚠️ Strategy could not be created. HOLD")
+                    continue
+                interval = registry.strategies[bot_name].interval
+                print(f"⏸️ Not due (decides every {interval / 3600:g}h). HOLD")
+                continue
+            
+            # Get bot's decision
+            print(decision_logs[bot_name], end='')
+            decision = decisions[bot_name]
+            
+            # Execute decision: BUY uses 90% of available USD (min $10 trade), SELL liquidates
+            execute_decision(wallet, decision, current_price)
+            
+            # Show updated balance
+            total_value = wallet.get_total_value(current_prices)
+            print(f"💰 New Balance: ${total_value:.2f}")
     
     # Save updated state
     print("\n" + "=" * 60)
     print("💾 Saving State")
     print("=" * 60)
     
-    # Update state with new balances
-    for bot_name, wallet in wallets.items():
-        state['bots'][bot_name] = wallet.get_state()
-    
-    # Add to history
-    snapshot = {
-        'timestamp': datetime.now().isoformat(),
-        'btc_price': current_price,
-        'bots': {
-            bot_name: wallets[bot_name].get_total_value({'BTC': current_price})
-            for bot_name in bots.keys()
+    with metrics.phase('save_state'):
+        # Update state with new balances
+        for bot_name, wallet in wallets.items():
+            state['bots'][bot_name] = wallet.get_state()
+        for bot_name, bot in bots.items():
+            state.setdefault('strategies', {})[bot_name] = bot.get_state()
+        registry.record_run(schedule, list(bots), now.timestamp())
+        if schedule:
+            state['schedule'] = schedule
+        
+        # Add to history
+        snapshot = {
+            'timestamp': now.isoformat(),
+            'btc_price': current_price,
+            'bots': {
+                bot_name: wallets[bot_name].get_total_value(current_prices)
+                for bot_name in wallets.keys()
+            }
         }
-    }
-    
-    state['history'].append(snapshot)
-    
-    # Save to file
-    save_state(state)
+        
+        history.append(snapshot)
+        update_analytics(state, [snapshot])
+        
+        # Save to file
+        save_state(state, state_file)
     
     # Generate performance chart
-    print("\n" + "=" * 60)
-    print("📊 Generating Performance Chart")
-    print("=" * 60)
-    
-    generate_chart(state['history'])
+    if chart:
+        print("\n" + "=" * 60)
+        print("📊 Generating Performance Chart")
+        print("=" * 60)
+        
+        with metrics.phase('generate_chart'):
+            generate_chart(history.read())
     
     # Final summary
     print("\n" + "=" * 60)
@@ -135,8 +204,8 @@ def main():
     print("=" * 60)
     
     results = []
-    for bot_name in bots.keys():
-        total_value = wallets[bot_name].get_total_value({'BTC': current_price})
+    for bot_name in wallets.keys():
+        total_value = wallets[bot_name].get_total_value(current_prices)
         profit_loss = total_value - 1000.0
         profit_loss_pct = (profit_loss / 1000.0) * 100
         results.append((bot_name, total_value, profit_loss, profit_loss_pct))
@@ -148,6 +217,10 @@ def main():
         emoji = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉"
         sign = "+" if profit_loss >= 0 else ""
         print(f"{emoji} {rank}. {bot_name}: ${total_value:.2f} ({sign}${profit_loss:.2f} / {sign}{profit_loss_pct:.2f}%)")
+        
+        stats = PerformanceStats()
+        stats.load_state(state['analytics'].get(bot_name))
+        print(f"   📐 {format_summary(stats.summary())}")
     
     print("\n" + "=" * 60)
     print("✅ Execution Complete!")
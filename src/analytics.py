@@ -0,0 +1,269 @@
+"""
+Analytics Module
+Online per-bot performance statistics updated in O(1) per snapshot
+"""
+
+import math
+from datetime import datetime
+
+
+EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+def wall_seconds(timestamp):
+    """
+    Seconds since 1970-01-01 of an ISO timestamp's wall-clock time
+    (as charts.wall_seconds, without importing NumPy at startup).
+    """
+    return (datetime.fromisoformat(timestamp).replace(tzinfo=None) - EPOCH).total_seconds()
+
+
+class PerformanceStats:
+    """
+    Running risk and return statistics of one portfolio value series.
+    
+    Every snapshot updates a fixed set of accumulators, so the cost does
+    not grow with the history:
+    - Welford's mean and sum of squared deviations of period returns
+      (volatility, Sharpe ratio)
+    - running peak and deepest drawdown from it
+    - counts of up and down periods
+    
+    Welford's recurrence gives the same mean and variance as the
+    two-pass formulas (up to float rounding); peak, drawdown and counts
+    are exact. full_stats() recomputes everything from a history to
+    check it. Stats include every snapshot seen, also the ones the
+    history log later downsamples.
+    
+    Attributes:
+        count (int): Snapshots seen
+        periods (int): Period returns seen (count - 1)
+        mean (float): Mean period return
+        m2 (float): Sum of squared deviations of period returns
+        peak (float): Highest value seen
+        max_drawdown (float): Deepest drop from a peak, as a fraction
+        wins (int): Periods with a positive return
+        losses (int): Periods with a negative return
+    """
+    
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.reset()
+    
+    def reset(self):
+        """Forget all seen values."""
+        self.count = 0
+        self.periods = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.first_value = None
+        self.last_value = None
+        self.first_time = None
+        self.last_time = None
+        self.peak = None
+        self.max_drawdown = 0.0
+        self.wins = 0
+        self.losses = 0
+    
+    def update(self, value, timestamp):
+        """
+        Consume one snapshot.
+        
+        Args:
+            value (float): Portfolio value
+            timestamp (str): ISO timestamp of the snapshot
+        """
+        seconds = wall_seconds(timestamp)
+        if self.count == 0:
+            self.first_value = value
+            self.first_time = seconds
+            self.peak = value
+        else:
+            period_return = value / self.last_value - 1.0 if self.last_value else 0.0
+            self.periods += 1
+            delta = period_return - self.mean
+            self.mean += delta / self.periods
+            self.m2 += delta * (period_return - self.mean)
+            if period_return > 0:
+                self.wins += 1
+            elif period_return < 0:
+                self.losses += 1
+        
+        self.peak = max(self.peak, value)
+        if self.peak > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak - value) / self.peak)
+        self.last_value = value
+        self.last_time = seconds
+        self.count += 1
+    
+    @property
+    def volatility(self):
+        """Sample standard deviation of period returns (NaN below 2 periods)."""
+        if self.periods < 2:
+            return math.nan
+        return math.sqrt(self.m2 / (self.periods - 1))
+    
+    @property
+    def periods_per_year(self):
+        """Snapshot frequency, from the time covered (NaN if unknown)."""
+        if self.periods == 0 or self.last_time <= self.first_time:
+            return math.nan
+        return self.periods / ((self.last_time - self.first_time) / SECONDS_PER_YEAR)
+    
+    def summary(self):
+        """
+        Report of the statistics.
+        
+        Returns:
+            dict: total_return, volatility and annual_volatility, sharpe
+                (annualized, zero risk-free rate), max_drawdown,
+                current_drawdown, wins, losses, win_rate, snapshots
+        """
+        volatility = self.volatility
+        annual_volatility = volatility * math.sqrt(self.periods_per_year)
+        sharpe = math.nan
+        if volatility > 0:
+            sharpe = self.mean / volatility * math.sqrt(self.periods_per_year)
+        decided = self.wins + self.losses
+        return {
+            'total_return': self.last_value / self.first_value - 1.0 if self.first_value else math.nan,
+            'mean_return': self.mean if self.periods else math.nan,
+            'volatility': volatility,
+            'annual_volatility': annual_volatility,
+            'sharpe': sharpe,
+            'max_drawdown': self.max_drawdown,
+            'current_drawdown': (self.peak - self.last_value) / self.peak if self.peak else 0.0,
+            'wins': self.wins,
+            'losses': self.losses,
+            'win_rate': self.wins / decided if decided else math.nan,
+            'snapshots': self.count
+        }
+    
+    def get_state(self):
+        """
+        Get accumulator state for persistence.
+        
+        Returns:
+            dict: Accumulator state dictionary
+        """
+        return {
+            'count': self.count,
+            'periods': self.periods,
+            'mean': self.mean,
+            'm2': self.m2,
+            'first_value': self.first_value,
+            'last_value': self.last_value,
+            'first_time': self.first_time,
+            'last_time': self.last_time,
+            'peak': self.peak,
+            'max_drawdown': self.max_drawdown,
+            'wins': self.wins,
+            'losses': self.losses
+        }
+    
+    def load_state(self, state):
+        """
+        Load accumulator state from saved data.
+        
+        Args:
+            state (dict): Saved accumulator state
+        """
+        self.reset()
+        if not state:
+            return
+        for key, value in state.items():
+            if hasattr(self, key):
+                setattr(self, key, value)
+
+
+def update_analytics(state, snapshots):
+    """
+    Feed snapshots into the per-bot statistics stored in state['analytics'].
+    
+    Args:
+        state (dict): Trading state (updated in place)
+        snapshots (list): Snapshots ordered by timestamp
+    
+    Returns:
+        dict: {bot name: PerformanceStats}
+    """
+    analytics = state.setdefault('analytics', {})
+    stats = {}
+    for snapshot in snapshots:
+        for bot_name, value in snapshot['bots'].items():
+            if bot_name not in stats:
+                stats[bot_name] = PerformanceStats()
+                stats[bot_name].load_state(analytics.get(bot_name))
+            stats[bot_name].update(value, snapshot['timestamp'])
+    for bot_name, bot_stats in stats.items():
+        analytics[bot_name] = bot_stats.get_state()
+    return stats
+
+
+def format_summary(summary):
+    """
+    One-line report of a summary, with n/a for undefined values.
+    
+    Args:
+        summary (dict): PerformanceStats.summary() result
+    
+    Returns:
+        str: Sharpe, annual volatility, max drawdown and up/down periods
+    """
+    def percent(value):
+        return 'n/a' if math.isnan(value) else f"{value * 100:.1f}%"
+    
+    sharpe = 'n/a' if math.isnan(summary['sharpe']) else f"{summary['sharpe']:.2f}"
+    return (f"Sharpe {sharpe} | Annual volatility {percent(summary['annual_volatility'])}"
+            f" | Max drawdown {percent(summary['max_drawdown'])} | Up/down {summary['wins']}/{summary['losses']}")
+
+
+def full_stats(history, bot_name):
+    """
+    Recompute a bot's summary from the whole history with two-pass formulas.
+    
+    Reference for PerformanceStats: the online summary of the same
+    snapshots matches this one.
+    
+    Args:
+        history (list): Snapshots ordered by timestamp
+        bot_name (str): Bot to report
+    
+    Returns:
+        dict: Same keys as PerformanceStats.summary(), None if the bot has no snapshots
+    """
+    points = [(snapshot['bots'][bot_name], wall_seconds(snapshot['timestamp']))
+              for snapshot in history if bot_name in snapshot['bots']]
+    values = [value for value, _ in points]
+    if not values:
+        return None
+    returns = [value / previous - 1.0 if previous else 0.0 for previous, value in zip(values, values[1:])]
+    
+    n = len(returns)
+    mean = sum(returns) / n if n else math.nan
+    volatility = math.sqrt(sum((r - mean) ** 2 for r in returns) / (n - 1)) if n >= 2 else math.nan
+    elapsed = points[-1][1] - points[0][1]
+    periods_per_year = n / (elapsed / SECONDS_PER_YEAR) if n and elapsed > 0 else math.nan
+    
+    peaks = []
+    peak = -math.inf
+    for value in values:
+        peak = max(peak, value)
+        peaks.append(peak)
+    drawdowns = [(peak - value) / peak if peak > 0 else 0.0 for peak, value in zip(peaks, values)]
+    wins = sum(1 for r in returns if r > 0)
+    losses = sum(1 for r in returns if r < 0)
+    return {
+        'total_return': values[-1] / values[0] - 1.0 if values[0] else math.nan,
+        'mean_return': mean,
+        'volatility': volatility,
+        'annual_volatility': volatility * math.sqrt(periods_per_year),
+        'sharpe': mean / volatility * math.sqrt(periods_per_year) if volatility > 0 else math.nan,
+        'max_drawdown': max(drawdowns),
+        'current_drawdown': drawdowns[-1],
+        'wins': wins,
+        'losses': losses,
+        'win_rate': wins / (wins + losses) if wins + losses else math.nan,
+        'snapshots': len(values)
+    }
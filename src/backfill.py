@@ -0,0 +1,204 @@
+"""
+Backfill Module
+Paginated, rate-limited parallel download of historical candles
+
+A date range is split into pages of `page_limit` candles that are
+fetched concurrently, paced by a token bucket sized to the exchange's
+rate limit, retried with exponential backoff, and written to the
+CandleStore in order as soon as every earlier page is in.
+
+Usage:
+    python -m src.backfill --symbol BTC/USDT --timeframe 1m --start 2024-01-01 --end 2024-07-01
+"""
+
+import argparse
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from src.market import TIMEFRAME_MS, get_client
+from src.store import CandleStore
+
+
+DEFAULT_RATE = 10.0  # Requests per second when the exchange does not say
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket pacing requests to `rate` per second.
+    
+    Callers reserve a token and sleep outside the lock until it is
+    due, so concurrent workers queue up evenly instead of bursting.
+    
+    Attributes:
+        rate (float): Requests per second
+        burst (float): Requests allowed back to back after an idle period
+    """
+    
+    def __init__(self, rate, burst=1.0, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            rate (float): Requests per second
+            burst (float): Bucket size
+            clock (callable): Monotonic time in seconds
+            sleep (callable): sleep(seconds)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Wait until one more request fits in the budget."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+
+
+def exchange_rate(client, safety=0.9):
+    """
+    Requests per second allowed by the exchange (ccxt's rateLimit is
+    milliseconds between requests), with a safety margin.
+    """
+    rate_limit = getattr(client.exchange, 'rateLimit', None)
+    return 1000.0 / rate_limit * safety if rate_limit else DEFAULT_RATE
+
+
+def to_ms(value):
+    """Milliseconds since the epoch of a datetime (naive = UTC), date string or number."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+def backfill(store, symbol='BTC/USDT', timeframe='1h', start=None, end=None, client=None, workers=4,
+             page_limit=1000, rate=None, retries=5, backoff=0.5, sleep=time.sleep):
+    """
+    Download candles from `start` to `end` into a CandleStore.
+    
+    The store only grows forward, so if it already holds candles the
+    download resumes at its newest candle (re-fetched since it may have
+    been open). That is also the case when the store ends before
+    `start`: the gap is filled rather than left in the series. Pages
+    may overlap: candles at or before the last written one are dropped,
+    so a rerun after a failure continues where the store ends.
+    
+    Args:
+        store (CandleStore): Destination store
+        symbol (str): Trading pair symbol
+        timeframe (str): Candlestick timeframe
+        start: First candle time (datetime, ISO date or ms)
+        end: End of the range, exclusive (default: now)
+        client (MarketDataClient): Market data client, shared one by default
+        workers (int): Concurrent requests
+        page_limit (int): Candles per request
+        rate (float): Requests per second (default: from the exchange's rateLimit)
+        retries (int): Retries per page before giving up
+        backoff (float): First retry delay in seconds, doubled on each retry
+        sleep (callable): sleep(seconds), for backoff delays
+    
+    Returns:
+        dict: {'pages', 'candles', 'requests', 'retries', 'seconds'}
+    
+    Raises:
+        Exception: The last error of a page that failed every retry
+            (pages before it are already stored)
+    """
+    client = client or get_client()
+    step = TIMEFRAME_MS[timeframe]
+    end_ms = to_ms(end) if end is not None else int(time.time() * 1000)
+    start_ms = to_ms(start) if start is not None else end_ms - page_limit * step
+    start_ms += (-start_ms) % step
+    
+    last_stored = store.last_timestamp(symbol, timeframe)
+    if last_stored is not None:
+        if last_stored < start_ms:
+            print(f"⚠️ Store ends at {datetime.fromtimestamp(last_stored / 1000, timezone.utc):%Y-%m-%d %H:%M}, "
+                  f"before the start: filling the gap from there")
+        start_ms = last_stored
+    pages = list(range(start_ms, end_ms, page_limit * step))
+    
+    limiter = RateLimiter(rate or exchange_rate(client))
+    stats = {'pages': len(pages), 'candles': 0, 'requests': 0, 'retries': 0}
+    stats_lock = threading.Lock()
+    jitter = random.Random()
+    
+    def fetch(since):
+        for attempt in range(retries + 1):
+            limiter.acquire()
+            with stats_lock:
+                stats['requests'] += 1
+            try:
+                return client.get_ohlcv(symbol, timeframe, since=since, limit=page_limit)
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                with stats_lock:
+                    stats['retries'] += 1
+                delay = backoff * 2 ** attempt
+                print(f"⚠️ Page {datetime.fromtimestamp(since / 1000, timezone.utc):%Y-%m-%d %H:%M} failed ({e}), "
+                      f"retrying in {delay:.1f}s")
+                sleep(delay * (1 + jitter.random()))  # Jitter spreads out retries of parallel pages
+    
+    started = time.perf_counter()
+    last_written = start_ms - 1 if last_stored is None else last_stored - 1  # Newest stored candle gets replaced
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Keep a bounded window of pages in flight and write them in order
+        queued = iter(pages)
+        in_flight = deque(pool.submit(fetch, since) for since in itertools.islice(queued, workers * 2))
+        while in_flight:
+            page = in_flight.popleft().result()
+            since = next(queued, None)
+            if since is not None:
+                in_flight.append(pool.submit(fetch, since))
+            
+            rows = [row for row in page if last_written < row[0] < end_ms]
+            if rows:
+                store.append(symbol, timeframe, rows)
+                last_written = rows[-1][0]
+                stats['candles'] += len(rows)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Download historical candles into the local candle store')
+    parser.add_argument('--symbol', default='BTC/USDT', help='Trading pair')
+    parser.add_argument('--timeframe', default='1h', choices=sorted(TIMEFRAME_MS), help='Candle timeframe')
+    parser.add_argument('--start', required=True, help='First day, e.g. 2024-01-01 (UTC)')
+    parser.add_argument('--end', help='End day, exclusive (default: now)')
+    parser.add_argument('--root', default='candles', help='Candle store directory')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent requests')
+    parser.add_argument('--rate', type=float, help="Requests per second (default: the exchange's limit)")
+    args = parser.parse_args()
+    
+    stats = backfill(CandleStore(args.root), args.symbol, args.timeframe, start=args.start, end=args.end,
+                     workers=args.workers, rate=args.rate)
+    print(f"📥 {stats['candles']:,} candles in {stats['pages']} pages ({stats['requests']} requests, "
+          f"{stats['retries']} retries) in {stats['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Backtest Module
+Vectorized strategy evaluation over full OHLCV series
+"""
+
+import contextlib
+import io
+
+import numpy as np
+
+from src.bots import SIGNAL_CODES
+from src.ledger import PortfolioLedger
+from src.runner import execute_decision
+from src.wallet import VirtualWallet
+
+
+DECISIONS = {code: name for name, code in SIGNAL_CODES.items()}
+
+
+def ewm_sum(values, decay):
+    """
+    Compute the recursive sum s[t] = decay * s[t-1] + values[t].
+    
+    The series is split into fixed-size blocks; inside each block the
+    recursion is solved in closed form with a cumulative sum, so only
+    one Python iteration per block is needed to carry the state forward.
+    
+    Args:
+        values (np.ndarray): 1-D float array (NaN is treated as 0)
+        decay (float): Decay factor in [0, 1)
+    
+    Returns:
+        np.ndarray: Recursive sums, same length as values
+    """
+    x = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    n = x.size
+    if n == 0 or decay == 0:
+        return x.copy()
+    
+    # Keep decay ** -block far from float64 overflow
+    block = int(max(1, min(256, 230 / -np.log(decay))))
+    pad = (-n) % block
+    blocks = np.concatenate([x, np.zeros(pad)]).reshape(-1, block)
+    
+    steps = np.arange(block)
+    local = np.cumsum(blocks * decay ** -steps, axis=1) * decay ** steps
+    
+    # Carry the state at the end of each block into the next one
+    gain = decay ** block
+    carry = np.empty(len(blocks))
+    acc = 0.0
+    for i, end in enumerate(local[:, -1]):
+        carry[i] = acc
+        acc = acc * gain + end
+    
+    out = local + carry[:, None] * decay ** (steps + 1)
+    return out.ravel()[:n]
+
+
+def rsi(close, length=14):
+    """
+    Vectorized RSI matching pandas-ta's smoothing.
+    
+    pandas-ta averages gains and losses with an adjusted EWM
+    (alpha = 1/length). Both averages share the same normalization,
+    so the ratio only needs the unnormalized recursive sums.
+    
+    Args:
+        close (np.ndarray): Close prices
+        length (int): RSI period
+    
+    Returns:
+        np.ndarray: RSI values, NaN for the first `length` candles
+    """
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.diff(close, prepend=np.nan)
+    decay = 1.0 - 1.0 / length
+    
+    gains = ewm_sum(np.where(delta > 0, delta, 0.0), decay)
+    losses = ewm_sum(np.where(delta < 0, -delta, 0.0), decay)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = 100.0 * gains / (gains + losses)
+    out[:length] = np.nan
+    return out
+
+
+def threshold_signals(values, lower, upper):
+    """
+    Mean-reversion signals from an oscillator series.
+    
+    Args:
+        values (np.ndarray): Indicator values (NaN means HOLD)
+        lower (float): BUY below this value
+        upper (float): SELL above this value
+    
+    Returns:
+        np.ndarray: int8 array of SIGNAL_CODES
+    """
+    out = np.zeros(len(values), dtype=np.int8)
+    out[values < lower] = SIGNAL_CODES["BUY"]
+    out[values > upper] = SIGNAL_CODES["SELL"]
+    return out
+
+
+def max_drawdown(equity):
+    """
+    Largest peak-to-trough loss of an equity curve, as a fraction.
+    
+    Args:
+        equity (np.ndarray): Equity curve
+    
+    Returns:
+        float: Max drawdown in [0, 1]
+    """
+    if len(equity) == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(equity)
+    return float(np.max(1.0 - equity / peaks))
+
+
+def simulate(close, signals, wallet=None, symbol='BTC', invest_fraction=0.9, min_trade=10.0):
+    """
+    Simulate VirtualWallet execution of a signal series.
+    
+    Mirrors main.py: BUY invests 90% of the USD balance when that is
+    more than $10, SELL liquidates the whole position, with the wallet's
+    fee and slippage applied. Wallet state only changes at the start of
+    a BUY/SELL run (and on the few repeated BUYs that still clear the
+    minimum), so the loop runs over runs, not candles, and the equity
+    curve is filled in with array operations.
+    
+    Args:
+        close (np.ndarray): Execution prices, one per candle
+        signals (np.ndarray): SIGNAL_CODES, one per candle
+        wallet (VirtualWallet): Starting wallet (not modified)
+        symbol (str): Holding traded by the signals
+        invest_fraction (float): Share of USD balance spent per BUY
+        min_trade (float): Minimum USD amount for a BUY
+    
+    Returns:
+        dict: {'equity', 'usd_balance', 'holdings', 'trades', 'final_value'}
+    """
+    wallet = wallet or VirtualWallet()
+    close = np.asarray(close, dtype=np.float64)
+    signals = np.asarray(signals, dtype=np.int8)
+    n = close.size
+    
+    buy_price = close * (1 + wallet.slippage_rate)
+    sell_price = close * (1 - wallet.slippage_rate)
+    fee_rate = wallet.fee_rate
+    
+    # Start index of every run of identical signals
+    starts = np.flatnonzero(np.diff(signals, prepend=np.int8(0)) != 0)
+    starts = starts[signals[starts] != SIGNAL_CODES["HOLD"]]
+    run_ends = np.append(np.flatnonzero(np.diff(signals) != 0) + 1, n)
+    ends = run_ends[np.searchsorted(run_ends, starts, side='right')]
+    
+    usd = wallet.usd_balance
+    held = wallet.holdings.get(symbol, 0.0)
+    event_idx, event_usd, event_held = [0], [usd], [held]
+    
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if signals[start] == SIGNAL_CODES["SELL"]:
+            if held <= 0:
+                continue
+            gross = held * sell_price[start]
+            usd += gross - gross * fee_rate
+            held = 0.0
+            event_idx.append(start)
+            event_usd.append(usd)
+            event_held.append(held)
+        else:
+            for i in range(start, end):
+                amount = usd * invest_fraction
+                if amount <= min_trade:
+                    break
+                held += (amount - amount * fee_rate) / buy_price[i]
+                usd -= amount
+                event_idx.append(i)
+                event_usd.append(usd)
+                event_held.append(held)
+    
+    # Forward-fill wallet state from event indices onto every candle
+    event_idx = np.asarray(event_idx)
+    pos = np.searchsorted(event_idx, np.arange(n), side='right') - 1
+    usd_curve = np.asarray(event_usd)[pos]
+    held_curve = np.asarray(event_held)[pos]
+    equity = usd_curve + held_curve * close
+    
+    return {
+        'equity': equity,
+        'usd_balance': usd_curve,
+        'holdings': held_curve,
+        'trades': len(event_idx) - 1,
+        'final_value': float(equity[-1]) if n else wallet.usd_balance
+    }
+
+
+def simulate_batch(close, signals, n_paths=None, wallet=None, symbol='BTC', invest_fraction=0.9, min_trade=10.0,
+                   chunk_size=64):
+    """
+    Execute many signal streams over the same prices, one ledger row each.
+    
+    The multi-path counterpart of simulate(): time runs in a Python
+    loop over candles while each step trades every path at once with
+    PortfolioLedger.trade, then updates each path's running peak and
+    worst drawdown in place. Signals can be a full array or a sampler
+    drawing `chunk_size` candles at a time, so memory depends on
+    chunk_size * n_paths rather than on the series length.
+    
+    Args:
+        close (np.ndarray): Execution prices, one per candle
+        signals (np.ndarray or callable): SIGNAL_CODES of shape
+            (n_candles, n_paths), or sample(n_candles) returning the
+            next rows of that array (e.g. TradingBot.signal_sampler)
+        n_paths (int): Number of paths (taken from signals if an array)
+        wallet (VirtualWallet): Starting wallet of every path, $1000 by default
+        symbol (str): Holding traded by the signals
+        invest_fraction (float): Share of USD balance spent per BUY
+        min_trade (float): Minimum USD amount for a BUY
+        chunk_size (int): Candles drawn at a time from a sampler
+    
+    Returns:
+        dict: Per-path arrays 'final_value', 'max_drawdown', 'trades',
+            and the final 'ledger'
+    """
+    wallet = wallet or VirtualWallet()
+    close = np.asarray(close, dtype=np.float64)
+    if callable(signals):
+        sample = signals
+    else:
+        signals = np.asarray(signals, dtype=np.int8).reshape(len(close), -1)
+        n_paths = signals.shape[1]
+        chunks = (signals[start:start + chunk_size] for start in range(0, len(close), chunk_size))
+        
+        def sample(n_candles):
+            return next(chunks)
+    
+    ledger = PortfolioLedger(n_paths, [symbol], initial_usd=wallet.usd_balance, fee_rate=wallet.fee_rate,
+                             slippage_rate=wallet.slippage_rate)
+    ledger.holdings[:, 0] = wallet.holdings.get(symbol, 0.0)
+    held = ledger.holdings[:, 0]
+    peak = np.zeros(n_paths)
+    worst = np.ones(n_paths)  # Lowest equity / running peak so far
+    equity = np.empty(n_paths)
+    
+    for start in range(0, len(close), chunk_size):
+        chunk = sample(min(chunk_size, len(close) - start))
+        buys = chunk == SIGNAL_CODES["BUY"]
+        sells = chunk == SIGNAL_CODES["SELL"]
+        for j in range(len(chunk)):
+            price = close[start + j]
+            ledger.trade(buys[j], sells[j], price, symbol, invest_fraction=invest_fraction, min_trade=min_trade)
+            
+            # Drawdown against the running peak of equity
+            np.multiply(held, price, out=equity)
+            equity += ledger.usd_balance
+            np.maximum(peak, equity, out=peak)
+            equity /= peak
+            np.minimum(worst, equity, out=worst)
+    
+    final_value = ledger.usd_balance + held * close[-1] if len(close) else ledger.usd_balance.copy()
+    return {'final_value': final_value, 'max_drawdown': 1.0 - worst, 'trades': ledger.trades, 'ledger': ledger}
+
+
+def simulate_orders(ohlcv, signals, wallet, symbol='BTC', invest_fraction=0.9, min_trade=10.0):
+    """
+    Per-candle simulation of a wallet with resting orders.
+    
+    Each candle first triggers the orders its range crossed (see
+    OrderBook.process_candle), then its signal executes at the close,
+    the same order as a live run. Fills can land anywhere inside a
+    signal run, so unlike simulate() this loops over every candle.
+    
+    Args:
+        ohlcv (np.ndarray): OHLCV rows [timestamp, open, high, low, close, volume]
+        signals (np.ndarray): SIGNAL_CODES, one per candle
+        wallet (VirtualWallet): Starting wallet and its open orders (not modified)
+        symbol (str): Holding traded by the signals and orders
+        invest_fraction (float): Share of USD balance spent per BUY
+        min_trade (float): Minimum USD amount for a BUY
+    
+    Returns:
+        dict: Same keys as simulate() plus 'fills' (filled orders) and
+            'open_orders' (orders still resting at the end)
+    """
+    ohlcv = np.asarray(ohlcv, dtype=np.float64)
+    n = len(ohlcv)
+    account = VirtualWallet(fee_rate=wallet.fee_rate, slippage_rate=wallet.slippage_rate)
+    account.load_state(wallet.get_state())
+    
+    usd_curve = np.empty(n)
+    held_curve = np.empty(n)
+    trades = fills = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, (candle, code) in enumerate(zip(ohlcv.tolist(), np.asarray(signals).tolist())):
+            fills += len(account.process_candle(symbol, candle))
+            trades += bool(execute_decision(account, DECISIONS[code], candle[4], symbol, invest_fraction, min_trade))
+            usd_curve[i] = account.usd_balance
+            held_curve[i] = account.holdings.get(symbol, 0.0)
+    
+    equity = usd_curve + held_curve * ohlcv[:, 4]
+    return {
+        'equity': equity,
+        'usd_balance': usd_curve,
+        'holdings': held_curve,
+        'trades': trades + fills,
+        'final_value': float(equity[-1]) if n else wallet.usd_balance,
+        'fills': fills,
+        'open_orders': account.open_orders()
+    }
+
+
+def backtest(bot, ohlcv, wallet=None):
+    """
+    Backtest a TradingBot over a full OHLCV array.
+    
+    Signals for every candle come from bot.signals() in one vectorized
+    pass; each one is executed at that candle's close price. A wallet
+    with open orders is simulated candle by candle (simulate_orders) so
+    the orders trigger on the candles' ranges.
+    
+    Args:
+        bot (TradingBot): Strategy implementing signals()
+        ohlcv (array-like): OHLCV rows [timestamp, open, high, low, close, volume]
+        wallet (VirtualWallet): Starting wallet, defaults to $1000
+    
+    Returns:
+        dict: Simulation result (see simulate) plus 'signals'
+    """
+    ohlcv = np.asarray(ohlcv, dtype=np.float64)
+    signals = bot.signals(ohlcv)
+    if wallet is not None and wallet.open_orders():
+        result = simulate_orders(ohlcv, signals, wallet)
+    else:
+        result = simulate(ohlcv[:, 4], signals, wallet=wallet)
+    result['signals'] = signals
+    return result
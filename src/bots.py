@@ -3,11 +3,19 @@ Trading Bots Module
 Implements 3 different trading strategies competing against each other
 """
 
+import contextlib
+import functools
 import random
 import os
+import time
 from abc import ABC, abstractmethod
-import pandas as pd
-import pandas_ta as ta
+from src.cache import RUN_INTERVAL, DecisionCache, ttl_for_interval
+from src.indicators import StreamingRSI
+from src.market import TIMEFRAME_MS
+
+
+# Integer codes used for vectorized decision series (see TradingBot.signals)
+SIGNAL_CODES = {"HOLD": 0, "BUY": 1, "SELL": -1}
 
 
 class TradingBot(ABC):
@@ -16,16 +24,50 @@ class TradingBot(ABC):
     
     All trading strategies must inherit from this class and implement
     the decide() method.
+    
+    Every subclass decide() is wrapped so the context managers returned
+    by the callables in `decide_hooks` (called with the bot) run around
+    each decision, e.g. to time it (see src/metrics.py).
     """
     
-    def __init__(self, name):
+    decide_hooks = []  # [hook(bot) -> context manager], shared by all bots
+    warmup = 0  # Candles signals() needs before the first one it decides on (see src/stream.py)
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        decide = cls.__dict__.get('decide')
+        if decide is None or getattr(decide, '__isabstractmethod__', False):
+            return
+        
+        @functools.wraps(decide)
+        def hooked_decide(self, *args, **kwargs):
+            hooks = TradingBot.decide_hooks
+            if not hooks or getattr(self, '_in_decide', False):
+                return decide(self, *args, **kwargs)  # No hooks, or super().decide() from a subclass
+            self._in_decide = True
+            try:
+                with contextlib.ExitStack() as stack:
+                    for hook in list(hooks):
+                        stack.enter_context(hook(self))
+                    return decide(self, *args, **kwargs)
+            finally:
+                self._in_decide = False
+        
+        cls.decide = hooked_decide
+    
+    def __init__(self, name, timeout=None, seed=None):
         """
         Initialize trading bot.
         
         Args:
             name (str): Bot name
+            timeout (float): Seconds decide() may take before the run
+                treats it as HOLD (None = runner default)
+            seed (int or str): Seed of the bot's own RNG (None = unseeded)
         """
         self.name = name
+        self.timeout = timeout
+        self.rng = random.Random(seed)
     
     @abstractmethod
     def decide(self, current_price, historical_data):
@@ -34,13 +76,80 @@ class TradingBot(ABC):
         
         Args:
             current_price (float): Current BTC price
-            historical_data (list): Historical OHLCV data
+            historical_data (FeatureStore or list): Historical OHLCV data;
+                use self.features() to read shared indicators from it
         
         Returns:
             str: Decision - "BUY", "SELL", or "HOLD"
         """
         pass
     
+    def features(self, historical_data):
+        """
+        Shared feature store for the candles passed to decide().
+        
+        Indicators read from it (RSI, EMA, ATR, returns) are computed
+        once per candle range and reused by every bot.
+        
+        Returns:
+            FeatureStore: Columnar candles with memoized indicators
+        """
+        from src.features import FeatureStore
+        return FeatureStore.of(historical_data)
+    
+    def signals(self, ohlcv):
+        """
+        Compute decisions for every candle of an OHLCV series at once.
+        
+        Used by the backtest engine. Strategies that can be expressed
+        with array operations should override this; the decision for
+        candle i may only depend on candles 0..i.
+        
+        Args:
+            ohlcv (np.ndarray): Array of shape (n, 6) with columns
+                [timestamp, open, high, low, close, volume]
+        
+        Returns:
+            np.ndarray: int8 array of SIGNAL_CODES, one per candle
+        """
+        raise NotImplementedError(f"{self.name} does not support vectorized backtesting")
+    
+    def signal_sampler(self, n_paths, rng):
+        """
+        Sampler of decisions for many independently seeded copies of a
+        random strategy at once (used by src/montecarlo.py).
+        
+        Per-copy parameters are drawn once from `rng` when the sampler
+        is made; each call then draws the next candles of every copy.
+        
+        Args:
+            n_paths (int): Number of copies
+            rng (np.random.Generator): Random source of all copies
+        
+        Returns:
+            callable: sample(n_candles) -> int8 array (n_candles, n_paths)
+                of SIGNAL_CODES
+        """
+        raise NotImplementedError(f"{self.name} is not a random strategy")
+    
+    def get_state(self):
+        """
+        Get bot state (e.g. indicator state) for persistence.
+        
+        Returns:
+            dict: Bot state dictionary, empty for stateless bots
+        """
+        return {}
+    
+    def load_state(self, state):
+        """
+        Load bot state from saved data.
+        
+        Args:
+            state (dict): Saved bot state
+        """
+        pass
+    
     def __str__(self):
         return f"{self.name} Trading Bot"
 
@@ -53,59 +162,179 @@ class AgentClaude(TradingBot):
     Falls back to random decisions when API key is not configured.
     """
     
-    def __init__(self):
-        super().__init__("AgentClaude")
+    MODEL = "claude-3-5-sonnet-20241022"
+    
+    def __init__(self, client=None, cache_ttl=None, cache_size=256, seed=None, clock=time.time):
+        """
+        Initialize AI bot.
+        
+        Args:
+            client: Anthropic-compatible client to use instead of building one
+            cache_ttl (float): Seconds a cached decision stays valid
+                (default: until the next scheduled run, see
+                ttl_for_interval; the registry derives it from the
+                strategy interval when one is set)
+            cache_size (int): Maximum number of cached decisions (LRU)
+            seed (int or str): Seed of the random fallback decisions
+            clock (callable): Current time in seconds, for cache expiry
+        """
+        super().__init__("AgentClaude", seed=seed)
         self.api_key = os.getenv('ANTHROPIC_API_KEY')
+        self._client = client
+        if cache_ttl is None:
+            cache_ttl = ttl_for_interval(RUN_INTERVAL)
+        self.cache = DecisionCache(ttl=cache_ttl, max_size=cache_size, clock=clock)
+    
+    @property
+    def client(self):
+        """Anthropic client, created once and reused for every request."""
+        if self._client is None:
+            from anthropic import Anthropic
+            self._client = Anthropic(api_key=self.api_key)
+        return self._client
+    
+    def get_state(self):
+        return {'cache': self.cache.get_state()}
+    
+    def load_state(self, state):
+        self.cache.load_state(state.get('cache'))
+    
+    @staticmethod
+    def cache_key(symbol, price, price_change):
+        """
+        Normalized prompt inputs used as cache key.
+        
+        Price is rounded to 3 significant digits and the percent change
+        to 0.25 points, so nearly identical markets share a decision.
+        """
+        change_bucket = round(price_change / 0.25) * 0.25 + 0.0  # +0.0 folds -0.0
+        return f"{symbol}|{float(f'{price:.3g}'):g}|{change_bucket:+.2f}"
     
     def decide(self, current_price, historical_data):
         """
         Make AI-powered trading decision.
         
         Uses Claude API to analyze market conditions and news sentiment.
+        Decisions are cached by normalized price and price change, so a
+        repeated market does not cost another round-trip.
         Falls back to random decisions if API key not available.
         """
-        if not self.api_key:
+        # Prepare market context
+        price_change = 0
+        if len(historical_data) >= 2:
+            old_price = float(self.features(historical_data).close[-2])  # Close price
+            price_change = ((current_price - old_price) / old_price) * 100
+        
+        return self.decide_batch({'BTC': (current_price, price_change)})['BTC']
+    
+    def decide_batch(self, markets):
+        """
+        Make decisions for several symbols with at most one request.
+        
+        Symbols with a valid cached decision are answered locally; the
+        rest are sent together in a single prompt.
+        
+        Args:
+            markets (dict): {symbol: (current_price, price_change_pct)}
+        
+        Returns:
+            dict: {symbol: "BUY" | "SELL" | "HOLD"}
+        """
+        if not self.api_key and self._client is None:
             print(f"⚠️ {self.name}: No API key found, using random decision")
-            return random.choice(["BUY", "SELL", "HOLD"])
+            return {symbol: self.rng.choice(["BUY", "SELL", "HOLD"]) for symbol in markets}
+        
+        decisions = {}
+        pending = {}
+        for symbol, (price, change) in markets.items():
+            cached = self.cache.get(self.cache_key(symbol, price, change))
+            if cached is not None:
+                print(f"💾 {self.name}: Cached Decision for {symbol} = {cached}")
+                decisions[symbol] = cached
+            else:
+                pending[symbol] = (price, change)
+        
+        if not pending:
+            return decisions
         
         try:
-            from anthropic import Anthropic
-            
-            client = Anthropic(api_key=self.api_key)
+            if list(pending) == ['BTC']:
+                answers = {'BTC': self._ask_single(*pending['BTC'])}
+            else:
+                answers = self._ask_batch(pending)
+        except Exception as e:
+            print(f"❌ {self.name}: API Error - {e}. Using random decision.")
+            decisions.update({symbol: self.rng.choice(["BUY", "SELL", "HOLD"]) for symbol in pending})
+            return decisions
+        
+        for symbol, (price, change) in pending.items():
+            decision = answers.get(symbol, "")
             
-            # Prepare market context
-            price_change = 0
-            if len(historical_data) >= 2:
-                old_price = historical_data[-2][4]  # Close price
-                price_change = ((current_price - old_price) / old_price) * 100
+            # Validate decision
+            if decision not in ["BUY", "SELL", "HOLD"]:
+                print(f"⚠️ {self.name}: Invalid AI response '{decision}', defaulting to HOLD")
+                decision = "HOLD"
+            else:
+                self.cache.put(self.cache_key(symbol, price, change), decision)
             
-            prompt = f"""You are a cryptocurrency trading expert. Analyze the current market conditions and provide a trading decision.
+            print(f"🤖 {self.name}: AI Decision = {decision}" + (f" ({symbol})" if len(pending) > 1 else ""))
+            decisions[symbol] = decision
+        
+        return decisions
+    
+    def signal_sampler(self, n_paths, rng):
+        """
+        Random fallback used without an API key: BUY, SELL or HOLD with
+        equal probability on every candle.
+        """
+        import numpy as np
+        
+        def sample(n_candles):
+            return rng.integers(-1, 2, size=(n_candles, n_paths), dtype=np.int8)
+        return sample
+    
+    def _ask_single(self, current_price, price_change):
+        """One-word decision for BTC (original prompt)."""
+        prompt = f"""You are a cryptocurrency trading expert. Analyze the current market conditions and provide a trading decision.
 
 Current BTC Price: ${current_price:,.2f}
 Recent Price Change: {price_change:+.2f}%
 
 Based on this information, should I BUY, SELL, or HOLD Bitcoin?
 Respond with ONLY one word: BUY, SELL, or HOLD."""
+        
+        message = self.client.messages.create(
+            model=self.MODEL,
+            max_tokens=10,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        
+        return message.content[0].text.strip().upper()
+    
+    def _ask_batch(self, markets):
+        """Decisions for several symbols in one request, one line each."""
+        lines = "\n".join(
+            f"{symbol}: Price ${price:,.2f}, Recent Price Change {change:+.2f}%"
+            for symbol, (price, change) in markets.items()
+        )
+        prompt = f"""You are a cryptocurrency trading expert. Analyze the current market conditions and provide a trading decision for each asset.
 
-            message = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=10,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            decision = message.content[0].text.strip().upper()
-            
-            # Validate decision
-            if decision not in ["BUY", "SELL", "HOLD"]:
-                print(f"⚠️ {self.name}: Invalid AI response '{decision}', defaulting to HOLD")
-                decision = "HOLD"
-            
-            print(f"🤖 {self.name}: AI Decision = {decision}")
-            return decision
-            
-        except Exception as e:
-            print(f"❌ {self.name}: API Error - {e}. Using random decision.")
-            return random.choice(["BUY", "SELL", "HOLD"])
+{lines}
+
+For each asset, should I BUY, SELL, or HOLD?
+Respond with ONLY one line per asset in the form SYMBOL: DECISION."""
+        
+        message = self.client.messages.create(
+            model=self.MODEL,
+            max_tokens=10 * len(markets) + 10,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        
+        answers = {}
+        for line in message.content[0].text.strip().splitlines():
+            symbol, _, decision = line.partition(':')
+            answers[symbol.strip().upper()] = decision.strip().upper()
+        return answers
 
 
 class RoboQuant(TradingBot):
@@ -116,40 +345,94 @@ class RoboQuant(TradingBot):
     - BUY when RSI < 30 (oversold)
     - SELL when RSI > 70 (overbought)
     - HOLD otherwise
+    
+    Period and thresholds are configurable (see src/sweep.py for tuning).
     """
     
-    def __init__(self):
+    def __init__(self, streaming=True, length=14, oversold=30, overbought=70):
+        """
+        Initialize RSI bot.
+        
+        Args:
+            streaming (bool): Keep RSI state between runs and update it
+                per new candle instead of reading the window's RSI from
+                the feature store
+            length (int): RSI period
+            oversold (float): BUY below this RSI
+            overbought (float): SELL above this RSI
+        """
         super().__init__("RoboQuant")
+        self.streaming = streaming
+        self.length = length
+        self.oversold = oversold
+        self.overbought = overbought
+        # Streaming state per candle timeframe, so the hourly runs and a
+        # 1m daemon sharing data.json never feed each other's RSI
+        self.rsi = {}  # {timeframe: StreamingRSI}
+        self.last_timestamp = {}  # {timeframe: open time of the last candle fed to self.rsi}
+    
+    def get_state(self):
+        if not self.streaming:
+            return {}
+        return {
+            'timeframes': {
+                timeframe: {'rsi': rsi.get_state(), 'last_timestamp': self.last_timestamp.get(timeframe)}
+                for timeframe, rsi in self.rsi.items()
+            }
+        }
+    
+    def load_state(self, state):
+        timeframes = state.get('timeframes')
+        if timeframes is None and state.get('rsi'):
+            timeframes = {'1h': state}  # Saved before states were keyed by timeframe, by the hourly runs
+        self.rsi = {}
+        self.last_timestamp = {}
+        for timeframe, saved in (timeframes or {}).items():
+            self.rsi[timeframe] = StreamingRSI(length=self.length)
+            self.rsi[timeframe].load_state(saved.get('rsi'))
+            if self.rsi[timeframe].count:
+                self.last_timestamp[timeframe] = saved.get('last_timestamp')
+    
+    @staticmethod
+    def timeframe_of(timestamps):
+        """
+        Timeframe of candles from the spacing of their open times.
+        
+        Returns:
+            str: ccxt timeframe (e.g. '1h'), or e.g. '90000ms' for others
+        """
+        step = int(timestamps[-1] - timestamps[-2]) if len(timestamps) >= 2 else 0
+        for timeframe, ms in TIMEFRAME_MS.items():
+            if ms == step:
+                return timeframe
+        return f"{step}ms"
     
     def decide(self, current_price, historical_data):
         """
         Make decision based on RSI indicator.
         
-        Calculates 14-period RSI and applies mean-reversion strategy.
+        Calculates RSI (14-period by default) and applies mean-reversion strategy.
         """
-        if not historical_data or len(historical_data) < 14:
+        if not historical_data or len(historical_data) < self.length:
             print(f"⚠️ {self.name}: Insufficient data for RSI calculation, HOLD")
             return "HOLD"
         
         try:
-            # Convert to DataFrame
-            df = pd.DataFrame(historical_data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            
-            # Calculate RSI using pandas-ta
-            df['rsi'] = ta.rsi(df['close'], length=14)
-            
-            # Get latest RSI
-            current_rsi = df['rsi'].iloc[-1]
+            features = self.features(historical_data)
+            if self.streaming:
+                current_rsi = self._streaming_rsi(features)
+            else:
+                current_rsi = float(features.rsi(self.length)[-1])
             
-            if pd.isna(current_rsi):
+            if current_rsi != current_rsi:  # NaN
                 print(f"⚠️ {self.name}: RSI calculation failed, HOLD")
                 return "HOLD"
             
             # Trading logic
-            if current_rsi < 30:
+            if current_rsi < self.oversold:
                 decision = "BUY"
                 print(f"📉 {self.name}: RSI = {current_rsi:.2f} (Oversold) → {decision}")
-            elif current_rsi > 70:
+            elif current_rsi > self.overbought:
                 decision = "SELL"
                 print(f"📈 {self.name}: RSI = {current_rsi:.2f} (Overbought) → {decision}")
             else:
@@ -157,10 +440,60 @@ class RoboQuant(TradingBot):
                 print(f"➡️ {self.name}: RSI = {current_rsi:.2f} (Neutral) → {decision}")
             
             return decision
-            
+        
         except Exception as e:
             print(f"❌ {self.name}: Error calculating RSI - {e}")
             return "HOLD"
+    
+    def _streaming_rsi(self, features):
+        """
+        Latest RSI from the persisted streaming state of the candles' timeframe.
+        
+        Closed candles newer than the stored state are fed to the
+        indicator (O(1) each); the last candle is still open, so it is
+        only peeked at and gets consumed on a later run once closed.
+        If the stored state does not connect to the candles (first run,
+        or a gap longer than the window), the indicator is rebuilt from
+        the window.
+        """
+        timestamps = features.timestamp[:-1].tolist()
+        closes = features.close[:-1].tolist()
+        timeframe = self.timeframe_of(features.timestamp)
+        rsi = self.rsi.setdefault(timeframe, StreamingRSI(length=self.length))
+        last_timestamp = self.last_timestamp.get(timeframe)
+        
+        if last_timestamp is None or last_timestamp not in timestamps:
+            rsi.reset()
+            start = 0
+        else:
+            start = timestamps.index(last_timestamp) + 1
+        
+        for timestamp, close in zip(timestamps[start:], closes[start:]):
+            rsi.update(close)
+            self.last_timestamp[timeframe] = int(timestamp)
+        
+        return rsi.peek(float(features.close[-1]))
+    
+    @property
+    def warmup(self):
+        """
+        Candles after which the RSI no longer depends on where the series
+        started: the EWM weight left on older prices,
+        (1 - 1/length) ** (50 * length), is below float64 precision.
+        """
+        return 50 * self.length
+    
+    def signals(self, ohlcv):
+        """
+        Vectorized RSI strategy over a full OHLCV series.
+        
+        Uses the same smoothing as pandas-ta (adjusted EWM with
+        alpha = 1/length) computed over the whole series.
+        """
+        from src.backtest import threshold_signals
+        
+        values = self.features(ohlcv).rsi(self.length)
+        return threshold_signals(values, self.oversold, self.overbought)
 
 
 class WhaleHunter(TradingBot):
@@ -175,9 +508,10 @@ class WhaleHunter(TradingBot):
     - Analyze on-chain metrics for institutional activity
     """
     
-    def __init__(self):
-        super().__init__("WhaleHunter")
-        self.luck_factor = random.uniform(0.4, 0.6)  # Simulated success rate
+    def __init__(self, seed=None):
+        super().__init__("WhaleHunter", seed=seed)
+        self.luck_factor = self.rng.uniform(0.4, 0.6)  # Simulated success rate
+        self._signal_rng = None  # NumPy stream of signals(), seeded from self.rng on first use
     
     def decide(self, current_price, historical_data):
         """
@@ -189,11 +523,11 @@ class WhaleHunter(TradingBot):
         For now, uses weighted random decisions to simulate whale-following strategy.
         """
         # Simulate whale detection with luck factor
-        whale_detected = random.random() < self.luck_factor
+        whale_detected = self.rng.random() < self.luck_factor
         
         if whale_detected:
             # Simulate whale action
-            whale_action = random.choice(["BUY", "BUY", "SELL"])  # Whales buy more often
+            whale_action = self.rng.choice(["BUY", "BUY", "SELL"])  # Whales buy more often
             print(f"🐋 {self.name}: Whale detected! Copying action → {whale_action}")
             return whale_action
         else:
@@ -205,17 +539,63 @@ class WhaleHunter(TradingBot):
         # 2. Analyze transaction patterns
         # 3. Identify accumulation/distribution phases
         # 4. Make informed decisions based on whale behavior
+    
+    def signals(self, ohlcv):
+        """
+        Vectorized whale simulation: same probabilities as decide().
+        
+        Every call continues one random stream with two draws per candle,
+        so a series passed in consecutive chunks (warmup is 0, no candle
+        is passed twice) gets the same signals as in a single call.
+        """
+        import numpy as np
+        
+        if self._signal_rng is None:
+            self._signal_rng = np.random.default_rng(self.rng.getrandbits(64))
+        draws = self._signal_rng.random((len(ohlcv), 2))
+        whale_detected = draws[:, 0] < self.luck_factor
+        buys = draws[:, 1] < 2 / 3  # Whales buy more often
+        
+        out = np.zeros(len(ohlcv), dtype=np.int8)
+        out[whale_detected & buys] = SIGNAL_CODES["BUY"]
+        out[whale_detected & ~buys] = SIGNAL_CODES["SELL"]
+        return out
+    
+    def signal_sampler(self, n_paths, rng):
+        """
+        Vectorized copies of decide(): each copy draws its own luck factor.
+        """
+        import numpy as np
+        
+        # Integer thresholds on 16-bit draws: one draw per candle and copy
+        luck = rng.uniform(0.4, 0.6, size=n_paths)
+        whale_buys = np.round(luck * 2 / 3 * 65536).astype(np.uint16)
+        whale_acts = np.round(luck * 65536).astype(np.uint16)
+        
+        def sample(n_candles):
+            draws = rng.integers(0, 65536, size=(n_candles, n_paths), dtype=np.uint16)
+            buys = (draws < whale_buys).view(np.int8)
+            acts = (draws < whale_acts).view(np.int8)
+            return buys * np.int8(2) - acts  # BUY = 1, SELL = -1, HOLD = 0
+        return sample
 
 
-def create_bots():
+def create_bots(llm_client=None, seed=None, clock=time.time, names=None):
     """
-    Factory function to create all trading bots.
+    Factory function to create the enabled trading bots.
+    
+    Bots come from the strategy registry (see src/strategies.py), so
+    only enabled strategies are imported and instantiated.
+    
+    Args:
+        llm_client: Anthropic-compatible client for AgentClaude (optional)
+        seed (int or str): Base seed; each bot gets its own RNG seeded
+            with "<seed>:<name>" (None = unseeded)
+        clock (callable): Current time in seconds (simulated in replays)
+        names (list): Strategies to create (default: all enabled)
     
     Returns:
         dict: Dictionary of bot instances {name: bot_instance}
     """
-    return {
-        'AgentClaude': AgentClaude(),
-        'RoboQuant': RoboQuant(),
-        'WhaleHunter': WhaleHunter()
-    }
+    from src.strategies import get_registry
+    return get_registry().create_bots(names, llm_client=llm_client, seed=seed, clock=clock)
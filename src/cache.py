@@ -0,0 +1,114 @@
+"""
+Cache Module
+TTL + LRU cache with persistable state
+"""
+
+import time
+from collections import OrderedDict
+
+
+# Scheduled runs happen every 12 hours (.github/workflows/run_trade.yml)
+RUN_INTERVAL = 12 * 3600
+
+# Cached decisions outlive one decision interval by this factor, so a
+# decision made on one run is still valid on the next even when the
+# scheduler starts that run late, but not on the run after it
+TTL_MARGIN = 1.5
+
+
+def ttl_for_interval(interval):
+    """
+    Decision cache lifetime for a decision interval.
+    
+    Args:
+        interval (float): Seconds between decisions
+    
+    Returns:
+        float: Seconds a cached decision stays valid
+    """
+    return interval * TTL_MARGIN
+
+
+class DecisionCache:
+    """
+    Bounded key/value cache with per-entry expiry.
+    
+    Entries expire `ttl` seconds after they were stored; when the cache
+    is full the least recently used entry is evicted. The state is
+    plain JSON data so it can be saved in data.json between runs.
+    
+    Attributes:
+        ttl (float): Entry lifetime in seconds
+        max_size (int): Maximum number of entries
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups not found or expired
+    """
+    
+    def __init__(self, ttl=3600.0, max_size=256, clock=time.time):
+        """
+        Initialize cache.
+        
+        Args:
+            ttl (float): Entry lifetime in seconds
+            max_size (int): Maximum number of entries
+            clock (callable): Returns the current time in seconds
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.entries = OrderedDict()  # {key: (stored_at, value)}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        """
+        Look up a key.
+        
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        entry = self.entries.get(key)
+        if entry is None or self.clock() - entry[0] > self.ttl:
+            self.entries.pop(key, None)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry if full."""
+        self.entries[key] = (self.clock(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def get_state(self):
+        """
+        Get cache contents for persistence (expired entries dropped).
+        
+        Returns:
+            list: [[key, stored_at, value], ...] from least to most recently used
+        """
+        now = self.clock()
+        return [
+            [key, stored_at, value]
+            for key, (stored_at, value) in self.entries.items()
+            if now - stored_at <= self.ttl
+        ]
+    
+    def load_state(self, state):
+        """
+        Load cache contents from saved data.
+        
+        Args:
+            state (list): Output of get_state()
+        """
+        self.entries = OrderedDict()
+        for key, stored_at, value in state or []:
+            self.entries[key] = (stored_at, value)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
@@ -0,0 +1,129 @@
+"""
+Candle Buffer Module
+Fixed-capacity ring buffer of candles with zero-copy views for bots
+"""
+
+import numpy as np
+
+from src.features import COLUMNS, FeatureStore
+
+
+class CandleBuffer:
+    """
+    The newest `capacity` candles as a float64 array, appended in place.
+    
+    Every candle is written twice, at slot i and i + capacity of a
+    (2 * capacity, 6) array, so the newest n candles are always one
+    contiguous block: windows are views, not copies, and appending
+    never reallocates or shifts data.
+    
+    A view stays valid until `capacity - n` more candles are appended,
+    and re-appending the last (still open) candle updates it in place,
+    so take a new view after each append.
+    
+    Attributes:
+        capacity (int): Maximum number of candles kept
+        count (int): Candles appended so far (including dropped ones)
+    """
+    
+    def __init__(self, capacity=1000):
+        """
+        Initialize an empty buffer.
+        
+        Args:
+            capacity (int): Maximum number of candles kept
+        """
+        self.capacity = capacity
+        self.count = 0
+        self._data = np.zeros((2 * capacity, len(COLUMNS)))
+    
+    def __len__(self):
+        return min(self.count, self.capacity)
+    
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+    
+    @property
+    def last_timestamp(self):
+        """Open time (ms) of the newest candle, or None if empty."""
+        if self.count == 0:
+            return None
+        return int(self._data[self._end() - 1, 0])
+    
+    def _end(self):
+        return self.count % self.capacity + self.capacity
+    
+    def extend(self, ohlcv):
+        """
+        Append candles sorted by timestamp.
+        
+        Candles older than the newest stored one are skipped and one
+        with the same timestamp replaces it, so overlapping pages
+        (which re-fetch the open candle) can be appended as they come.
+        
+        Args:
+            ohlcv (list or np.ndarray): Rows [timestamp, open, high, low, close, volume]
+        """
+        rows = np.asarray(ohlcv, dtype=np.float64).reshape(-1, len(COLUMNS))
+        last = self.last_timestamp
+        if last is not None and len(rows):
+            rows = rows[rows[:, 0] >= last]
+            if len(rows) and rows[0, 0] == last:
+                slot = (self.count - 1) % self.capacity
+                self._data[slot] = self._data[slot + self.capacity] = rows[0]
+                rows = rows[1:]
+        if len(rows) == 0:
+            return
+        
+        skipped = max(0, len(rows) - self.capacity)  # Would be overwritten right away
+        rows = rows[skipped:]
+        self.count += skipped
+        slots = (self.count + np.arange(len(rows))) % self.capacity
+        self._data[slots] = rows
+        self._data[slots + self.capacity] = rows
+        self.count += len(rows)
+    
+    def append(self, candle):
+        """Append one candle (see extend)."""
+        self.extend([candle])
+    
+    def array(self, n=None):
+        """
+        The newest n candles as a read-only (n, 6) view.
+        
+        Args:
+            n (int): Number of candles (default: all stored)
+        
+        Returns:
+            np.ndarray: Rows [timestamp, open, high, low, close, volume]
+        """
+        n = len(self) if n is None else min(n, len(self))
+        end = self._end()
+        view = self._data[end - n:end]
+        view.flags.writeable = False
+        return view
+    
+    def view(self, n=None):
+        """
+        The newest n candles as a FeatureStore sharing the buffer memory.
+        
+        It supports list indexing (view[-2][4]) as well as columns and
+        memoized indicators, so it can be passed to TradingBot.decide.
+        """
+        return FeatureStore(self.array(n))
+    
+    def frame(self, n=None):
+        """
+        The newest n candles as a pandas DataFrame without copying.
+        
+        Returns:
+            pd.DataFrame: One float64 column per OHLCV field
+        """
+        import pandas as pd
+        return pd.DataFrame(self.array(n), columns=list(COLUMNS), copy=False)
+    
+    def series(self, column='close', n=None):
+        """One column of the newest n candles as a pandas Series without copying."""
+        import pandas as pd
+        return pd.Series(self.array(n)[:, COLUMNS.index(column)], name=column, copy=False)
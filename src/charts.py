@@ -0,0 +1,161 @@
+"""
+Chart Data Module
+Parsing cache and shape-preserving downsampling for performance charts
+"""
+
+import os
+from datetime import datetime
+import numpy as np
+
+from src.utils import atomic_open
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def wall_seconds(timestamp):
+    """
+    Seconds since 1970-01-01 of an ISO timestamp's wall-clock time.
+    
+    Time zones are ignored so the chart shows the times as recorded.
+    """
+    return (datetime.fromisoformat(timestamp).replace(tzinfo=None) - EPOCH).total_seconds()
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    
+    Keeps the first and last points and, for each bucket in between,
+    the point forming the largest triangle with the previously kept
+    point and the average of the next bucket. Peaks and troughs survive,
+    unlike with plain striding.
+    
+    Args:
+        x (np.ndarray): Increasing x values
+        y (np.ndarray): y values
+        threshold (int): Number of points to keep
+    
+    Returns:
+        np.ndarray: Indices of the kept points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    
+    # Averages of every bucket, used as the third triangle vertex
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    avg_x = np.append(sums_x / sizes, x[-1])
+    avg_y = np.append(sums_y / sizes, y[-1])
+    
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+class ChartCache:
+    """
+    Parsed chart series persisted between runs.
+    
+    Snapshot timestamps are parsed once and stored as wall-clock seconds
+    together with each bot's values. On the next run only snapshots
+    appended since then are parsed; if the history prefix changed (for
+    example after a history compaction) everything is parsed again.
+    
+    Attributes:
+        path (str): Cache file (.npz)
+        bots (list): Bot names stored in the cache
+    """
+    
+    def __init__(self, path='.chart_cache.npz', bots=None):
+        """
+        Initialize chart cache.
+        
+        Args:
+            path (str): Cache file location, None to keep it in memory only
+            bots (list): Bot names to extract from each snapshot
+        """
+        self.path = path
+        self.bots = list(bots or [])
+        self.timestamps = np.empty(0)
+        self.values = {bot: np.empty(0) for bot in self.bots}
+        self.first_key = None
+        self.last_key = None
+        self._load()
+    
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if [str(b) for b in data['bots']] != self.bots:
+                    return
+                self.timestamps = data['timestamps']
+                self.values = {bot: data[f"values_{bot}"] for bot in self.bots}
+                self.first_key = str(data['first_key'])
+                self.last_key = str(data['last_key'])
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable chart cache: {e}")
+    
+    def save(self):
+        """Write the cache file atomically."""
+        if not self.path or self.first_key is None:
+            return
+        with atomic_open(self.path, 'wb') as f:
+            np.savez(
+                f,
+                bots=np.array(self.bots),
+                timestamps=self.timestamps,
+                first_key=self.first_key,
+                last_key=self.last_key,
+                **{f"values_{bot}": self.values[bot] for bot in self.bots}
+            )
+    
+    def update(self, history):
+        """
+        Bring the cached series in line with the history.
+        
+        Args:
+            history (list): Snapshots ordered by timestamp
+        
+        Returns:
+            int: Number of snapshots that had to be parsed
+        """
+        n = len(self.timestamps)
+        reusable = (
+            0 < n <= len(history)
+            and history[0]['timestamp'] == self.first_key
+            and history[n - 1]['timestamp'] == self.last_key
+        )
+        start = n if reusable else 0
+        new = history[start:]
+        
+        timestamps = np.array([wall_seconds(h['timestamp']) for h in new], dtype=np.float64)
+        if reusable:
+            self.timestamps = np.concatenate([self.timestamps, timestamps])
+        else:
+            self.timestamps = timestamps
+        for bot in self.bots:
+            values = np.array([h['bots'].get(bot, np.nan) for h in new], dtype=np.float64)
+            self.values[bot] = np.concatenate([self.values[bot], values]) if reusable else values
+        
+        if history:
+            self.first_key = history[0]['timestamp']
+            self.last_key = history[-1]['timestamp']
+        return len(new)
@@ -0,0 +1,261 @@
+"""
+Daemon Module
+Long-running trading loop scheduled on candle closes
+
+Unlike main.py, which starts cold on every cron invocation, the daemon
+keeps the exchange client, bots (indicator state, decision cache),
+wallets and candle store in memory, decides right after every candle
+close and only writes data.json at checkpoint intervals.
+
+Usage:
+    python -m src.daemon --timeframe 1h --checkpoint 3600
+"""
+
+import argparse
+import os
+import signal
+import threading
+from datetime import datetime
+
+from src.analytics import update_analytics
+from src.candles import CandleBuffer
+from src.history import HistoryLog
+from src.market import TIMEFRAME_MS, get_client, held_symbols
+from src.metrics import RunMetrics
+from src.orders import OrderBook
+from src.runner import DEFAULT_TIMEOUT, decide_all, execute_decision, process_orders
+from src.store import CandleStore
+from src.strategies import get_registry
+from src.utils import get_historical_prices, get_prices, load_state, save_state, generate_chart
+from src.wallet import VirtualWallet
+
+
+class TradingDaemon:
+    """
+    In-memory trading loop with candle-close scheduling and checkpoints.
+    
+    Attributes:
+        timeframe (str): Candle timeframe the schedule follows
+        checkpoint_interval (float): Seconds between state checkpoints
+        grace (float): Seconds waited after a close before deciding, so
+            the exchange has published the closed candle
+        ticks (int): Decision cycles run so far
+    """
+    
+    def __init__(self, market_client=None, llm_client=None, timeframe='1h', checkpoint_interval=3600.0,
+                 grace=5.0, clock=datetime.now, sleep=None, seed=None, chart=True, metrics_dir='metrics',
+                 state_file='data.json'):
+        """
+        Initialize daemon and load state once.
+        
+        Args:
+            market_client (MarketDataClient): Market data source, shared Binance client by default
+            llm_client: Anthropic-compatible client for AgentClaude
+            timeframe (str): Candle timeframe to trade on (e.g. '1m', '1h')
+            checkpoint_interval (float): Seconds between checkpoints (0 = every tick)
+            grace (float): Delay after each candle close
+            clock (callable): Returns the current datetime
+            sleep (callable): sleep(seconds); by default an interruptible wait
+            seed (int or str): Seed for the bots' RNGs
+            chart (bool): Regenerate status.png at each checkpoint
+            metrics_dir (str): Per-tick metrics directory (None = no files)
+            state_file (str): State file for load and checkpoints
+        """
+        self.client = market_client or get_client()
+        self.timeframe = timeframe
+        self.checkpoint_interval = checkpoint_interval
+        self.grace = grace
+        self.clock = clock
+        self.sleep = sleep or self._wait
+        self.chart = chart
+        self.metrics_dir = metrics_dir
+        self.state_file = state_file
+        self.ticks = 0
+        self._stop = threading.Event()
+        self._dirty = False
+        
+        self.registry = get_registry()
+        self.state = load_state(state_file, now=clock(), names=self.registry.enabled())
+        if not self.state:
+            raise RuntimeError(f"Could not load {state_file}")
+        self.history = HistoryLog(clock=clock)
+        legacy_history = self.state.pop('history', None)
+        if legacy_history:
+            if not self.history.read():
+                self.history.extend(legacy_history)
+            else:
+                self.state['history'] = legacy_history  # Saved back at checkpoints, never dropped
+                print(f"⚠️ {len(legacy_history)} snapshots in {state_file} not migrated: "
+                      f"{self.history.directory}/ already has history")
+        if 'analytics' not in self.state:
+            update_analytics(self.state, self.history.read())
+        
+        self.store = CandleStore()
+        self.candles = CandleBuffer(capacity=1000)  # Served to the bots as zero-copy views
+        self.llm_client = llm_client
+        self.seed = seed
+        self.bots = self.registry.create_bots(llm_client=llm_client, seed=seed, clock=lambda: clock().timestamp())
+        self.schedule = self.state.get('schedule', {})
+        self.order_book = OrderBook()
+        self.wallets = {}
+        for bot_name, bot in self.bots.items():
+            bot.load_state(self.state.get('strategies', {}).get(bot_name, {}))
+            wallet = VirtualWallet(order_book=self.order_book)
+            wallet.load_state(self.state['bots'][bot_name])
+            self.wallets[bot_name] = wallet
+        self.last_checkpoint = clock()
+    
+    def _wait(self, seconds):
+        self._stop.wait(max(0.0, seconds))
+    
+    def stop(self, *args):
+        """Ask the loop to finish (also usable as a signal handler)."""
+        self._stop.set()
+    
+    def seconds_to_close(self, now=None):
+        """
+        Seconds until the next candle close plus the grace delay.
+        
+        Args:
+            now (datetime): Reference time (default: clock())
+        
+        Returns:
+            float: Seconds to wait
+        """
+        now_ms = (now or self.clock()).timestamp() * 1000
+        step = TIMEFRAME_MS[self.timeframe]
+        next_close = (now_ms // step + 1) * step
+        return (next_close - now_ms) / 1000 + self.grace
+    
+    def tick(self):
+        """
+        One decision cycle with the in-memory bots and wallets.
+        
+        Returns:
+            bool: True if decisions were made
+        """
+        now = self.clock()
+        metrics = RunMetrics(directory=self.metrics_dir, memory=False)
+        with metrics.session():
+            print(f"\n⏰ Tick {self.ticks + 1}: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+            with metrics.phase('fetch_data'):
+                symbols = held_symbols([wallet.holdings for wallet in self.wallets.values()])
+                current_prices = get_prices(symbols, client=self.client)
+                current_price = current_prices.get('BTC')
+                if not current_price:
+                    print("❌ Failed to fetch BTC price. Skipping tick.")
+                    return False
+                historical_data = get_historical_prices(
+                    timeframe=self.timeframe, limit=100, store=self.store, client=self.client, buffer=self.candles
+                )
+            
+            with metrics.phase('decide'):
+                timeout = float(os.getenv('DECISION_TIMEOUT', DEFAULT_TIMEOUT))
+                due = [name for name in self.registry.due(self.schedule, now.timestamp()) if name in self.bots]
+                bots = {bot_name: self.bots[bot_name] for bot_name in due}
+                decisions, decision_logs = decide_all(bots, current_price, historical_data, timeout=timeout)
+                for bot_name in due:
+                    if bot_name not in bots:
+                        self.rebuild_bot(bot_name)
+            
+            with metrics.phase('execute'):
+                self.state['last_order_candle'] = process_orders(
+                    self.order_book, self.wallets, historical_data, self.state.get('last_order_candle')
+                )
+                for bot_name in due:
+                    print(decision_logs[bot_name], end='')
+                    execute_decision(self.wallets[bot_name], decisions[bot_name], current_price)
+                self.registry.record_run(self.schedule, due, now.timestamp())
+            
+            with metrics.phase('save_state'):
+                snapshot = {
+                    'timestamp': now.isoformat(),
+                    'btc_price': current_price,
+                    'bots': {
+                        bot_name: wallet.get_total_value(current_prices)
+                        for bot_name, wallet in self.wallets.items()
+                    }
+                }
+                self.history.append(snapshot)
+                update_analytics(self.state, [snapshot])
+                self._dirty = True
+                if (now - self.last_checkpoint).total_seconds() >= self.checkpoint_interval:
+                    self.checkpoint(now)
+        
+        self.ticks += 1
+        return True
+    
+    def rebuild_bot(self, bot_name):
+        """
+        Replace a bot abandoned by decide_all after a timeout.
+        
+        Its decide() may still be running and changing it, so a new
+        instance takes over from the last checkpointed bot state.
+        """
+        bot = self.registry.create_bots(
+            [bot_name], llm_client=self.llm_client, seed=self.seed, clock=lambda: self.clock().timestamp()
+        )[bot_name]
+        bot.load_state(self.state.get('strategies', {}).get(bot_name, {}))
+        self.bots[bot_name] = bot
+    
+    def checkpoint(self, now=None):
+        """Write wallets and bot state to the state file (and the chart)."""
+        for bot_name, wallet in self.wallets.items():
+            self.state['bots'][bot_name] = wallet.get_state()
+            self.state.setdefault('strategies', {})[bot_name] = self.bots[bot_name].get_state()
+        if self.schedule:
+            self.state['schedule'] = self.schedule
+        save_state(self.state, self.state_file)
+        if self.chart:
+            generate_chart(self.history.read())
+        self.last_checkpoint = now or self.clock()
+        self._dirty = False
+    
+    def run(self, max_ticks=None):
+        """
+        Decide after every candle close until stopped.
+        
+        Ticks that overrun a close skip to the next one. State is
+        checkpointed on exit, including on stop() / SIGTERM.
+        
+        Args:
+            max_ticks (int): Stop after this many ticks (None = run forever)
+        """
+        print(f"🚀 Daemon started on {self.timeframe} candles, checkpoint every {self.checkpoint_interval:.0f}s")
+        try:
+            while not self._stop.is_set() and (max_ticks is None or self.ticks < max_ticks):
+                self.sleep(self.seconds_to_close())
+                if self._stop.is_set():
+                    break
+                try:
+                    self.tick()
+                except Exception as e:
+                    print(f"❌ Tick failed: {e}")
+        finally:
+            if self._dirty:
+                self.checkpoint()
+            print(f"🛑 Daemon stopped after {self.ticks} ticks")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the trading bots as a long-running daemon')
+    parser.add_argument('--timeframe', default='1h', choices=sorted(TIMEFRAME_MS), help='Candle timeframe to trade on')
+    parser.add_argument('--checkpoint', type=float, default=3600.0, help='Seconds between state checkpoints')
+    parser.add_argument('--grace', type=float, default=5.0, help='Seconds to wait after each candle close')
+    parser.add_argument('--max-ticks', type=int, help='Stop after this many decision cycles')
+    parser.add_argument('--no-chart', action='store_true', help='Do not regenerate status.png at checkpoints')
+    args = parser.parse_args()
+    
+    daemon = TradingDaemon(
+        timeframe=args.timeframe,
+        checkpoint_interval=args.checkpoint,
+        grace=args.grace,
+        chart=not args.no_chart
+    )
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    daemon.run(max_ticks=args.max_ticks)
+
+
+if __name__ == "__main__":
+    main()
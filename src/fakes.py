@@ -0,0 +1,261 @@
+"""
+Fakes Module
+Local, deterministic stand-ins for a ccxt exchange, the Anthropic client and the clock
+"""
+
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from src.market import TIMEFRAME_MS
+
+
+class FakeExchange:
+    """
+    In-memory exchange exposing the subset of the ccxt API used here.
+    
+    Candles are generated from a seeded RNG so runs are reproducible, and
+    every call is counted so callers can check how many requests a code
+    path makes.
+    
+    Attributes:
+        prices (dict): Current last price per pair symbol
+        now_ms (int): Current exchange time in milliseconds
+        calls (dict): Number of calls per method name
+    """
+    
+    def __init__(self, prices=None, now_ms=1_700_000_000_000, seed=0, volatility=0.01):
+        """
+        Initialize fake exchange.
+        
+        Args:
+            prices (dict): Starting prices {pair: price}
+            now_ms (int): Exchange clock in milliseconds
+            seed (int): Seed of the candle random walk
+            volatility (float): Per-candle log-return standard deviation
+        """
+        self.prices = dict(prices or {'BTC/USDT': 100_000.0})
+        self.now_ms = now_ms
+        self.seed = seed
+        self.volatility = volatility
+        self.calls = {}
+        self.markets = None
+    
+    def _count(self, method):
+        self.calls[method] = self.calls.get(method, 0) + 1
+    
+    def load_markets(self, reload=False):
+        self._count('load_markets')
+        if self.markets is None or reload:
+            self.markets = {symbol: {'symbol': symbol} for symbol in self.prices}
+        return self.markets
+    
+    def _ticker(self, symbol):
+        if symbol not in self.prices:
+            raise ValueError(f"Unknown symbol {symbol}")
+        return {'symbol': symbol, 'timestamp': self.now_ms, 'last': self.prices[symbol]}
+    
+    def fetch_ticker(self, symbol):
+        self._count('fetch_ticker')
+        return self._ticker(symbol)
+    
+    def fetch_tickers(self, symbols=None):
+        self._count('fetch_tickers')
+        return {symbol: self._ticker(symbol) for symbol in (symbols or self.prices)}
+    
+    def candle(self, symbol, timeframe, timestamp):
+        """
+        Deterministic candle for a given open time.
+        
+        Each candle depends only on (seed, symbol, timeframe, timestamp),
+        so overlapping requests always agree.
+        """
+        rng = random.Random(f"{self.seed}:{symbol}:{timeframe}:{timestamp}")
+        base = self.prices.get(symbol, 100.0)
+        step = TIMEFRAME_MS[timeframe]
+        # Smooth deterministic drift plus noise around the current price
+        open_ = base * math.exp(self.volatility * math.sin(timestamp / (step * 50)))
+        close = open_ * math.exp(rng.gauss(0, self.volatility))
+        high = max(open_, close) * (1 + abs(rng.gauss(0, self.volatility / 2)))
+        low = min(open_, close) * (1 - abs(rng.gauss(0, self.volatility / 2)))
+        return [timestamp, open_, high, low, close, rng.uniform(1, 100)]
+    
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=100):
+        self._count('fetch_ohlcv')
+        step = TIMEFRAME_MS[timeframe]
+        last_open = self.now_ms - self.now_ms % step
+        if since is None:
+            start = last_open - (limit - 1) * step
+        else:
+            start = since + (-since) % step
+        end = min(last_open, start + (limit - 1) * step)
+        return [self.candle(symbol, timeframe, ts) for ts in range(start, end + 1, step)]
+    
+    def close(self):
+        self._count('close')
+
+
+class RateLimitExceeded(Exception):
+    """Raised by ThrottledExchange over its budget (named after ccxt's)."""
+
+
+class NetworkError(Exception):
+    """Transient failure raised by ThrottledExchange (named after ccxt's)."""
+
+
+class ThrottledExchange(FakeExchange):
+    """
+    FakeExchange with request latency, a rate limit and random failures.
+    
+    The server side keeps a token bucket of `burst` requests refilled at
+    `rate_limit` per second; a request finding it empty is rejected with
+    RateLimitExceeded, like an HTTP 429. Calls are thread-safe.
+    
+    Attributes:
+        latency (float): Seconds each fetch_ohlcv call takes
+        rate_limit (float): Requests per second allowed (None = unlimited)
+        rateLimit (float): Milliseconds between requests, as on ccxt exchanges
+        rejected (int): Requests rejected for exceeding the limit
+        failed (int): Requests failed with a NetworkError
+    """
+    
+    def __init__(self, latency=0.05, rate_limit=20.0, burst=None, failure_rate=0.0, **kwargs):
+        """
+        Initialize throttled exchange.
+        
+        Args:
+            latency (float): Seconds each fetch_ohlcv call takes
+            rate_limit (float): Requests per second allowed (None = unlimited)
+            burst (int): Bucket size (default: one second of requests)
+            failure_rate (float): Probability of a NetworkError per call
+            **kwargs: FakeExchange arguments
+        """
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rateLimit = 1000.0 / rate_limit if rate_limit else 0.0
+        self.burst = burst or max(1.0, rate_limit or 1.0)
+        self.failure_rate = failure_rate
+        self.rejected = 0
+        self.failed = 0
+        self._failures = random.Random(f"{self.seed}:failures")
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _count(self, method):
+        with self._lock:
+            FakeExchange._count(self, method)
+    
+    def _admit(self):
+        """Take a token for one request, or raise if the budget is spent."""
+        with self._lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_limit)
+                self._refilled = now
+                if self._tokens < 1:
+                    self.rejected += 1
+                    raise RateLimitExceeded(f"more than {self.rate_limit:g} requests per second")
+                self._tokens -= 1
+            if self._failures.random() < self.failure_rate:
+                self.failed += 1
+                raise NetworkError("connection reset")
+    
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=100):
+        self._admit()
+        if self.latency:
+            time.sleep(self.latency)
+        return FakeExchange.fetch_ohlcv(self, symbol, timeframe, since, limit)
+
+
+class AsyncFakeExchange(FakeExchange):
+    """
+    Async flavour of FakeExchange mirroring ccxt.async_support.
+    """
+    
+    async def load_markets(self, reload=False):
+        return FakeExchange.load_markets(self, reload)
+    
+    async def fetch_ticker(self, symbol):
+        return FakeExchange.fetch_ticker(self, symbol)
+    
+    async def fetch_tickers(self, symbols=None):
+        return FakeExchange.fetch_tickers(self, symbols)
+    
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=100):
+        return FakeExchange.fetch_ohlcv(self, symbol, timeframe, since, limit)
+    
+    async def close(self):
+        FakeExchange.close(self)
+
+
+class FakeAnthropic:
+    """
+    Stand-in for anthropic.Anthropic answering trading prompts locally.
+    
+    Answers are drawn from a seeded RNG, with an optional delay to
+    mimic the API round-trip. Only client.messages.create() is provided.
+    
+    Attributes:
+        calls (int): Number of messages.create() calls
+        latency (float): Seconds each call sleeps
+    """
+    
+    def __init__(self, seed=0, latency=0.0):
+        """
+        Initialize fake client.
+        
+        Args:
+            seed (int): Seed of the answer RNG
+            latency (float): Seconds each call sleeps
+        """
+        self.rng = random.Random(seed)
+        self.latency = latency
+        self.calls = 0
+        self.messages = self
+    
+    def create(self, model, max_tokens, messages):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = messages[0]['content']
+        if 'one line per asset' in prompt:
+            # Batched prompt: "SYMBOL: Price ..." lines
+            symbols = [line.split(':')[0] for line in prompt.splitlines() if ': Price $' in line]
+            text = "\n".join(f"{symbol}: {self.rng.choice(['BUY', 'SELL', 'HOLD'])}" for symbol in symbols)
+        else:
+            text = self.rng.choice(['BUY', 'SELL', 'HOLD'])
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class SimulatedClock:
+    """
+    Clock whose sleep() advances time instantly.
+    
+    Pass now and sleep to code that accepts a clock, e.g. the daemon;
+    an attached FakeExchange has its now_ms kept in step.
+    
+    Attributes:
+        current (datetime): Simulated current time
+        exchange (FakeExchange): Exchange whose clock follows this one
+    """
+    
+    def __init__(self, start=datetime(2024, 1, 1), exchange=None):
+        self.current = start
+        self.exchange = exchange
+        self._sync()
+    
+    def _sync(self):
+        if self.exchange is not None:
+            self.exchange.now_ms = int(self.current.timestamp() * 1000)
+    
+    def now(self):
+        return self.current
+    
+    def sleep(self, seconds):
+        self.current += timedelta(seconds=max(0.0, seconds))
+        self._sync()
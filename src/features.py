@@ -0,0 +1,184 @@
+"""
+Feature Store Module
+Columnar candles with memoized indicators shared by every bot in a run
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.backtest import ewm_sum, rsi
+
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# Indicator results shared across FeatureStore instances (LRU, bounded in bytes):
+# {(candle range key, indicator, params): np.ndarray}
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_bytes = 0
+CACHE_BYTES = 64 * 1024 * 1024
+
+
+class FeatureStore:
+    """
+    Candles of one run as NumPy columns, with indicators computed once.
+    
+    Indicators are memoized by name, parameters and a key of the candle
+    range, so every bot (and every FeatureStore built from the same
+    candles) reuses the first computation. The key is the length and a
+    BLAKE2b digest of every candle, so windows that differ anywhere
+    (not only at the ends, e.g. a backfilled gap or a corrected candle)
+    never share indicators. Hashing runs at memory speed, far below the
+    cost of the indicators it saves.
+    
+    It also behaves like the OHLCV list it was built from (len,
+    indexing, slicing, iteration), so strategies written against plain
+    lists keep working.
+    
+    Attributes:
+        timestamp, open, high, low, close, volume (np.ndarray): Columns
+        key (tuple): Key of the candle range
+    """
+    
+    def __init__(self, ohlcv):
+        """
+        Build the columnar frame.
+        
+        Args:
+            ohlcv (list or np.ndarray): Rows [timestamp, open, high, low, close, volume]
+        """
+        self._rows = ohlcv if isinstance(ohlcv, list) else None
+        data = np.asarray(ohlcv, dtype=np.float64).reshape(-1, len(COLUMNS))
+        data.flags.writeable = False
+        self.data = data
+        for i, name in enumerate(COLUMNS):
+            setattr(self, name, data[:, i])
+        self.key = (len(data), hashlib.blake2b(np.ascontiguousarray(data), digest_size=16).digest())
+    
+    @classmethod
+    def of(cls, historical_data):
+        """The FeatureStore itself, or one built from raw OHLCV rows."""
+        return historical_data if isinstance(historical_data, cls) else cls(historical_data)
+    
+    # --- list compatibility ---
+    
+    @property
+    def rows(self):
+        if self._rows is None:
+            self._rows = [[int(row[0])] + row[1:] for row in self.data.tolist()]
+        return self._rows
+    
+    def __len__(self):
+        return len(self.data)
+    
+    def __getitem__(self, index):
+        return self.rows[index]
+    
+    def __iter__(self):
+        return iter(self.rows)
+    
+    def __array__(self, dtype=None, copy=None):
+        """The (n, 6) float array itself, so np.asarray() does not copy."""
+        return self.data if dtype is None else self.data.astype(dtype, copy=False)
+    
+    # --- indicators ---
+    
+    def _memo(self, name, params, compute):
+        """Cached indicator, computing and storing it on the first request."""
+        global _cache_bytes
+        cache_key = (self.key, name, params)
+        with _cache_lock:
+            if cache_key in _cache:
+                _cache.move_to_end(cache_key)
+                return _cache[cache_key]
+        values = compute()
+        values.flags.writeable = False
+        if values.nbytes > CACHE_BYTES:
+            return values  # Larger than the whole cache (long backtests)
+        with _cache_lock:
+            if cache_key not in _cache:
+                _cache[cache_key] = values
+                _cache_bytes += values.nbytes
+            while _cache_bytes > CACHE_BYTES:
+                _, evicted = _cache.popitem(last=False)
+                _cache_bytes -= evicted.nbytes
+        return values
+    
+    def rsi(self, length=14):
+        """RSI with pandas-ta smoothing (see backtest.rsi)."""
+        return self._memo('rsi', (length,), lambda: rsi(self.close, length=length))
+    
+    def ema(self, length=10, column='close'):
+        """
+        Exponential moving average as in pandas-ta: seeded with the SMA
+        of the first `length` values, then alpha = 2 / (length + 1).
+        """
+        def compute():
+            values = getattr(self, column)
+            out = np.full(len(values), np.nan)
+            if len(values) < length:
+                return out
+            alpha = 2.0 / (length + 1)
+            seeded = np.zeros(len(values))
+            seeded[length - 1] = values[:length].mean()
+            seeded[length:] = alpha * values[length:]
+            out[length - 1:] = ewm_sum(seeded, 1.0 - alpha)[length - 1:]
+            return out
+        return self._memo('ema', (length, column), compute)
+    
+    def true_range(self):
+        """
+        max(high - low, |high - prev close|, |low - prev close|) as in
+        pandas-ta; NaN for the first candle, which has no previous close.
+        """
+        def compute():
+            prev_close = np.concatenate([[np.nan], self.close[:-1]])
+            ranges = np.stack([self.high - self.low, np.abs(self.high - prev_close), np.abs(self.low - prev_close)])
+            return ranges.max(axis=0) if len(self.data) else np.empty(0)
+        return self._memo('true_range', (), compute)
+    
+    def atr(self, length=14):
+        """
+        Average true range with Wilder smoothing as in pandas-ta
+        (adjusted EWM, alpha = 1/length, over the true ranges from the
+        second candle on), NaN for the first `length` candles.
+        """
+        def compute():
+            decay = 1.0 - 1.0 / length
+            tr = self.true_range()
+            out = np.full(len(tr), np.nan)
+            if len(tr) > length:
+                out[1:] = ewm_sum(tr[1:], decay) / ewm_sum(np.ones(len(tr) - 1), decay)
+                out[:length] = np.nan
+            return out
+        return self._memo('atr', (length,), compute)
+    
+    def returns(self, periods=1, log=False):
+        """Close-to-close returns over `periods` candles, NaN where undefined."""
+        def compute():
+            out = np.full(len(self.close), np.nan)
+            if len(self.close) > periods:
+                ratio = self.close[periods:] / self.close[:-periods]
+                out[periods:] = np.log(ratio) if log else ratio - 1.0
+            return out
+        return self._memo('returns', (periods, log), compute)
+
+
+def clear_cache(key=None):
+    """
+    Drop every memoized indicator, or only those of one candle range.
+    
+    Args:
+        key (tuple): FeatureStore.key of the candle range (None = all)
+    """
+    global _cache_bytes
+    with _cache_lock:
+        if key is None:
+            _cache.clear()
+            _cache_bytes = 0
+            return
+        for cache_key in [cache_key for cache_key in _cache if cache_key[0] == key]:
+            _cache_bytes -= _cache.pop(cache_key).nbytes
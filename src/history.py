@@ -0,0 +1,268 @@
+"""
+History Log Module
+Append-only, segmented storage for performance snapshots
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+
+def bucket_key(timestamp, tier):
+    """
+    Bucket a snapshot timestamp belongs to in a rollup tier.
+    
+    Args:
+        timestamp (datetime): Snapshot time
+        tier (str): 'daily' or 'weekly'
+    
+    Returns:
+        str: Bucket identifier
+    """
+    if tier == 'daily':
+        return timestamp.strftime('%Y-%m-%d')
+    year, week, _ = timestamp.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def downsample(snapshots, now, raw_days=30, daily_days=365):
+    """
+    Tiered rollup of snapshots by age.
+    
+    Snapshots newer than `raw_days` are kept as-is, those up to
+    `daily_days` old are reduced to the last snapshot of each day, and
+    older ones to the last snapshot of each ISO week. Applying it again
+    to its own output gives the same result.
+    
+    Args:
+        snapshots (list): Snapshots ordered by timestamp
+        now (datetime): Reference time for ages
+        raw_days (int): Age limit for full-resolution snapshots
+        daily_days (int): Age limit for daily points
+    
+    Returns:
+        list: Downsampled snapshots, still ordered by timestamp
+    """
+    raw_cutoff = now - timedelta(days=raw_days)
+    daily_cutoff = now - timedelta(days=daily_days)
+    
+    result = []
+    last_bucket = None
+    for snapshot in snapshots:
+        timestamp = datetime.fromisoformat(snapshot['timestamp'])
+        if timestamp >= raw_cutoff:
+            result.append(snapshot)
+            last_bucket = None
+            continue
+        
+        tier = 'daily' if timestamp >= daily_cutoff else 'weekly'
+        bucket = (tier, bucket_key(timestamp, tier))
+        if bucket == last_bucket:
+            result[-1] = snapshot  # Keep the last snapshot of each bucket
+        else:
+            result.append(snapshot)
+        last_bucket = bucket
+    return result
+
+
+class HistoryLog:
+    """
+    Append-only history of snapshots split into JSON-lines segments.
+    
+    New snapshots are appended to the active segment, so saving costs
+    one line regardless of how long the history is. When a segment is
+    full it is sealed and compaction folds every sealed segment into a
+    downsampled rollup file.
+    
+    Layout:
+        <directory>/rollup-<N>.jsonl    # compacted history up to segment N
+        <directory>/segment-<N>.jsonl   # raw snapshots, N > rollup's N
+    
+    Attributes:
+        directory (str): Directory holding rollup and segment files
+        segment_size (int): Snapshots per segment before sealing it
+        raw_days (int): Age limit for full-resolution snapshots
+        daily_days (int): Age limit for daily points
+        clock (callable): Returns the current datetime (reference for rollups)
+    """
+    
+    def __init__(self, directory='history', segment_size=500, raw_days=30, daily_days=365, clock=datetime.now):
+        """
+        Initialize history log.
+        
+        Args:
+            directory (str): Directory holding the log (created on first write)
+            segment_size (int): Snapshots per segment
+            raw_days (int): Age limit for full-resolution snapshots
+            daily_days (int): Age limit for daily points
+            clock (callable): Returns the current datetime
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.raw_days = raw_days
+        self.daily_days = daily_days
+        self.clock = clock
+    
+    def _files(self, prefix):
+        """Sorted [(number, path)] of files named <prefix>-<N>.jsonl."""
+        if not os.path.isdir(self.directory):
+            return []
+        files = []
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix + '-') and name.endswith('.jsonl'):
+                number = name[len(prefix) + 1:-len('.jsonl')]
+                if number.isdigit():
+                    files.append((int(number), os.path.join(self.directory, name)))
+        return sorted(files)
+    
+    def _rollup(self):
+        """(segment number covered, path) of the newest rollup."""
+        rollups = self._files('rollup')
+        return rollups[-1] if rollups else (0, None)
+    
+    def _segments(self):
+        """Segments not yet folded into the rollup."""
+        covered, _ = self._rollup()
+        return [(n, path) for n, path in self._files('segment') if n > covered]
+    
+    @staticmethod
+    def _read_lines(path):
+        snapshots = []
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        snapshots.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        pass  # Partially written last line after a crash
+        return snapshots
+    
+    @staticmethod
+    def _drop_partial_line(path):
+        """
+        Truncate a segment back to its last complete line.
+        
+        A crash mid-append can leave a last line without its newline;
+        appending after it would join the next snapshot onto it and lose
+        both.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data and not data.endswith(b'\n'):
+            with open(path, 'r+b') as f:
+                f.truncate(data.rfind(b'\n') + 1)
+    
+    def _path(self, prefix, number):
+        return os.path.join(self.directory, f"{prefix}-{number:06d}.jsonl")
+    
+    def append(self, snapshot):
+        """
+        Append one snapshot to the log.
+        
+        Args:
+            snapshot (dict): Snapshot with an ISO 'timestamp'
+        """
+        self.extend([snapshot])
+    
+    def extend(self, snapshots):
+        """
+        Append several snapshots, sealing and compacting full segments.
+        
+        Args:
+            snapshots (list): Snapshots ordered by timestamp
+        """
+        if not snapshots:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        
+        segments = self._segments()
+        if segments:
+            number, path = segments[-1]
+            self._drop_partial_line(path)
+            count = len(self._read_lines(path))
+        else:
+            number = max(self._rollup()[0], max((n for n, _ in self._files('segment')), default=0)) + 1
+            count = 0
+        
+        sealed = False
+        f = open(self._path('segment', number), 'a')
+        try:
+            for snapshot in snapshots:
+                if count >= self.segment_size:
+                    f.close()
+                    number += 1
+                    count = 0
+                    sealed = True
+                    f = open(self._path('segment', number), 'a')
+                f.write(json.dumps(snapshot) + '\n')
+                count += 1
+        finally:
+            f.close()
+        
+        if sealed:
+            self.compact()
+    
+    def read(self):
+        """
+        Read the full (partly downsampled) history.
+        
+        Returns:
+            list: Snapshots ordered by timestamp
+        """
+        _, rollup_path = self._rollup()
+        snapshots = self._read_lines(rollup_path) if rollup_path else []
+        for _, path in self._segments():
+            snapshots.extend(self._read_lines(path))
+        return snapshots
+    
+    def last(self):
+        """
+        Newest snapshot, reading only the newest non-empty file.
+        
+        Returns:
+            dict: Snapshot, None if the log is empty
+        """
+        _, rollup_path = self._rollup()
+        paths = ([rollup_path] if rollup_path else []) + [path for _, path in self._segments()]
+        for path in reversed(paths):
+            snapshots = self._read_lines(path)
+            if snapshots:
+                return snapshots[-1]
+        return None
+    
+    def compact(self, now=None):
+        """
+        Fold all sealed segments into a new downsampled rollup.
+        
+        The new rollup is written to a temporary file and renamed into
+        place before the segments it covers are deleted, so a crash at
+        any point leaves a readable log.
+        
+        Args:
+            now (datetime): Reference time for the rollup tiers (default: clock())
+        """
+        segments = self._segments()
+        if len(segments) < 2:
+            return  # Only the active segment, nothing sealed
+        sealed = segments[:-1]
+        
+        covered, rollup_path = self._rollup()
+        snapshots = self._read_lines(rollup_path) if rollup_path else []
+        for _, path in sealed:
+            snapshots.extend(self._read_lines(path))
+        snapshots = downsample(snapshots, now or self.clock(), self.raw_days, self.daily_days)
+        
+        new_covered = sealed[-1][0]
+        new_path = self._path('rollup', new_covered)
+        tmp_path = new_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for snapshot in snapshots:
+                f.write(json.dumps(snapshot) + '\n')
+        os.replace(tmp_path, new_path)
+        
+        # The new rollup supersedes older rollups and the sealed segments
+        for number, path in self._files('rollup') + self._files('segment'):
+            if number <= new_covered and path != new_path:
+                os.remove(path)
+        print(f"🗜️ History compacted: {len(snapshots)} snapshots in {os.path.basename(new_path)}")
@@ -0,0 +1,144 @@
+"""
+Indicators Module
+Streaming technical indicators with O(1) updates and persistable state
+"""
+
+import math
+
+
+class StreamingRSI:
+    """
+    Incremental RSI that reproduces pandas-ta's rsi() exactly.
+    
+    pandas-ta smooths gains and losses with pandas' adjusted EWM
+    (alpha = 1/length, min_periods = length). This class runs the same
+    recursion pandas uses internally, one close at a time, so after
+    feeding a series the value is bit-for-bit the last element of
+    ta.rsi(close, length).
+    
+    State is a handful of floats that can be stored in data.json.
+    
+    Attributes:
+        length (int): RSI period
+        count (int): Number of price changes seen so far
+        value (float): Latest RSI, NaN until `length` changes are seen
+    """
+    
+    def __init__(self, length=14):
+        """
+        Initialize streaming RSI.
+        
+        Args:
+            length (int): RSI period
+        """
+        self.length = length
+        self.reset()
+    
+    def reset(self):
+        """Forget all seen prices."""
+        self.last_close = None
+        self.avg_gain = None   # EWM of positive changes
+        self.avg_loss = None   # EWM of negative changes (<= 0, as pandas-ta)
+        self.weight = 1.0      # pandas' old_wt accumulator
+        self.count = 0
+    
+    def _step(self, close):
+        """
+        Compute the state after one more close without applying it.
+        
+        Returns:
+            tuple: (avg_gain, avg_loss, weight, count)
+        """
+        avg_gain, avg_loss, weight, count = self.avg_gain, self.avg_loss, self.weight, self.count
+        if self.last_close is None:
+            return avg_gain, avg_loss, weight, count
+        
+        change = close - self.last_close
+        gain = change if change > 0 else 0.0
+        loss = change if change < 0 else 0.0
+        count += 1
+        
+        if avg_gain is None:
+            return gain, loss, weight, count
+        
+        # Same update (and operation order) as pandas' ewm with adjust=True
+        weight *= 1.0 - 1.0 / self.length
+        if avg_gain != gain:
+            avg_gain = (weight * avg_gain + gain) / (weight + 1.0)
+        if avg_loss != loss:
+            avg_loss = (weight * avg_loss + loss) / (weight + 1.0)
+        weight += 1.0
+        return avg_gain, avg_loss, weight, count
+    
+    def _rsi(self, avg_gain, avg_loss, count):
+        if count < self.length:
+            return math.nan
+        denominator = avg_gain + abs(avg_loss)
+        if denominator == 0:
+            return math.nan
+        return 100 * avg_gain / denominator
+    
+    def update(self, close):
+        """
+        Consume one close price.
+        
+        Args:
+            close (float): Close price of the next candle
+        
+        Returns:
+            float: RSI including this close
+        """
+        self.avg_gain, self.avg_loss, self.weight, self.count = self._step(close)
+        self.last_close = close
+        return self.value
+    
+    def peek(self, close):
+        """
+        RSI as if `close` were the next price, without consuming it.
+        
+        Used for the still-open candle, whose close keeps changing.
+        """
+        avg_gain, avg_loss, _, count = self._step(close)
+        if avg_gain is None:
+            return math.nan
+        return self._rsi(avg_gain, avg_loss, count)
+    
+    @property
+    def value(self):
+        if self.avg_gain is None:
+            return math.nan
+        return self._rsi(self.avg_gain, self.avg_loss, self.count)
+    
+    def get_state(self):
+        """
+        Get indicator state for persistence.
+        
+        Returns:
+            dict: Indicator state dictionary
+        """
+        return {
+            'length': self.length,
+            'last_close': self.last_close,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'weight': self.weight,
+            'count': self.count
+        }
+    
+    def load_state(self, state):
+        """
+        Load indicator state from saved data.
+        
+        State saved with a different length is ignored.
+        
+        Args:
+            state (dict): Saved indicator state
+        """
+        self.reset()
+        if not state or state.get('length') != self.length:
+            return
+        self.last_close = state.get('last_close')
+        self.avg_gain = state.get('avg_gain')
+        self.avg_loss = state.get('avg_loss')
+        self.weight = state.get('weight', 1.0)
+        self.count = state.get('count', 0)
@@ -0,0 +1,220 @@
+"""
+Portfolio Ledger Module
+Struct-of-arrays wallets for simulating thousands of portfolios at once
+"""
+
+import numpy as np
+
+from src.bots import SIGNAL_CODES
+from src.wallet import VirtualWallet
+
+
+class PortfolioLedger:
+    """
+    Vectorized equivalent of many VirtualWallets.
+    
+    Balances live in NumPy arrays (one USD entry per wallet, one holdings
+    row per wallet and one column per symbol) and a whole vector of
+    BUY/SELL/HOLD decisions is applied with the same fee and slippage
+    math as VirtualWallet.buy/sell, without a Python loop over wallets.
+    
+    Attributes:
+        symbols (list): Symbol of each holdings column
+        usd_balance (np.ndarray): USD balance per wallet, shape (n,)
+        holdings (np.ndarray): Amount per wallet and symbol, shape (n, m)
+        fee_rate (float or np.ndarray): Trading fee, scalar or per wallet
+        slippage_rate (float or np.ndarray): Slippage, scalar or per wallet
+    """
+    
+    def __init__(self, n_wallets, symbols=('BTC',), initial_usd=1000.0, fee_rate=0.001, slippage_rate=0.0005):
+        """
+        Initialize ledger.
+        
+        Args:
+            n_wallets (int): Number of wallets
+            symbols (list): Tradable symbols (holdings columns)
+            initial_usd (float or array): Starting USD balance per wallet
+            fee_rate (float or array): Trading fee as decimal
+            slippage_rate (float or array): Slippage as decimal
+        """
+        self.symbols = list(symbols)
+        self.usd_balance = np.full(n_wallets, initial_usd, dtype=np.float64)
+        self.holdings = np.zeros((n_wallets, len(self.symbols)), dtype=np.float64)
+        self.trades = np.zeros(n_wallets, dtype=np.int32)
+        self.fee_rate = fee_rate
+        self.slippage_rate = slippage_rate
+        self._scratch = None
+    
+    def __len__(self):
+        return len(self.usd_balance)
+    
+    def column(self, symbol):
+        """Holdings column index of a symbol."""
+        return self.symbols.index(symbol)
+    
+    def _price_vector(self, current_prices):
+        """Prices as an (m,) array from a {symbol: price} dict or an array."""
+        if isinstance(current_prices, dict):
+            return np.array([current_prices.get(s, 0.0) for s in self.symbols], dtype=np.float64)
+        return np.asarray(current_prices, dtype=np.float64)
+    
+    def trade(self, buys, sells, price, symbol='BTC', invest_fraction=0.9, min_trade=10.0):
+        """
+        Execute one step of BUY and SELL masks for a single symbol.
+        
+        This is the trade kernel every vectorized simulation runs on.
+        Rules are those of main.py: BUY spends `invest_fraction` of the
+        USD balance when that is more than `min_trade`, SELL liquidates
+        the whole position. Slippage and fees follow VirtualWallet.buy
+        and sell, folded into one factor per side. That leaves only
+        rounding differences, and each step uses a fixed number of
+        in-place array operations on preallocated buffers.
+        
+        Args:
+            buys (np.ndarray): Boolean BUY mask, shape (n,)
+            sells (np.ndarray): Boolean SELL mask, shape (n,)
+            price (float or np.ndarray): Price, scalar or per wallet
+            symbol (str): Symbol traded
+            invest_fraction (float): Share of USD balance spent per BUY
+            min_trade (float): Minimum USD amount for a BUY
+        
+        Returns:
+            tuple: (bought, sold) masks of executed trades, overwritten
+                by the next call
+        """
+        if self._scratch is None or len(self._scratch[0]) != len(self):
+            n = len(self)
+            self._scratch = (np.empty(n), np.empty(n, dtype=bool), np.empty(n, dtype=bool), np.empty(n, dtype=bool))
+        amount, bought, sold, keep = self._scratch
+        held = self.holdings[:, self.column(symbol)]
+        
+        # BUY: effective price includes slippage, fee comes out of the USD spent
+        np.multiply(self.usd_balance, invest_fraction, out=amount)
+        np.greater(amount, min_trade, out=bought)
+        bought &= buys
+        amount *= bought
+        self.usd_balance -= amount
+        amount *= (1 - self.fee_rate) / (price * (1 + self.slippage_rate))
+        held += amount
+        self.trades += bought
+        
+        # SELL: whole position at a slipped price, fee out of the proceeds
+        np.greater(held, 0.0, out=sold)
+        sold &= sells
+        np.multiply(held, price * (1 - self.slippage_rate) * (1 - self.fee_rate), out=amount)
+        amount *= sold
+        self.usd_balance += amount
+        self.trades += sold
+        np.logical_not(sold, out=keep)
+        held *= keep
+        
+        return bought, sold
+    
+    def apply(self, decisions, symbol, price, invest_fraction=0.9, min_trade=10.0):
+        """
+        Apply one decision per wallet for a single symbol.
+        
+        Args:
+            decisions (np.ndarray): SIGNAL_CODES, shape (n,)
+            symbol (str): Symbol traded
+            price (float or np.ndarray): Price, scalar or per wallet
+            invest_fraction (float): Share of USD balance spent per BUY
+            min_trade (float): Minimum USD amount for a BUY
+        
+        Returns:
+            tuple: (bought, sold) boolean masks of executed trades
+        """
+        decisions = np.asarray(decisions)
+        bought, sold = self.trade(
+            decisions == SIGNAL_CODES["BUY"], decisions == SIGNAL_CODES["SELL"], price, symbol,
+            invest_fraction=invest_fraction, min_trade=min_trade
+        )
+        return bought.copy(), sold.copy()
+    
+    def apply_all(self, decisions, current_prices, **kwargs):
+        """
+        Apply decisions for every symbol, one symbol column at a time.
+        
+        Args:
+            decisions (np.ndarray): SIGNAL_CODES, shape (n, m)
+            current_prices (dict or np.ndarray): Prices per symbol
+        """
+        prices = self._price_vector(current_prices)
+        for col, symbol in enumerate(self.symbols):
+            self.apply(decisions[:, col], symbol, prices[col], **kwargs)
+    
+    def get_total_value(self, current_prices):
+        """
+        Total value of every wallet in USD.
+        
+        Args:
+            current_prices (dict or np.ndarray): Prices per symbol;
+                symbols missing from a dict are valued at 0
+        
+        Returns:
+            np.ndarray: Total value per wallet, shape (n,)
+        """
+        return self.usd_balance + self.holdings @ self._price_vector(current_prices)
+    
+    @classmethod
+    def from_wallets(cls, wallets, symbols=None):
+        """
+        Build a ledger from VirtualWallets.
+        
+        Args:
+            wallets (list): VirtualWallet instances
+            symbols (list): Holdings columns to put first; symbols held
+                by any wallet are added after them
+        
+        Returns:
+            PortfolioLedger: Ledger with one row per wallet
+        """
+        symbols = list(symbols or [])
+        held = sorted({s for w in wallets for s in w.holdings} - set(symbols))
+        symbols = symbols + held or ['BTC']
+        ledger = cls(
+            len(wallets),
+            symbols,
+            initial_usd=[w.usd_balance for w in wallets],
+            fee_rate=np.array([w.fee_rate for w in wallets]),
+            slippage_rate=np.array([w.slippage_rate for w in wallets])
+        )
+        for i, wallet in enumerate(wallets):
+            for symbol, amount in wallet.holdings.items():
+                ledger.holdings[i, ledger.column(symbol)] = amount
+        return ledger
+    
+    def to_wallet(self, i):
+        """
+        VirtualWallet copy of one ledger row.
+        
+        Returns:
+            VirtualWallet: Wallet with the row's balances
+        """
+        wallet = VirtualWallet(
+            initial_usd=float(self.usd_balance[i]),
+            fee_rate=float(np.broadcast_to(self.fee_rate, len(self))[i]),
+            slippage_rate=float(np.broadcast_to(self.slippage_rate, len(self))[i])
+        )
+        self.write_back(wallet, i)
+        return wallet
+    
+    def write_back(self, wallet, i):
+        """
+        Store one ledger row's balances in an existing VirtualWallet.
+        
+        Keeps the wallet's order book and other holdings; positions
+        closed in the ledger are kept at 0 and lose their protective
+        orders, like VirtualWallet.sell does.
+        
+        Args:
+            wallet (VirtualWallet): Wallet the row was built from
+            i (int): Ledger row
+        """
+        wallet.usd_balance = float(self.usd_balance[i])
+        for symbol, amount in zip(self.symbols, self.holdings[i].tolist()):
+            if amount > 0 or symbol in wallet.holdings:
+                closed = amount <= 0 < wallet.holdings.get(symbol, 0)
+                wallet.holdings[symbol] = amount
+                if closed:
+                    wallet.cancel_protective_orders(symbol)
@@ -0,0 +1,187 @@
+"""
+Market Data Module
+Shared exchange client reused for every price and candle request
+"""
+
+# Candle duration per ccxt timeframe, in milliseconds
+TIMEFRAME_MS = {
+    '1m': 60_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '1h': 3_600_000,
+    '4h': 14_400_000,
+    '1d': 86_400_000
+}
+
+
+def held_symbols(holdings_list, quote='USDT', base_symbols=('BTC',)):
+    """
+    List the trading pairs needed to value a set of wallets.
+    
+    Args:
+        holdings_list (list): Holdings dicts {symbol: amount}, one per wallet
+        quote (str): Quote currency of the pairs
+        base_symbols (tuple): Symbols always included (traded by the bots)
+    
+    Returns:
+        list: Sorted pair symbols, e.g. ['BTC/USDT', 'ETH/USDT']
+    """
+    symbols = set(base_symbols)
+    for holdings in holdings_list:
+        symbols.update(symbol for symbol, amount in holdings.items() if amount > 0)
+    return sorted(f"{symbol}/{quote}" for symbol in symbols)
+
+
+class MarketDataClient:
+    """
+    Market data client holding a single exchange session.
+    
+    The exchange object (and with it the HTTP connection pool and the
+    loaded markets) is created once and reused for every request.
+    
+    Attributes:
+        exchange_id (str): ccxt exchange id
+    """
+    
+    def __init__(self, exchange=None, exchange_id='binance'):
+        """
+        Initialize market data client.
+        
+        Args:
+            exchange: Pre-built ccxt-compatible exchange (e.g. a fake one)
+            exchange_id (str): ccxt exchange id used when none is given
+        """
+        self.exchange_id = exchange_id
+        self._exchange = exchange
+    
+    @property
+    def exchange(self):
+        """Exchange session, created on first use."""
+        if self._exchange is None:
+            import ccxt
+            self._exchange = getattr(ccxt, self.exchange_id)({'enableRateLimit': True})
+        return self._exchange
+    
+    def get_price(self, symbol='BTC/USDT'):
+        """
+        Fetch the last traded price of one pair.
+        
+        Returns:
+            float: Last price
+        """
+        return self.exchange.fetch_ticker(symbol)['last']
+    
+    def get_prices(self, symbols):
+        """
+        Fetch last prices for several pairs in one request.
+        
+        Args:
+            symbols (list): Pair symbols, e.g. ['BTC/USDT', 'ETH/USDT']
+        
+        Returns:
+            dict: {base symbol: last price}, e.g. {'BTC': 102345.67}
+        """
+        tickers = self.exchange.fetch_tickers(list(symbols))
+        return {
+            symbol.split('/')[0]: ticker['last']
+            for symbol, ticker in tickers.items()
+            if ticker.get('last') is not None
+        }
+    
+    def get_ohlcv(self, symbol='BTC/USDT', timeframe='1h', since=None, limit=100):
+        """
+        Fetch OHLCV candles.
+        
+        Returns:
+            list: [[timestamp, open, high, low, close, volume], ...]
+        """
+        return self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+    
+    def close(self):
+        """Release the exchange session."""
+        session = getattr(self._exchange, 'session', None)
+        if session is not None:
+            session.close()
+        elif self._exchange is not None:
+            self._exchange.close()
+        self._exchange = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncMarketDataClient:
+    """
+    asyncio variant of MarketDataClient built on ccxt.async_support.
+    
+    Attributes:
+        exchange_id (str): ccxt exchange id
+    """
+    
+    def __init__(self, exchange=None, exchange_id='binance'):
+        """
+        Initialize async market data client.
+        
+        Args:
+            exchange: Pre-built async ccxt-compatible exchange
+            exchange_id (str): ccxt exchange id used when none is given
+        """
+        self.exchange_id = exchange_id
+        self._exchange = exchange
+    
+    @property
+    def exchange(self):
+        """Async exchange session, created on first use."""
+        if self._exchange is None:
+            import ccxt.async_support as ccxt_async
+            self._exchange = getattr(ccxt_async, self.exchange_id)({'enableRateLimit': True})
+        return self._exchange
+    
+    async def get_price(self, symbol='BTC/USDT'):
+        """Fetch the last traded price of one pair."""
+        ticker = await self.exchange.fetch_ticker(symbol)
+        return ticker['last']
+    
+    async def get_prices(self, symbols):
+        """Fetch last prices for several pairs in one request."""
+        tickers = await self.exchange.fetch_tickers(list(symbols))
+        return {
+            symbol.split('/')[0]: ticker['last']
+            for symbol, ticker in tickers.items()
+            if ticker.get('last') is not None
+        }
+    
+    async def get_ohlcv(self, symbol='BTC/USDT', timeframe='1h', since=None, limit=100):
+        """Fetch OHLCV candles."""
+        return await self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+    
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self._exchange is not None:
+            await self._exchange.close()
+        self._exchange = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+_default_client = None
+
+
+def get_client():
+    """
+    Shared MarketDataClient for the current process.
+    
+    Returns:
+        MarketDataClient: The same instance on every call
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = MarketDataClient()
+    return _default_client
@@ -0,0 +1,207 @@
+"""
+Metrics Module
+Per-phase wall time, CPU time and peak memory of a run
+"""
+
+import contextlib
+import cProfile
+import json
+import marshal
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from src.utils import atomic_open
+
+
+PROMETHEUS_PREFIX = 'paper_trading'
+
+
+class RunMetrics:
+    """
+    Collects timings of one run and writes them as JSON and Prometheus text.
+    
+    Phases are timed with phase(); bot decisions are timed through the
+    TradingBot decide hooks while session() is active, so strategies need
+    no changes. Memory is the tracemalloc peak while a phase runs (Python
+    allocations only). Bot CPU time is per thread, since bots decide
+    concurrently.
+    
+    Output files (in `directory`):
+        metrics.json    # Full run metrics
+        metrics.prom    # Prometheus textfile collector format
+        profile.pstats  # cProfile dump of the main thread (if profile=True)
+    
+    Attributes:
+        directory (str): Output directory (None = keep metrics in memory)
+        memory (bool): Track peak memory with tracemalloc
+        profile (bool): Record a cProfile dump of the run
+        phases (dict): {phase: {'wall_seconds', 'cpu_seconds', 'peak_memory_bytes'}}
+        bots (dict): {bot name: {'wall_seconds', 'cpu_seconds'}}
+    """
+    
+    def __init__(self, directory='metrics', memory=False, profile=False):
+        """
+        Initialize metrics.
+        
+        Args:
+            directory (str): Output directory, None to skip writing files
+            memory (bool): Track peak memory with tracemalloc (slower allocations)
+            profile (bool): Record a cProfile dump
+        """
+        self.directory = directory
+        self.memory = memory
+        self.profile = profile
+        self.phases = {}
+        self.bots = {}
+        self.started_at = None
+        self.totals = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls):
+        """
+        Metrics configured from environment variables.
+        
+        METRICS_DIR (default 'metrics', empty to disable files),
+        METRICS_MEMORY ('1' enables tracemalloc, which slows every
+        allocation, so it is off by default) and PROFILE ('1' enables
+        the cProfile dump).
+        """
+        return cls(
+            directory=os.getenv('METRICS_DIR', 'metrics') or None,
+            memory=os.getenv('METRICS_MEMORY', '0') == '1',
+            profile=os.getenv('PROFILE', '0') == '1'
+        )
+    
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a block as phase `name`."""
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'wall_seconds': time.perf_counter() - wall,
+                'cpu_seconds': time.process_time() - cpu
+            }
+            if self.memory and tracemalloc.is_tracing():
+                record['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+            self.phases[name] = record
+    
+    @contextlib.contextmanager
+    def bot_hook(self, bot):
+        """TradingBot decide hook: time one decide() call of `bot`."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            record = {
+                'wall_seconds': time.perf_counter() - wall,
+                'cpu_seconds': time.thread_time() - cpu
+            }
+            with self._lock:
+                self.bots[bot.name] = record
+    
+    @contextlib.contextmanager
+    def session(self):
+        """
+        Instrument everything run inside the block, then write the files.
+        """
+        from src.bots import TradingBot
+        
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile() if self.profile else None
+        if profiler:
+            profiler.enable()
+        TradingBot.decide_hooks.append(self.bot_hook)
+        
+        self.started_at = datetime.now()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield self
+        finally:
+            self.totals = {
+                'wall_seconds': time.perf_counter() - wall,
+                'cpu_seconds': time.process_time() - cpu
+            }
+            TradingBot.decide_hooks.remove(self.bot_hook)
+            if profiler:
+                profiler.disable()
+            peaks = [record['peak_memory_bytes'] for record in self.phases.values() if 'peak_memory_bytes' in record]
+            if peaks:
+                self.totals['peak_memory_bytes'] = max(peaks)
+            if started_tracing:
+                tracemalloc.stop()
+            self.write(profiler)
+    
+    def to_dict(self):
+        return {
+            'timestamp': self.started_at.isoformat() if self.started_at else None,
+            **self.totals,
+            'phases': self.phases,
+            'bots': self.bots
+        }
+    
+    def to_prometheus(self):
+        """
+        Metrics in the Prometheus text exposition format.
+        
+        Returns:
+            str: One gauge family per measurement, labelled by phase or bot
+        """
+        families = {
+            'run_wall_seconds': ('Wall time of the whole run', [({}, self.totals.get('wall_seconds'))]),
+            'run_cpu_seconds': ('CPU time of the whole run', [({}, self.totals.get('cpu_seconds'))]),
+            'run_peak_memory_bytes': ('Highest phase peak of traced Python memory', [({}, self.totals.get('peak_memory_bytes'))]),
+            'run_timestamp_seconds': ('Start time of the run', [({}, self.started_at.timestamp() if self.started_at else None)]),
+        }
+        for key, help_text in [
+            ('wall_seconds', 'Wall time per run phase'),
+            ('cpu_seconds', 'CPU time per run phase'),
+            ('peak_memory_bytes', 'Peak traced Python memory per run phase')
+        ]:
+            families[f"phase_{key}"] = (help_text, [({'phase': name}, record.get(key)) for name, record in self.phases.items()])
+        for key, help_text in [
+            ('wall_seconds', 'Wall time of each bot decision'),
+            ('cpu_seconds', 'CPU time of each bot decision (own thread)')
+        ]:
+            families[f"bot_decide_{key}"] = (help_text, [({'bot': name}, record.get(key)) for name, record in self.bots.items()])
+        
+        lines = []
+        for family, (help_text, samples) in families.items():
+            samples = [(labels, value) for labels, value in samples if value is not None]
+            if not samples:
+                continue
+            name = f"{PROMETHEUS_PREFIX}_{family}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{label}="{text}"' for label, text in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, profiler=None):
+        """Write metrics.json, metrics.prom and the optional profile."""
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with atomic_open(os.path.join(self.directory, 'metrics.json')) as f:
+                json.dump(self.to_dict(), f, indent=2)
+            with atomic_open(os.path.join(self.directory, 'metrics.prom')) as f:
+                f.write(self.to_prometheus())
+            if profiler:
+                # What Profile.dump_stats writes, through the same atomic rename
+                profiler.create_stats()
+                with atomic_open(os.path.join(self.directory, 'profile.pstats'), 'wb') as f:
+                    marshal.dump(profiler.stats, f)
+            print(f"⏱️ Run metrics saved to {self.directory}/")
+        except Exception as e:
+            print(f"❌ Error saving metrics: {e}")
@@ -0,0 +1,134 @@
+"""
+Monte Carlo Module
+Outcome distribution of random strategies over one price path
+
+A single live history of WhaleHunter (or AgentClaude without an API
+key) is one draw from its distribution of outcomes. This module runs
+many seeded copies of such a strategy over the same candles at once:
+decisions are drawn as NumPy arrays, one row per candle and one column
+per copy, and executed by backtest.simulate_batch, the PortfolioLedger
+trade kernel every vectorized simulation shares.
+
+Usage:
+    python -m src.montecarlo --bot WhaleHunter --paths 100000 --timeframe 1h --candles 8760
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.backtest import simulate_batch
+from src.bots import create_bots
+from src.market import TIMEFRAME_MS
+from src.store import CandleStore
+from src.wallet import VirtualWallet
+
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+BLOCK_PATHS = 25_000  # Paths per block; each block has its own random stream
+
+
+def _simulate_block(bot, close, n_paths, seed_sequence, wallet, chunk_size):
+    """Process pool task: one block of paths with its own random stream."""
+    sample = bot.signal_sampler(n_paths, np.random.default_rng(seed_sequence))
+    result = simulate_batch(close, sample, n_paths, wallet=wallet, chunk_size=chunk_size)
+    del result['ledger']  # Only the per-path arrays go back to the parent process
+    return result
+
+
+def monte_carlo(bot, ohlcv, n_paths=10_000, seed=0, wallet=None, workers=1, chunk_size=64):
+    """
+    Distribution of outcomes of a random strategy over one candle series.
+    
+    Paths are split into blocks of BLOCK_PATHS, each drawing from its
+    own stream spawned from `seed`, so results only depend on the seed
+    and the number of paths, not on how many workers run the blocks.
+    
+    Args:
+        bot (TradingBot): Strategy implementing signal_sampler()
+        ohlcv (array-like): OHLCV rows [timestamp, open, high, low, close, volume]
+        n_paths (int): Number of seeded copies
+        seed (int): Seed of all copies
+        wallet (VirtualWallet): Starting wallet of every copy, $1000 by default
+        workers (int): Processes running blocks in parallel (1 = in process)
+        chunk_size (int): Candles drawn at a time
+    
+    Returns:
+        dict: 'paths', 'candles', 'initial_value', per-path arrays
+            'final_value', 'max_drawdown', 'trades', and 'percentiles'
+            {percentile: {'final_value', 'max_drawdown'}}
+    """
+    wallet = wallet or VirtualWallet()
+    close = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)[:, 4]
+    sizes = [min(BLOCK_PATHS, n_paths - start) for start in range(0, n_paths, BLOCK_PATHS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(bot, close, size, block_seed, wallet, chunk_size) for size, block_seed in zip(sizes, seeds)]
+    
+    if workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            blocks = list(pool.map(_simulate_block, *zip(*tasks)))
+    else:
+        blocks = [_simulate_block(*task) for task in tasks]
+    result = {key: np.concatenate([block[key] for block in blocks]) for key in ('final_value', 'max_drawdown', 'trades')}
+    
+    final_values = np.percentile(result['final_value'], PERCENTILES)
+    drawdowns = np.percentile(result['max_drawdown'], PERCENTILES)
+    result['percentiles'] = {
+        p: {'final_value': float(value), 'max_drawdown': float(drawdown)}
+        for p, value, drawdown in zip(PERCENTILES, final_values, drawdowns)
+    }
+    result['paths'] = n_paths
+    result['candles'] = len(close)
+    result['initial_value'] = wallet.get_total_value({'BTC': float(close[0])}) if len(close) else wallet.usd_balance
+    return result
+
+
+def format_report(name, result):
+    """Text table of a monte_carlo() result."""
+    initial = result['initial_value']
+    lines = [
+        f"🎲 {name}: {result['paths']:,} paths over {result['candles']:,} candles",
+        f"   {'percentile':>10} {'final value':>12} {'return':>8} {'max drawdown':>13}"
+    ]
+    for p, values in result['percentiles'].items():
+        change = (values['final_value'] / initial - 1) * 100
+        lines.append(f"   {p:>10} ${values['final_value']:>11,.2f} {change:>+7.1f}% {values['max_drawdown'] * 100:>12.1f}%")
+    lines.append(f"   Mean ${result['final_value'].mean():,.2f}, "
+                 f"P(loss) {np.mean(result['final_value'] < initial) * 100:.1f}%, "
+                 f"mean trades {result['trades'].mean():,.0f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo outcome distribution of a random strategy')
+    parser.add_argument('--bot', default='WhaleHunter', help='Strategy implementing signal_sampler()')
+    parser.add_argument('--paths', type=int, default=100_000, help='Seeded copies')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--root', default='candles', help='Candle store directory')
+    parser.add_argument('--symbol', default='BTC/USDT', help='Trading pair')
+    parser.add_argument('--timeframe', default='1h', choices=sorted(TIMEFRAME_MS), help='Candle timeframe')
+    parser.add_argument('--candles', type=int, default=8760, help='Newest candles to run over')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    args = parser.parse_args()
+    
+    ohlcv = CandleStore(args.root).read_array(args.symbol, args.timeframe, limit=args.candles)
+    if len(ohlcv) == 0:
+        print(f"❌ No {args.symbol} {args.timeframe} candles in {args.root}/ (see python -m src.backfill)")
+        return
+    
+    bots = create_bots(names=[args.bot])
+    if args.bot not in bots:
+        return
+    bot = bots[args.bot]
+    start = time.perf_counter()
+    result = monte_carlo(bot, ohlcv, n_paths=args.paths, seed=args.seed, workers=args.workers)
+    print(format_report(args.bot, result))
+    print(f"⏱️ {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Order Book Module
+Resting limit, stop-loss and take-profit orders indexed by trigger price
+"""
+
+import heapq
+import itertools
+
+
+# (side, trigger direction) of each order kind: orders in the "below" heap
+# trigger when the price falls to their level, "above" when it rises to it
+ORDER_KINDS = {
+    'limit_buy': ('buy', 'below'),
+    'limit_sell': ('sell', 'above'),
+    'stop_loss': ('sell', 'below'),
+    'take_profit': ('sell', 'above')
+}
+
+# Kinds that protect an open position; they are cancelled once it is closed
+PROTECTIVE_KINDS = ('stop_loss', 'take_profit')
+
+
+class Order:
+    """
+    One resting order.
+    
+    Attributes:
+        id (int): Order id, unique within its book
+        wallet (VirtualWallet): Wallet the order trades for
+        symbol (str): Crypto symbol (e.g., 'BTC')
+        kind (str): One of ORDER_KINDS
+        price (float): Limit or trigger price
+        amount (float): USD to spend for buys; crypto to sell for sells
+            (None = the whole position when triggered)
+        status (str): 'open', 'filled', 'cancelled' or 'rejected'
+        fill_price (float): Effective execution price once filled
+    """
+    
+    __slots__ = ('id', 'wallet', 'symbol', 'kind', 'price', 'amount', 'status', 'fill_price')
+    
+    def __init__(self, id, wallet, symbol, kind, price, amount=None):
+        self.id = id
+        self.wallet = wallet
+        self.symbol = symbol
+        self.kind = kind
+        self.price = price
+        self.amount = amount
+        self.status = 'open'
+        self.fill_price = None
+    
+    def get_state(self):
+        return {'symbol': self.symbol, 'kind': self.kind, 'price': self.price, 'amount': self.amount}
+    
+    def __repr__(self):
+        return f"Order({self.id}, {self.kind} {self.symbol} @ {self.price}, {self.status})"
+
+
+class OrderBook:
+    """
+    Resting orders of any number of wallets, kept in price-sorted heaps.
+    
+    Per symbol there are two heaps: a max-heap of levels that trigger
+    when the price falls (limit buys, stop-losses) and a min-heap of
+    levels that trigger when it rises (limit sells, take-profits). A
+    candle only pops the orders its low/high crossed, so processing it
+    costs O(k log n) for k triggered orders out of n open ones.
+    Cancelled orders are removed lazily and the heaps are rebuilt once
+    they are mostly dead entries.
+    
+    Attributes:
+        orders (dict): Open orders {id: Order}
+    """
+    
+    def __init__(self):
+        self.orders = {}
+        self._heaps = {}  # {(symbol, 'below' | 'above'): [(key, seq, order), ...]}
+        self._ids = itertools.count(1)
+        self._dead = 0
+    
+    def __len__(self):
+        return len(self.orders)
+    
+    def place(self, wallet, symbol, kind, price, amount=None):
+        """
+        Add a resting order.
+        
+        Funds are not reserved: a triggered order the wallet can no
+        longer cover is rejected.
+        
+        Args:
+            wallet (VirtualWallet): Wallet to trade for
+            symbol (str): Crypto symbol
+            kind (str): 'limit_buy', 'limit_sell', 'stop_loss' or 'take_profit'
+            price (float): Limit or trigger price
+            amount (float): USD for buys (required), crypto for sells
+                (None = whole position)
+        
+        Returns:
+            Order: The new order
+        """
+        if kind not in ORDER_KINDS:
+            raise ValueError(f"Unknown order kind '{kind}'")
+        side, direction = ORDER_KINDS[kind]
+        if price <= 0 or (amount is not None and amount <= 0) or (side == 'buy' and amount is None):
+            raise ValueError(f"Invalid {kind} order: price={price}, amount={amount}")
+        
+        order = Order(next(self._ids), wallet, symbol, kind, price, amount)
+        self.orders[order.id] = order
+        key = -price if direction == 'below' else price
+        heapq.heappush(self._heaps.setdefault((symbol, direction), []), (key, order.id, order))
+        return order
+    
+    def cancel(self, order_id):
+        """
+        Cancel an open order.
+        
+        Returns:
+            bool: True if the order was open
+        """
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        order.status = 'cancelled'
+        self._dead += 1
+        if self._dead > 1024 and self._dead > len(self.orders):
+            self._rebuild()
+        return True
+    
+    def cancel_all(self, wallet=None):
+        """Cancel every open order, or only those of one wallet."""
+        for order in list(self.orders.values()):
+            if wallet is None or order.wallet is wallet:
+                self.cancel(order.id)
+    
+    def open_orders(self, wallet=None):
+        """Open orders, optionally of one wallet, in placement order."""
+        return [order for order in self.orders.values() if wallet is None or order.wallet is wallet]
+    
+    def _rebuild(self):
+        """Drop cancelled entries from every heap."""
+        for heap in self._heaps.values():
+            heap[:] = [entry for entry in heap if entry[2].status == 'open']
+            heapq.heapify(heap)
+        self._dead = 0
+    
+    def _trigger(self, symbol, direction, level, open_price, fills):
+        """Fill every open order in one heap crossed by `level`."""
+        heap = self._heaps.get((symbol, direction))
+        while heap:
+            key, _, order = heap[0]
+            price = -key if direction == 'below' else key
+            if (level > price) if direction == 'below' else (level < price):
+                break
+            heapq.heappop(heap)
+            if order.status != 'open':
+                self._dead -= 1
+                continue
+            del self.orders[order.id]
+            
+            # A gap through the level fills at the open instead
+            fill = min(price, open_price) if direction == 'below' else max(price, open_price)
+            if order.wallet.fill_order(order, fill):
+                order.status = 'filled'
+                fills.append(order)
+            else:
+                order.status = 'rejected'
+    
+    def process_candle(self, symbol, candle):
+        """
+        Trigger the orders a candle crossed.
+        
+        The intra-candle path is assumed to be open → low → high → close
+        for up candles and open → high → low → close for down candles,
+        so orders filled on the first leg can be followed by orders
+        (e.g. a take-profit) triggered on the second.
+        
+        Args:
+            symbol (str): Crypto symbol of the candle
+            candle (list): [timestamp, open, high, low, close, volume]
+        
+        Returns:
+            list: Orders filled by this candle, in execution order
+        """
+        _, open_price, high, low, close = candle[:5]
+        fills = []
+        if close >= open_price:
+            self._trigger(symbol, 'below', low, open_price, fills)
+            self._trigger(symbol, 'above', high, open_price, fills)
+        else:
+            self._trigger(symbol, 'above', high, open_price, fills)
+            self._trigger(symbol, 'below', low, open_price, fills)
+        return fills
+    
+    def process_candles(self, symbol, ohlcv):
+        """
+        Run a series of candles through the book.
+        
+        Returns:
+            list: All filled orders, in execution order
+        """
+        fills = []
+        for candle in ohlcv:
+            fills.extend(self.process_candle(symbol, candle))
+        return fills
@@ -0,0 +1,290 @@
+"""
+Replay Module
+Deterministic offline replay of recorded market data through main()
+
+A tape holds OHLCV candles plus one ticker frame per run. Replaying it
+runs the full orchestration once per frame against a simulated clock,
+with seeded bot RNGs and a seeded fake LLM, so the same tape and seed
+always produce the same state, history and chart.
+
+Usage:
+    python -m src.replay tape.json --directory replay --seed 0
+    python -m src.replay --from-store candles --save-tape tape.json
+"""
+
+import argparse
+import bisect
+import contextlib
+import io
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from src.cache import RUN_INTERVAL
+from src.fakes import FakeAnthropic
+from src.market import TIMEFRAME_MS, MarketDataClient
+
+
+RUN_INTERVAL_MS = RUN_INTERVAL * 1000
+
+
+def to_datetime(timestamp_ms):
+    """Naive UTC datetime of a millisecond timestamp."""
+    return datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc).replace(tzinfo=None)
+
+
+class Tape:
+    """
+    Recorded market data: candles per pair and one ticker frame per run.
+    
+    Attributes:
+        timeframe (str): Timeframe of every candle series
+        candles (dict): {pair: [[timestamp, open, high, low, close, volume], ...]}
+        frames (list): [{'timestamp': ms, 'prices': {pair: last}}, ...] in time order
+    """
+    
+    def __init__(self, timeframe='1h', candles=None, frames=None):
+        self.timeframe = timeframe
+        self.candles = {pair: sorted(rows) for pair, rows in (candles or {}).items()}
+        self.frames = sorted(frames or [], key=lambda frame: frame['timestamp'])
+    
+    def __len__(self):
+        return len(self.frames)
+    
+    def add_frame(self, timestamp, prices, candles=None):
+        """
+        Record one run: ticker prices and any newly seen candles.
+        
+        Candles overlapping the tape replace the stored ones, so the
+        still-open candle of one recording is updated by the next.
+        
+        Args:
+            timestamp (int): Run time in milliseconds
+            prices (dict): {pair: last price}
+            candles (dict): {pair: OHLCV rows} fetched during the run
+        """
+        self.frames.append({'timestamp': timestamp, 'prices': dict(prices)})
+        self.frames.sort(key=lambda frame: frame['timestamp'])
+        for pair, rows in (candles or {}).items():
+            merged = {row[0]: list(row) for row in self.candles.get(pair, [])}
+            merged.update((row[0], list(row)) for row in rows)
+            self.candles[pair] = [merged[ts] for ts in sorted(merged)]
+    
+    @classmethod
+    def from_candles(cls, candles, timeframe='1h', interval_ms=RUN_INTERVAL_MS, warmup=100):
+        """
+        Build a tape from candle series, with one frame per scheduled run.
+        
+        Frames are placed at every candle open time that is a multiple
+        of `interval_ms`, after `warmup` candles of history. The frame
+        price is that candle's open, i.e. what a ticker showed the
+        moment the candle opened, so no frame sees future prices.
+        
+        Args:
+            candles (dict): {pair: OHLCV rows}; the first pair drives the frames
+            timeframe (str): Timeframe of the rows
+            interval_ms (int): Time between runs in milliseconds
+            warmup (int): Candles before the first frame
+        
+        Returns:
+            Tape: Tape covering the series
+        """
+        tape = cls(timeframe, candles)
+        if not tape.candles:
+            return tape
+        opens = {pair: {row[0]: row[1] for row in rows} for pair, rows in tape.candles.items()}
+        lead = next(iter(tape.candles.values()))
+        for row in lead[warmup:]:
+            if row[0] % interval_ms == 0:
+                prices = {pair: by_ts[row[0]] for pair, by_ts in opens.items() if row[0] in by_ts}
+                tape.frames.append({'timestamp': row[0], 'prices': prices})
+        return tape
+    
+    @classmethod
+    def from_store(cls, store, pairs=('BTC/USDT',), timeframe='1h', **kwargs):
+        """
+        Build a tape from a CandleStore (see from_candles for kwargs).
+        """
+        return cls.from_candles({pair: store.read_rows(pair, timeframe) for pair in pairs}, timeframe, **kwargs)
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(data['timeframe'], data['candles'], data['frames'])
+    
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump({'timeframe': self.timeframe, 'candles': self.candles, 'frames': self.frames}, f)
+
+
+class TapeExchange:
+    """
+    ccxt-compatible exchange serving a tape as of the current frame.
+    
+    Only candles that had opened by the frame time are visible. The
+    candle still open at that time is cut at the frame price (open,
+    high and low widened to it, volume prorated), the same shape the
+    live exchange returns mid-candle.
+    
+    Attributes:
+        tape (Tape): Recorded data
+        frame (int): Index of the current frame
+        calls (dict): Number of calls per method name
+    """
+    
+    def __init__(self, tape):
+        self.tape = tape
+        self.frame = 0
+        self.calls = {}
+        self._timestamps = {pair: [row[0] for row in rows] for pair, rows in tape.candles.items()}
+    
+    def _count(self, method):
+        self.calls[method] = self.calls.get(method, 0) + 1
+    
+    def seek(self, frame):
+        """Move the exchange clock to a frame."""
+        self.frame = frame
+    
+    @property
+    def now_ms(self):
+        return self.tape.frames[self.frame]['timestamp']
+    
+    def load_markets(self, reload=False):
+        self._count('load_markets')
+        return {pair: {'symbol': pair} for pair in self.tape.candles}
+    
+    def _ticker(self, symbol):
+        prices = self.tape.frames[self.frame]['prices']
+        if symbol not in prices:
+            raise ValueError(f"No {symbol} price recorded at {to_datetime(self.now_ms)}")
+        return {'symbol': symbol, 'timestamp': self.now_ms, 'last': prices[symbol]}
+    
+    def fetch_ticker(self, symbol):
+        self._count('fetch_ticker')
+        return self._ticker(symbol)
+    
+    def fetch_tickers(self, symbols=None):
+        self._count('fetch_tickers')
+        return {symbol: self._ticker(symbol) for symbol in (symbols or self.tape.frames[self.frame]['prices'])}
+    
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=100):
+        self._count('fetch_ohlcv')
+        if timeframe != self.tape.timeframe:
+            raise ValueError(f"Tape has {self.tape.timeframe} candles, not {timeframe}")
+        rows = self.tape.candles.get(symbol, [])
+        timestamps = self._timestamps.get(symbol, [])
+        
+        now = self.now_ms
+        end = bisect.bisect_right(timestamps, now)
+        start = max(0, end - limit) if since is None else bisect.bisect_left(timestamps, since)
+        candles = [list(row) for row in rows[start:min(end, start + limit)]]
+        
+        step = TIMEFRAME_MS[timeframe]
+        if candles and candles[-1][0] + step > now:
+            # Still open: cut the candle at the frame price
+            timestamp, open_, high, low, _, volume = candles[-1]
+            price = self.tape.frames[self.frame]['prices'].get(symbol, open_)
+            elapsed = (now - timestamp) / step
+            candles[-1] = [timestamp, open_, max(open_, price), min(open_, price), price, volume * elapsed]
+        return candles
+    
+    def close(self):
+        self._count('close')
+
+
+def replay(tape, directory='replay', seed=0, llm_client=None, verbose=False):
+    """
+    Run main() once per tape frame in `directory`.
+    
+    Each run sees the simulated time of its frame, bots seeded with
+    "<seed>:<frame timestamp>" and a FakeAnthropic seeded with `seed`
+    (unless another LLM client is given). The chart is only drawn once
+    at the end.
+    
+    Args:
+        tape (Tape): Recorded data to replay
+        directory (str): Output directory for data.json, history, candles
+            and status.png; must not hold a previous replay
+        seed (int or str): Base seed of the replay
+        llm_client: Anthropic-compatible client for AgentClaude
+        verbose (bool): Show the output of every run
+    
+    Returns:
+        dict: Final state (as saved in data.json)
+    """
+    import main as orchestrator
+    from src.history import HistoryLog
+    from src.metrics import RunMetrics
+    from src.utils import generate_chart, load_state
+    
+    if os.path.exists(os.path.join(directory, 'data.json')):
+        raise ValueError(f"{directory}/ already holds a replay, use an empty directory")
+    os.makedirs(directory, exist_ok=True)
+    
+    exchange = TapeExchange(tape)
+    client = MarketDataClient(exchange)
+    llm_client = llm_client or FakeAnthropic(seed=seed)
+    
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        for i, frame in enumerate(tape.frames):
+            exchange.seek(i)
+            now = to_datetime(frame['timestamp'])
+            output = sys.stdout if verbose else io.StringIO()
+            with contextlib.redirect_stdout(output):
+                orchestrator.main(
+                    market_client=client,
+                    llm_client=llm_client,
+                    clock=lambda now=now: now,
+                    seed=f"{seed}:{frame['timestamp']}",
+                    chart=False,
+                    metrics=RunMetrics(directory=None, memory=False)
+                )
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_chart(HistoryLog().read())
+            return load_state()
+    finally:
+        os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded tape through main.py offline')
+    parser.add_argument('tape', nargs='?', help='Tape JSON file to replay')
+    parser.add_argument('--directory', default='replay', help='Output directory of the replay')
+    parser.add_argument('--seed', default='0', help='Base seed for bots and the fake LLM')
+    parser.add_argument('--from-store', metavar='ROOT', help='Build the tape from a CandleStore directory')
+    parser.add_argument('--save-tape', metavar='PATH', help='Write the tape built with --from-store')
+    parser.add_argument('--verbose', action='store_true', help='Show the output of every run')
+    args = parser.parse_args()
+    
+    if args.from_store:
+        from src.store import CandleStore
+        tape = Tape.from_store(CandleStore(args.from_store))
+        if args.save_tape:
+            tape.save(args.save_tape)
+            print(f"💾 Tape with {len(tape)} frames saved to {args.save_tape}")
+    elif args.tape:
+        tape = Tape.load(args.tape)
+    else:
+        parser.error('a tape file or --from-store is required')
+    
+    if not tape.frames:
+        print("❌ Tape has no frames to replay")
+        return
+    
+    start, end = to_datetime(tape.frames[0]['timestamp']), to_datetime(tape.frames[-1]['timestamp'])
+    print(f"⏪ Replaying {len(tape)} runs from {start:%Y-%m-%d %H:%M} to {end:%Y-%m-%d %H:%M}...")
+    state = replay(tape, args.directory, seed=args.seed, verbose=args.verbose)
+    
+    for bot_name, bot_state in state['bots'].items():
+        holdings = ", ".join(f"{amount:.6f} {symbol}" for symbol, amount in bot_state['holdings'].items())
+        print(f"{bot_name}: ${bot_state['usd_balance']:.2f}" + (f" + {holdings}" if holdings else ""))
+    print(f"✅ Replay written to {args.directory}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Decision Runner Module
+Runs bot decisions concurrently with per-bot deadlines
+"""
+
+import io
+import sys
+import threading
+import time
+
+
+DEFAULT_TIMEOUT = 30.0  # Seconds a bot may take before it is treated as HOLD
+
+
+# Per-thread capture buffers, shared by every _ThreadOutput so a thread keeps
+# its buffer when sys.stdout is replaced (e.g. by redirect_stdout) meanwhile
+_thread_buffers = threading.local()
+
+
+class _ThreadOutput:
+    """
+    sys.stdout replacement that buffers output per registered thread.
+    
+    Bots print while deciding; buffering keeps each bot's lines together
+    so they can be shown under its own header afterwards. Buffers are
+    thread-local and unregistered threads write straight through.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def register(self, buffer):
+        """Send the calling thread's output to `buffer`."""
+        _thread_buffers.buffer = buffer
+    
+    def write(self, text):
+        buffer = getattr(_thread_buffers, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def decide_all(bots, current_price, historical_data, timeout=DEFAULT_TIMEOUT):
+    """
+    Compute every bot's decision concurrently.
+    
+    Each bot runs decide() in its own daemon thread. A bot that raises,
+    or has not answered by its deadline, gets "HOLD"; a hung call is
+    abandoned rather than joined, so it cannot stall the run or keep
+    the process alive. Deadlines are measured from the common start,
+    so total latency is about the slowest bot (capped by its timeout)
+    instead of the sum of all bots.
+    
+    An abandoned call may still change its bot afterwards, so bots that
+    time out are removed from `bots`: callers must not persist their
+    state or reuse them (the daemon rebuilds them from the last saved
+    state). Output is captured while decide_all runs; sys.stdout is
+    restored on return, so whatever an abandoned call prints later goes
+    to the original stream.
+    
+    The candles are converted once into a FeatureStore shared by all
+    bots, so indicators are not recomputed per bot.
+    
+    Args:
+        bots (dict): {name: TradingBot}; timed-out bots are removed
+        current_price (float): Current BTC price
+        historical_data (list): Historical OHLCV data
+        timeout (float): Default deadline in seconds; a bot's own
+            `timeout` attribute takes precedence when set
+    
+    Returns:
+        tuple: ({name: decision}, {name: captured output}), both in the
+            iteration order of `bots` as passed in
+    """
+    from src.features import FeatureStore  # NumPy is only needed once bots run
+    
+    historical_data = FeatureStore.of(historical_data)
+    results = {}
+    threads = {}
+    
+    def run(name, bot, buffer):
+        output.register(buffer)
+        try:
+            results[name] = bot.decide(current_price, historical_data)
+        except Exception as e:
+            print(f"❌ {name}: Decision failed - {e}. HOLD")
+            results[name] = "HOLD"
+    
+    buffers = {name: io.StringIO() for name in bots}
+    decisions = {}
+    logs = {}
+    original = sys.stdout
+    output = sys.stdout = _ThreadOutput(original)
+    try:
+        start = time.monotonic()
+        for name, bot in bots.items():
+            thread = threading.Thread(target=run, args=(name, bot, buffers[name]), daemon=True)
+            thread.start()
+            threads[name] = thread
+        
+        for name, bot in list(bots.items()):
+            deadline = getattr(bot, 'timeout', None)
+            if deadline is None:
+                deadline = timeout
+            threads[name].join(max(0.0, start + deadline - time.monotonic()))
+            if name in results:
+                decisions[name] = results[name]
+                logs[name] = buffers[name].getvalue()
+            else:
+                # The thread keeps its own buffer; report from a snapshot of it
+                logs[name] = buffers[name].getvalue() + f"⏱️ {name}: No decision after {deadline:.1f}s, HOLD\n"
+                decisions[name] = "HOLD"
+                del bots[name]
+    finally:
+        if sys.stdout is output:  # Unless replaced again meanwhile
+            sys.stdout = original
+    
+    return decisions, logs
+
+
+def process_orders(order_book, wallets, candles, last_timestamp=None, symbol='BTC'):
+    """
+    Trigger resting orders on the candles closed since the last run.
+    
+    The newest candle may still be open, so it is left for the next
+    run. Without a last_timestamp (first run) only the newest closed
+    candle is processed. Runs before decisions are applied, so a
+    stop-loss hit since the last run fills before the bot's SELL.
+    
+    Args:
+        order_book (OrderBook): Book shared by the wallets
+        wallets (dict): {bot name: VirtualWallet}, to name the fills
+        candles (list or FeatureStore): OHLCV rows, oldest first
+        last_timestamp (int): Open time of the last candle processed before
+        symbol (str): Crypto symbol of the candles
+    
+    Returns:
+        int: Open time of the last processed candle (last_timestamp if none)
+    """
+    closed = [candles[i] for i in range(len(candles) - 1)]
+    if last_timestamp is None:
+        closed = closed[-1:]
+    else:
+        closed = [candle for candle in closed if candle[0] > last_timestamp]
+    
+    names = {id(wallet): name for name, wallet in wallets.items()}
+    for candle in closed:
+        for order in order_book.process_candle(symbol, candle):
+            print(f"🎯 {names.get(id(order.wallet), 'Unknown')}: {order.kind} {symbol} "
+                  f"filled @ ${order.fill_price:,.2f}")
+        last_timestamp = int(candle[0])
+    return last_timestamp
+
+
+def execute_decision(wallet, decision, current_price, symbol='BTC', invest_fraction=0.9, min_trade=10.0):
+    """
+    Apply one bot decision to its wallet.
+    
+    BUY spends `invest_fraction` of the USD balance when that is more
+    than `min_trade`, SELL liquidates the position, HOLD does nothing.
+    
+    Args:
+        wallet (VirtualWallet): Bot's wallet
+        decision (str): "BUY", "SELL" or "HOLD"
+        current_price (float): Execution price before slippage
+        symbol (str): Crypto symbol traded
+        invest_fraction (float): Share of the USD balance spent per BUY
+        min_trade (float): Minimum USD amount for a BUY
+    
+    Returns:
+        bool: True if a trade was executed
+    """
+    if decision == "BUY":
+        amount_to_invest = wallet.usd_balance * invest_fraction
+        if amount_to_invest > min_trade:
+            return wallet.buy(symbol, current_price, amount_to_invest)
+        print(f"⚠️ Insufficient funds to buy (${wallet.usd_balance:.2f})")
+    
+    elif decision == "SELL":
+        if symbol in wallet.holdings and wallet.holdings[symbol] > 0:
+            return wallet.sell(symbol, current_price)
+        print(f"⚠️ No {symbol} to sell")
+    
+    else:  # HOLD
+        print(f"⏸️ HOLD - No action taken")
+    
+    return False
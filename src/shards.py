@@ -0,0 +1,487 @@
+"""
+Shards Module
+State sharded by strategy, so independent runners can share one directory
+
+Each strategy owns a shard: a one-bot state file in the data.json format
+plus its own history log, guarded by a lock file. Runner processes (on
+one machine, or on several sharing the directory) each trade a subset
+of the strategies and only ever write their own shards; a merge step
+then builds the usual data.json, history and a leaderboard from them.
+
+Layout:
+    <root>/<strategy>/state.json    # {'bots', 'strategies', 'analytics', ...} of one bot
+    <root>/<strategy>/history/      # HistoryLog of that bot's snapshots
+    <root>/<strategy>/.lock         # Held while a runner or the merge uses the shard
+
+Usage:
+    python -m src.shards split data.json               # Migrate a single-file state
+    python -m src.shards run --bots RoboQuant WhaleHunter
+    python -m src.shards local --workers 3             # One process per subset, then merge
+    python -m src.shards merge
+"""
+
+import argparse
+import contextlib
+import math
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.analytics import PerformanceStats, update_analytics
+from src.bots import SIGNAL_CODES
+from src.history import HistoryLog
+from src.ledger import PortfolioLedger
+from src.market import held_symbols
+from src.runner import DEFAULT_TIMEOUT, decide_all
+from src.store import CandleStore
+from src.strategies import get_registry
+from src.utils import get_historical_prices, get_prices, load_state, save_state
+from src.wallet import VirtualWallet
+
+MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextlib.contextmanager
+def file_lock(path, shared=False):
+    """
+    Hold an advisory lock on `path` (created if missing) for the block.
+    
+    Shared locks (readers) coexist; an exclusive lock waits for all
+    others. Uses flock on POSIX and a byte-range lock on Windows, where
+    every lock is exclusive.
+    
+    Args:
+        path (str): Lock file
+        shared (bool): Take a shared instead of an exclusive lock
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    f = open(path, 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        f.close()
+
+
+class ShardStore:
+    """
+    Directory of per-strategy shards.
+    
+    Attributes:
+        root (str): Base directory
+    """
+    
+    def __init__(self, root='shards'):
+        """
+        Initialize shard store.
+        
+        Args:
+            root (str): Base directory (created on first write)
+        """
+        self.root = root
+    
+    def names(self):
+        """Strategies that have a shard, sorted by name."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, 'state.json')))
+    
+    def state_file(self, name):
+        return os.path.join(self.root, name, 'state.json')
+    
+    def history(self, name, clock=datetime.now):
+        """HistoryLog of one strategy's snapshots."""
+        return HistoryLog(os.path.join(self.root, name, 'history'), clock=clock)
+    
+    def lock(self, name, shared=False):
+        """Lock of one shard (see file_lock)."""
+        return file_lock(os.path.join(self.root, name, '.lock'), shared=shared)
+    
+    @contextlib.contextmanager
+    def locked(self, names, shared=False):
+        """Hold the locks of several shards, taken in name order to avoid deadlocks."""
+        with contextlib.ExitStack() as stack:
+            for name in sorted(names):
+                stack.enter_context(self.lock(name, shared=shared))
+            yield
+    
+    def load(self, name, now=None):
+        """
+        State of one shard, a new $1000 wallet if it has none yet.
+        
+        Returns:
+            dict: One-bot state in the data.json format
+        """
+        os.makedirs(os.path.join(self.root, name), exist_ok=True)
+        return load_state(self.state_file(name), now=now, names=[name])
+    
+    def save(self, name, state):
+        """Write one shard's state atomically."""
+        save_state(state, self.state_file(name))
+
+
+def partition(names, workers):
+    """
+    Split strategy names into `workers` disjoint subsets, round-robin.
+    
+    Returns:
+        list: Lists of names (empty subsets dropped)
+    """
+    return [subset for subset in (names[i::workers] for i in range(workers)) if subset]
+
+
+def run_shards(names, root='shards', market_client=None, llm_client=None, clock=datetime.now, seed=None,
+               candle_root='candles'):
+    """
+    One trading cycle for the strategies owned by this runner.
+    
+    The owned shards stay locked for the whole cycle, so two runners
+    given the same strategy take turns instead of overwriting each
+    other. Candle downloads go through a lock on the shared candle store.
+    
+    Args:
+        names (list): Strategies owned by this runner
+        root (str): Shard directory
+        market_client (MarketDataClient): Market data source, shared Binance client by default
+        llm_client: Anthropic-compatible client for AgentClaude
+        clock (callable): Returns the current datetime
+        seed (int or str): Seed for the bots' RNGs
+        candle_root (str): Candle store directory shared by the runners
+    
+    Returns:
+        dict: {name: portfolio value after the cycle}
+    """
+    registry = get_registry()
+    shards = ShardStore(root)
+    now = clock()
+    
+    with shards.locked(names):
+        states = {name: shards.load(name, now=now) for name in names}
+        wallets = {}
+        for name, state in states.items():
+            wallets[name] = VirtualWallet()
+            wallets[name].load_state(state['bots'][name])
+        
+        symbols = held_symbols([wallet.holdings for wallet in wallets.values()])
+        current_prices = get_prices(symbols, client=market_client)
+        current_price = current_prices.get('BTC')
+        if not current_price:
+            print("❌ Failed to fetch BTC price. Skipping cycle.")
+            return {}
+        store = CandleStore(candle_root)
+        with file_lock(os.path.join(candle_root, '.lock')):
+            historical_data = get_historical_prices(limit=100, store=store, client=market_client)
+        
+        due = [name for name in names if name in registry.due(states[name].get('schedule', {}), now.timestamp())]
+        bots = registry.create_bots(due, llm_client=llm_client, seed=seed, clock=lambda: clock().timestamp())
+        for name, bot in bots.items():
+            bot.load_state(states[name].get('strategies', {}).get(name, {}))
+        
+        timeout = float(os.getenv('DECISION_TIMEOUT', DEFAULT_TIMEOUT))
+        decisions, decision_logs = decide_all(bots, current_price, historical_data, timeout=timeout)
+        
+        # Trade every decided wallet at once on a ledger, then store the rows back
+        traded = [name for name in names if name in decisions]
+        ledger = PortfolioLedger.from_wallets([wallets[name] for name in traded], symbols=['BTC'])
+        codes = np.array([SIGNAL_CODES.get(decisions[name], SIGNAL_CODES["HOLD"]) for name in traded], dtype=np.int8)
+        bought, sold = ledger.apply(codes, 'BTC', current_price)
+        for i, name in enumerate(traded):
+            ledger.write_back(wallets[name], i)
+        
+        values = {}
+        for name, state in states.items():
+            wallet = wallets[name]
+            if name in decisions:
+                print(decision_logs[name], end='')
+                i = traded.index(name)
+                if bought[i] or sold[i]:
+                    print(f"✅ {decisions[name]} @ ${current_price:,.2f} → USD ${wallet.usd_balance:.2f}, "
+                          f"BTC {wallet.holdings.get('BTC', 0):.8f}")
+                else:
+                    print(f"⏸️ {decisions[name]} - No trade")
+                if name in bots:  # Not timed out
+                    state.setdefault('strategies', {})[name] = bots[name].get_state()
+                schedule = state.get('schedule', {})
+                registry.record_run(schedule, [name], now.timestamp())
+                if schedule:
+                    state['schedule'] = schedule
+            state['bots'][name] = wallet.get_state()
+            values[name] = wallet.get_total_value(current_prices)
+            
+            snapshot = {'timestamp': now.isoformat(), 'btc_price': current_price, 'bots': {name: values[name]}}
+            shards.history(name, clock=clock).append(snapshot)
+            update_analytics(state, [snapshot])
+            shards.save(name, state)
+    
+    return values
+
+
+def merge_histories(histories, tolerance=300.0, latest=None):
+    """
+    Combine per-strategy histories into global snapshots.
+    
+    Snapshots of different runners within `tolerance` seconds of the
+    first one in a group are one cycle; each merged snapshot carries
+    every strategy's latest value at that point (strategies that have
+    not started yet are left out).
+    
+    Args:
+        histories (dict): {name: snapshots ordered by timestamp}
+        tolerance (float): Seconds between runners of one cycle
+        latest (dict): {name: value} of snapshots merged before these
+    
+    Returns:
+        list: Snapshots {'timestamp', 'btc_price', 'bots'} ordered by timestamp
+    """
+    events = sorted(
+        (datetime.fromisoformat(snapshot['timestamp']), name, snapshot)
+        for name, snapshots in histories.items() for snapshot in snapshots
+    )
+    merged = []
+    latest = dict(latest or {})
+    group_start = None
+    for timestamp, name, snapshot in events:
+        if group_start is None or (timestamp - group_start).total_seconds() > tolerance:
+            group_start = timestamp
+            merged.append({'timestamp': None, 'btc_price': None, 'bots': None})
+        latest[name] = snapshot['bots'][name]
+        merged[-1].update(timestamp=snapshot['timestamp'], btc_price=snapshot['btc_price'], bots=dict(latest))
+    return merged
+
+
+def leaderboard(state):
+    """
+    Ranking of strategies by their latest portfolio value.
+    
+    Args:
+        state (dict): Merged state with 'analytics'
+    
+    Returns:
+        list: [{'rank', 'name', 'value', 'total_return', 'max_drawdown',
+            'sharpe', 'snapshots'}], best first (NaN reported as None)
+    """
+    rows = []
+    for name, accumulators in state.get('analytics', {}).items():
+        stats = PerformanceStats()
+        stats.load_state(accumulators)
+        if not stats.count:
+            continue
+        summary = stats.summary()
+        rows.append({
+            'name': name,
+            'value': stats.last_value,
+            'total_return': summary['total_return'],
+            'max_drawdown': summary['max_drawdown'],
+            'sharpe': None if math.isnan(summary['sharpe']) else summary['sharpe'],
+            'snapshots': stats.count
+        })
+    rows.sort(key=lambda row: row['value'], reverse=True)
+    for rank, row in enumerate(rows, 1):
+        row['rank'] = rank
+    return rows
+
+
+def merge(root='shards', state_file='data.json', history_dir='history', clock=datetime.now, tolerance=300.0):
+    """
+    Build the global state, history and leaderboard from all shards.
+    
+    Each shard is read under a shared lock, so a runner never has a
+    shard half-written while it is merged. The merged state records the
+    newest snapshot taken from every shard ('merged'), and later merges
+    only append snapshots newer than that to the global history. The
+    history is rebuilt from scratch (next to the old one, then swapped
+    in) when there is no earlier merge to continue. Snapshots not newer
+    than the end of the global history (from a runner that finished
+    after its cycle was merged, or re-read after a merge crashed before
+    saving its state) stay in their shard; their values show up in the
+    next merged snapshot.
+    
+    Args:
+        root (str): Shard directory
+        state_file (str): Merged state output (data.json format, plus 'leaderboard' and 'merged')
+        history_dir (str): Merged HistoryLog directory
+        clock (callable): Returns the current datetime (history rollups)
+        tolerance (float): Seconds between runners of one cycle
+    
+    Returns:
+        list: Leaderboard rows (see leaderboard)
+    """
+    shards = ShardStore(root)
+    previous = None
+    if os.path.isdir(history_dir) and os.path.exists(state_file):
+        previous = (load_state(state_file, names=[]) or {}).get('merged')
+    until = dict(previous['until']) if previous else {}
+    
+    state = {'bots': {}, 'strategies': {}, 'analytics': {}}
+    histories = {}
+    schedule = {}
+    start_dates = []
+    for name in shards.names():
+        with shards.lock(name, shared=True):
+            shard = load_state(shards.state_file(name), names=[name])
+            history = shards.history(name, clock=clock).read() if shard else []
+        if not shard:
+            print(f"⚠️ Skipping shard {name}: its state could not be loaded")
+            continue
+        if name in until:
+            since = datetime.fromisoformat(until[name])
+            history = [snapshot for snapshot in history if datetime.fromisoformat(snapshot['timestamp']) > since]
+        histories[name] = history
+        for key in ('bots', 'strategies', 'analytics'):
+            if name in shard.get(key, {}):
+                state[key][name] = shard[key][name]
+        schedule.update(shard.get('schedule', {}))
+        if shard.get('start_date'):
+            start_dates.append(shard['start_date'])
+    if schedule:
+        state['schedule'] = schedule
+    state['start_date'] = min(start_dates) if start_dates else clock().isoformat()
+    state['leaderboard'] = leaderboard(state)
+    
+    snapshots = merge_histories(histories, tolerance, latest=previous['bots'] if previous else None)
+    until.update({name: history[-1]['timestamp'] for name, history in histories.items() if history})
+    state['merged'] = {'until': until, 'bots': snapshots[-1]['bots'] if snapshots else (previous or {}).get('bots', {})}
+    
+    if previous:
+        history = HistoryLog(history_dir, clock=clock)
+        last = history.last()
+        if last:
+            end = datetime.fromisoformat(last['timestamp'])
+            snapshots = [snapshot for snapshot in snapshots if datetime.fromisoformat(snapshot['timestamp']) > end]
+        history.extend(snapshots)
+    else:
+        # Rebuild the global history next to the old one, then swap it in
+        tmp_dir = history_dir.rstrip('/\\') + '.tmp'
+        old_dir = history_dir.rstrip('/\\') + '.old'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.rmtree(old_dir, ignore_errors=True)  # Left over by a merge that crashed mid-swap
+        HistoryLog(tmp_dir, clock=clock).extend(snapshots)
+        if os.path.exists(history_dir):
+            os.replace(history_dir, old_dir)
+        if os.path.exists(tmp_dir):
+            os.replace(tmp_dir, history_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    save_state(state, state_file)
+    
+    print(f"🔀 Merged {len(state['bots'])} shards into {state_file} and {history_dir}/ "
+          f"({len(snapshots)} new snapshots)")
+    for row in state['leaderboard']:
+        emoji = MEDALS.get(row['rank'], "🏅")
+        print(f"{emoji} {row['rank']}. {row['name']}: ${row['value']:.2f} ({row['total_return'] * 100:+.2f}%, "
+              f"max drawdown {row['max_drawdown'] * 100:.1f}%)")
+    return state['leaderboard']
+
+
+def split(state_file='data.json', root='shards', history_dir='history', clock=datetime.now):
+    """
+    Create shards from a single-file state and its history log.
+    
+    Args:
+        state_file (str): Existing state (data.json format)
+        root (str): Shard directory to fill
+        history_dir (str): Existing global HistoryLog directory
+        clock (callable): Returns the current datetime
+    """
+    state = load_state(state_file)
+    if not state:
+        raise RuntimeError(f"Could not load {state_file}")
+    history = state.pop('history', None) or HistoryLog(history_dir, clock=clock).read()
+    shards = ShardStore(root)
+    for name in state['bots']:
+        with shards.lock(name):
+            shard = {'start_date': state.get('start_date')}
+            for key in ('bots', 'strategies', 'analytics', 'schedule'):
+                if name in state.get(key, {}):
+                    shard[key] = {name: state[key][name]}
+            shard.setdefault('strategies', {})
+            shards.save(name, shard)
+            shards.history(name, clock=clock).extend([
+                {'timestamp': s['timestamp'], 'btc_price': s['btc_price'], 'bots': {name: s['bots'][name]}}
+                for s in history if name in s['bots']
+            ])
+    print(f"✂️ Split {len(state['bots'])} strategies into {root}/")
+
+
+def _run_subset(names, root, seed):
+    """Process pool task for run_local."""
+    return run_shards(names, root=root, seed=seed)
+
+
+def run_local(root='shards', workers=2, seed=None):
+    """
+    Run every enabled strategy once, split across local processes, then merge.
+    
+    Args:
+        root (str): Shard directory
+        workers (int): Runner processes
+        seed (int or str): Seed for the bots' RNGs
+    
+    Returns:
+        list: Leaderboard rows
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    subsets = partition(get_registry().enabled(), workers)
+    with ProcessPoolExecutor(max_workers=len(subsets)) as pool:
+        list(pool.map(_run_subset, subsets, [root] * len(subsets), [seed] * len(subsets)))
+    return merge(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sharded state: per-strategy runners and merge')
+    parser.add_argument('--root', default='shards', help='Shard directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run', help='One cycle for a subset of strategies')
+    run_parser.add_argument('--bots', nargs='+', help='Strategies owned by this runner (default: all enabled)')
+    run_parser.add_argument('--seed', help='Seed for the bots')
+    
+    local_parser = commands.add_parser('local', help='One cycle split across local processes, then merge')
+    local_parser.add_argument('--workers', type=int, default=2, help='Runner processes')
+    local_parser.add_argument('--seed', help='Seed for the bots')
+    
+    merge_parser = commands.add_parser('merge', help='Build data.json, history and leaderboard from the shards')
+    merge_parser.add_argument('--state-file', default=os.getenv('STATE_FILE', 'data.json'))
+    merge_parser.add_argument('--history', default='history', help='Merged history directory')
+    
+    split_parser = commands.add_parser('split', help='Create shards from a single-file state')
+    split_parser.add_argument('state_file', nargs='?', default='data.json')
+    split_parser.add_argument('--history', default='history', help='History directory of the state')
+    args = parser.parse_args()
+    
+    if args.command == 'run':
+        run_shards(args.bots or get_registry().enabled(), root=args.root, seed=args.seed)
+    elif args.command == 'local':
+        run_local(args.root, workers=args.workers, seed=args.seed)
+    elif args.command == 'merge':
+        merge(args.root, state_file=args.state_file, history_dir=args.history)
+    else:
+        split(args.state_file, root=args.root, history_dir=args.history)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Snapshot Module
+Checksummed binary state snapshots with memory-mappable history records
+
+File layout (little-endian):
+    header   64 bytes: magic, version, meta length, record count, record
+             offset, CRC32 of meta and records, CRC32 of the header itself
+    meta     UTF-8 JSON: {'bots': [names], 'state': {...}}
+    padding  up to a 64-byte boundary
+    records  n fixed-size records (timestamp µs, btc_price, one value per bot)
+
+The records can be memory-mapped, so loading millions of snapshots costs
+a header read, not a parse. Files are written to a temporary file and
+renamed into place.
+
+As a STATE_FILE, a snapshot holds the state only: runs keep history in
+the append-only history log (src/history.py), so they save it with no
+records. The history section is an export and migration format, filled
+by to-binary --history; a run started from such a file moves the
+records into the log, or carries them along if the log already has
+history.
+
+Usage:
+    python -m src.snapshot to-binary data.json data.snap --history history
+    python -m src.snapshot to-json data.snap data.json
+"""
+
+import argparse
+import json
+import os
+import struct
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.utils import atomic_open
+
+
+MAGIC = b'PTSNAP\r\n'
+VERSION = 1
+HEADER = struct.Struct('<8sHHIQQII')  # Followed by the header CRC32
+HEADER_SIZE = 64
+ALIGNMENT = 64
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def record_dtype(n_bots):
+    """
+    Layout of one history record.
+    
+    Args:
+        n_bots (int): Number of bot value columns
+    
+    Returns:
+        np.dtype: timestamp (int64 µs since 1970, wall-clock time),
+            btc_price (float64), bots (float64[n_bots], NaN if missing)
+    """
+    return np.dtype([('timestamp', '<i8'), ('btc_price', '<f8'), ('bots', '<f8', (n_bots,))])
+
+
+def to_records(history, bots):
+    """
+    Convert snapshots from the JSON history into records.
+    
+    Time zones are dropped (the wall-clock time is kept, as in the chart).
+    
+    Args:
+        history (list): Snapshots {'timestamp', 'btc_price', 'bots'}
+        bots (list): Bot names, in column order
+    
+    Returns:
+        np.ndarray: Structured array with record_dtype(len(bots))
+    """
+    records = np.zeros(len(history), dtype=record_dtype(len(bots)))
+    if not history:
+        return records
+    records['timestamp'] = [
+        (datetime.fromisoformat(snapshot['timestamp']).replace(tzinfo=None) - EPOCH) // MICROSECOND
+        for snapshot in history
+    ]
+    records['btc_price'] = [snapshot.get('btc_price', np.nan) for snapshot in history]
+    records['bots'] = [[snapshot['bots'].get(name, np.nan) for name in bots] for snapshot in history]
+    return records
+
+
+def to_snapshots(records, bots):
+    """
+    Convert records back into JSON history snapshots.
+    
+    Args:
+        records (np.ndarray): Structured array with record_dtype(len(bots))
+        bots (list): Bot names, in column order
+    
+    Returns:
+        list: Snapshots {'timestamp', 'btc_price', 'bots'}
+    """
+    timestamps = records['timestamp'].astype('datetime64[us]').astype(object)
+    prices = records['btc_price'].tolist()
+    values = records['bots'].tolist()
+    return [
+        {
+            'timestamp': timestamp.isoformat(),
+            'btc_price': price,
+            'bots': {name: value for name, value in zip(bots, row) if value == value}  # Skip NaN
+        }
+        for timestamp, price, row in zip(timestamps, prices, values)
+    ]
+
+
+class SnapshotHistory:
+    """
+    Read-only list of snapshots backed by a record array.
+    
+    Records are converted into snapshot dicts only when accessed, a chunk
+    at a time when iterating, so a memory-mapped history stays mapped
+    until a caller actually needs the dicts. write_snapshot() stores the
+    records as they are.
+    
+    Attributes:
+        records (np.ndarray): Structured array with record_dtype(len(bots))
+        bots (list): Bot names, in column order
+    """
+    
+    CHUNK = 10_000
+    
+    def __init__(self, records, bots):
+        """
+        Args:
+            records (np.ndarray): Structured array with record_dtype(len(bots))
+            bots (list): Bot names, in column order
+        """
+        self.records = records
+        self.bots = list(bots)
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SnapshotHistory(self.records[index], self.bots)
+        return to_snapshots(self.records[[index]], self.bots)[0]
+    
+    def __iter__(self):
+        for start in range(0, len(self.records), self.CHUNK):
+            yield from to_snapshots(self.records[start:start + self.CHUNK], self.bots)
+
+
+def history_bots(state, history):
+    """Bot names for the record columns: state's bots, then any others in the history."""
+    names = list(state.get('bots', {}))
+    for snapshot in history:
+        for name in snapshot['bots']:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def write_snapshot(filename, state, history=None, bots=None):
+    """
+    Write state and history to a binary snapshot file atomically.
+    
+    Runs pass no history (see the module docstring); exports do.
+    
+    Args:
+        filename (str): Output path
+        state (dict): State without history (stored as JSON)
+        history (list, SnapshotHistory or np.ndarray): Snapshots, or records from
+            read_snapshot()/to_records()
+        bots (list): Bot column names (default: derived from state and history)
+    """
+    if history is None:
+        history = []
+    if isinstance(history, SnapshotHistory):
+        history, bots = history.records, history.bots
+    if isinstance(history, np.ndarray):
+        if bots is None:
+            raise ValueError("bots are required with record arrays")
+        records = history
+    else:
+        bots = bots if bots is not None else history_bots(state, history)
+        records = to_records(history, bots)
+    records = np.ascontiguousarray(records, dtype=record_dtype(len(bots)))
+    
+    meta = json.dumps({'bots': list(bots), 'state': state}).encode('utf-8')
+    records_offset = -(-(HEADER_SIZE + len(meta)) // ALIGNMENT) * ALIGNMENT
+    data = memoryview(records).cast('B')
+    header = HEADER.pack(MAGIC, VERSION, HEADER_SIZE, len(meta), len(records), records_offset,
+                         zlib.crc32(meta), zlib.crc32(data))
+    header += struct.pack('<I', zlib.crc32(header))
+    
+    with atomic_open(filename, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(meta.ljust(records_offset - HEADER_SIZE, b'\0'))
+        f.write(data)
+
+
+def read_header(f):
+    """
+    Read and check the header of an open snapshot file.
+    
+    Returns:
+        dict: Header fields
+    
+    Raises:
+        ValueError: Not a snapshot file, unsupported version or corrupt header
+    """
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE or raw[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a snapshot file")
+    (header_crc,) = struct.unpack_from('<I', raw, HEADER.size)
+    if zlib.crc32(raw[:HEADER.size]) != header_crc:
+        raise ValueError("Snapshot header checksum mismatch")
+    _, version, header_size, meta_length, n_records, records_offset, meta_crc, records_crc = HEADER.unpack_from(raw)
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    return {
+        'header_size': header_size,
+        'meta_length': meta_length,
+        'n_records': n_records,
+        'records_offset': records_offset,
+        'meta_crc': meta_crc,
+        'records_crc': records_crc
+    }
+
+
+def read_snapshot(filename, mmap=True, verify=True):
+    """
+    Read a binary snapshot file.
+    
+    With mmap=True the history is a read-only view of the file that the
+    OS pages in on access; verify=False additionally skips the record
+    checksum (the header and state are always verified), which makes
+    loading independent of the history length.
+    
+    Args:
+        filename (str): Snapshot path
+        mmap (bool): Memory-map the records instead of reading them
+        verify (bool): Check the records checksum
+    
+    Returns:
+        dict: {'state': dict, 'bots': list, 'history': np.ndarray of records}
+    
+    Raises:
+        ValueError: Corrupt, truncated or unsupported file
+    """
+    with open(filename, 'rb') as f:
+        header = read_header(f)
+        f.seek(header['header_size'])
+        meta = f.read(header['meta_length'])
+        if zlib.crc32(meta) != header['meta_crc']:
+            raise ValueError("Snapshot state checksum mismatch")
+        meta = json.loads(meta)
+        
+        dtype = record_dtype(len(meta['bots']))
+        n_records = header['n_records']
+        end = header['records_offset'] + n_records * dtype.itemsize
+        if os.fstat(f.fileno()).st_size < end:
+            raise ValueError("Snapshot file is truncated")
+        if n_records == 0:
+            records = np.zeros(0, dtype=dtype)
+        elif mmap:
+            records = np.memmap(f, dtype=dtype, mode='r', offset=header['records_offset'], shape=(n_records,))
+        else:
+            f.seek(header['records_offset'])
+            records = np.fromfile(f, dtype=dtype, count=n_records)
+    
+    if verify and zlib.crc32(memoryview(records).cast('B')) != header['records_crc']:
+        raise ValueError("Snapshot history checksum mismatch")
+    return {'state': meta['state'], 'bots': meta['bots'], 'history': records}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert state between JSON and binary snapshots')
+    commands = parser.add_subparsers(dest='command', required=True)
+    to_binary = commands.add_parser('to-binary', help='JSON state (and history log) to a snapshot')
+    to_binary.add_argument('source', help='JSON state file, e.g. data.json')
+    to_binary.add_argument('target', help='Snapshot file, e.g. data.snap')
+    to_binary.add_argument('--history', help='History log directory to include, e.g. history')
+    to_json = commands.add_parser('to-json', help='Snapshot to a JSON state with inline history')
+    to_json.add_argument('source', help='Snapshot file')
+    to_json.add_argument('target', help='JSON state file')
+    args = parser.parse_args()
+    
+    if args.command == 'to-binary':
+        with open(args.source, 'r') as f:
+            state = json.load(f)
+        history = state.pop('history', [])
+        if args.history:
+            from src.history import HistoryLog
+            history = history + HistoryLog(directory=args.history).read()
+        write_snapshot(args.target, state, history)
+        print(f"💾 {len(history)} snapshots written to {args.target}")
+    else:
+        snapshot = read_snapshot(args.source, mmap=False)
+        state = snapshot['state']
+        history = to_snapshots(snapshot['history'], snapshot['bots'])
+        if history:
+            state['history'] = history  # Migrated to the history log by the next run
+        with atomic_open(args.target) as f:
+            json.dump(state, f, indent=2)
+        print(f"💾 {len(history)} snapshots written to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
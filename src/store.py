@@ -0,0 +1,194 @@
+"""
+Candle Store Module
+Persistent columnar OHLCV storage with incremental top-up
+"""
+
+import os
+
+
+# Column name and NumPy dtype; every column is 8 bytes per candle
+COLUMNS = [
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8')
+]
+ITEMSIZE = 8
+
+
+class CandleStore:
+    """
+    On-disk OHLCV store keyed by symbol and timeframe.
+    
+    Each series lives in its own directory with one raw binary file per
+    column, so new candles are appended in place and reads are served
+    as memory-mapped arrays without parsing.
+    
+    Layout:
+        <root>/<BASE-QUOTE>/<timeframe>/<column>.bin
+    
+    Attributes:
+        root (str): Base directory of the store
+    """
+    
+    def __init__(self, root='candles'):
+        """
+        Initialize candle store.
+        
+        Args:
+            root (str): Base directory (created on first write)
+        """
+        self.root = root
+    
+    def _path(self, symbol, timeframe, column=None):
+        """Directory of a series, or file of one of its columns."""
+        path = os.path.join(self.root, symbol.replace('/', '-'), timeframe)
+        if column is not None:
+            path = os.path.join(path, f"{column}.bin")
+        return path
+    
+    def count(self, symbol, timeframe):
+        """
+        Number of complete candles stored for a series.
+        
+        Columns are appended one after another, so an interrupted write
+        can leave them with different lengths; the shortest one wins.
+        """
+        sizes = []
+        for column, _ in COLUMNS:
+            path = self._path(symbol, timeframe, column)
+            if not os.path.exists(path):
+                return 0
+            sizes.append(os.path.getsize(path) // ITEMSIZE)
+        return min(sizes)
+    
+    def last_timestamp(self, symbol, timeframe):
+        """
+        Timestamp (ms) of the newest stored candle, or None if empty.
+        """
+        n = self.count(symbol, timeframe)
+        if n == 0:
+            return None
+        return int(self.read(symbol, timeframe, limit=1)['timestamp'][0])
+    
+    def read(self, symbol, timeframe, limit=None):
+        """
+        Read a series as memory-mapped column arrays.
+        
+        Args:
+            symbol (str): Trading pair symbol
+            timeframe (str): Candlestick timeframe
+            limit (int): Only return the newest `limit` candles
+        
+        Returns:
+            dict: {column: np.ndarray}, empty arrays if nothing is stored
+        """
+        import numpy as np
+        
+        n = self.count(symbol, timeframe)
+        start = max(0, n - limit) if limit else 0
+        
+        columns = {}
+        for column, dtype in COLUMNS:
+            if n == 0:
+                columns[column] = np.empty(0, dtype=dtype)
+                continue
+            columns[column] = np.memmap(
+                self._path(symbol, timeframe, column), dtype=dtype, mode='r', shape=(n,)
+            )[start:]
+        return columns
+    
+    def iter_chunks(self, symbol, timeframe, chunk_size=1_000_000, start=0):
+        """
+        Stream a series as consecutive chunks of column arrays.
+        
+        Chunks are read into fresh arrays instead of memory-mapped, so
+        at most one chunk is resident however long the series is.
+        
+        Args:
+            symbol (str): Trading pair symbol
+            timeframe (str): Candlestick timeframe
+            chunk_size (int): Candles per chunk
+            start (int): Index of the first candle to read
+        
+        Yields:
+            dict: {column: np.ndarray} of up to `chunk_size` candles
+        """
+        import numpy as np
+        
+        n = self.count(symbol, timeframe)
+        if start >= n:
+            return
+        files = {column: open(self._path(symbol, timeframe, column), 'rb') for column, _ in COLUMNS}
+        try:
+            for offset in range(start, n, chunk_size):
+                count = min(chunk_size, n - offset)
+                chunk = {}
+                for column, dtype in COLUMNS:
+                    files[column].seek(offset * ITEMSIZE)
+                    chunk[column] = np.fromfile(files[column], dtype=dtype, count=count)
+                yield chunk
+        finally:
+            for f in files.values():
+                f.close()
+    
+    def read_array(self, symbol, timeframe, limit=None):
+        """
+        Read a series as one (n, 6) float64 array (timestamps as floats).
+        
+        Returns:
+            np.ndarray: Rows [timestamp, open, high, low, close, volume]
+        """
+        import numpy as np
+        
+        columns = self.read(symbol, timeframe, limit=limit)
+        return np.column_stack([columns[c].astype(np.float64) for c, _ in COLUMNS]).reshape(-1, len(COLUMNS))
+    
+    def read_rows(self, symbol, timeframe, limit=None):
+        """
+        Read a series in the ccxt OHLCV list format.
+        
+        Returns:
+            list: [[timestamp, open, high, low, close, volume], ...]
+        """
+        columns = self.read(symbol, timeframe, limit=limit)
+        return [list(row) for row in zip(*(columns[c].tolist() for c, _ in COLUMNS))]
+    
+    def append(self, symbol, timeframe, ohlcv):
+        """
+        Append candles to a series.
+        
+        Stored candles at or after the first new timestamp are replaced,
+        so re-fetching the last (still open) candle updates it in place
+        instead of duplicating it.
+        
+        Args:
+            symbol (str): Trading pair symbol
+            timeframe (str): Candlestick timeframe
+            ohlcv (list): Candles sorted by timestamp
+        
+        Returns:
+            int: Number of candles in the series after the write
+        """
+        import numpy as np
+        
+        if len(ohlcv) == 0:
+            return self.count(symbol, timeframe)
+        
+        os.makedirs(self._path(symbol, timeframe), exist_ok=True)
+        
+        # Drop any stored tail that overlaps the new candles
+        stored_ts = self.read(symbol, timeframe)['timestamp']
+        keep = int(np.searchsorted(stored_ts, int(ohlcv[0][0]), side='left'))
+        del stored_ts
+        
+        for i, (column, dtype) in enumerate(COLUMNS):
+            path = self._path(symbol, timeframe, column)
+            values = np.asarray([row[i] for row in ohlcv], dtype=dtype)
+            with open(path, 'ab') as f:
+                f.truncate(keep * values.itemsize)
+                f.write(values.tobytes())
+        
+        return keep + len(ohlcv)
@@ -0,0 +1,329 @@
+"""
+Strategies Module
+Declarative registry of trading strategies, imported only when enabled
+
+Strategies are declared by name with a "module:Class" target, so their
+modules (and whatever those import) are loaded the first time a bot is
+created, and only for strategies that are enabled. Each strategy has its
+own decision interval; a run only creates and runs the ones that are due.
+
+Declarations come from, in increasing priority:
+    1. The built-in bots below
+    2. Entry points in the "ia_finanzas.strategies" group
+       (name = "package.module:Class")
+    3. A JSON config file (STRATEGIES_FILE, default strategies.json):
+    
+    {
+        "RoboQuant": {"interval": "4h", "options": {"length": 21}},
+        "WhaleHunter": {"enabled": false},
+        "Momentum": {"target": "mybots.momentum:Momentum", "interval": "1d"}
+    }
+"""
+
+import importlib
+import inspect
+import json
+import os
+import time
+from src.cache import ttl_for_interval
+
+
+ENTRY_POINT_GROUP = 'ia_finanzas.strategies'
+
+BUILTIN_STRATEGIES = {
+    'AgentClaude': {'target': 'src.bots:AgentClaude', 'color': '#00FFFF'},  # Cyan
+    'RoboQuant': {'target': 'src.bots:RoboQuant', 'color': '#FF00FF'},  # Magenta
+    'WhaleHunter': {'target': 'src.bots:WhaleHunter', 'color': '#00FF00'}  # Lime Green
+}
+
+# Chart colors of strategies that do not set one
+PALETTE = ['#FFD700', '#FF8C00', '#1E90FF', '#FF69B4', '#ADFF2F', '#BA55D3', '#F0E68C', '#40E0D0']
+
+_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_interval(value):
+    """
+    Decision interval in seconds.
+    
+    Args:
+        value: Seconds (int or float) or a string like "30m", "12h", "1d"
+    
+    Returns:
+        float: Seconds (0 = every run)
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if value[-1:] in _UNITS:
+            return float(value[:-1]) * _UNITS[value[-1]]
+    return float(value or 0)
+
+
+class Strategy:
+    """
+    Declaration of one strategy.
+    
+    Attributes:
+        name (str): Bot and wallet name
+        target (str): "module:Class" (or factory function) creating the bot
+        interval (float): Seconds between decisions (0 = every run)
+        enabled (bool): Whether runs create this strategy at all
+        color (str): Chart line color (None = from PALETTE)
+        options (dict): Extra keyword arguments for the constructor
+    """
+    
+    def __init__(self, name, target, interval=0, enabled=True, color=None, options=None):
+        """
+        Initialize strategy declaration.
+        
+        Args:
+            name (str): Bot and wallet name
+            target (str or type): "module:Class", or the class itself
+            interval: Decision interval (see parse_interval)
+            enabled (bool): Whether runs create this strategy
+            color (str): Chart line color
+            options (dict): Extra constructor keyword arguments
+        """
+        self.name = name
+        self.target = target
+        self.interval = parse_interval(interval)
+        self.enabled = enabled
+        self.color = color
+        self.options = dict(options or {})
+        self._factory = None if isinstance(target, str) else target
+    
+    def load(self):
+        """Import the strategy class (first call only)."""
+        if self._factory is None:
+            module_name, _, attribute = self.target.partition(':')
+            self._factory = getattr(importlib.import_module(module_name), attribute)
+        return self._factory
+    
+    def create(self, **context):
+        """
+        Instantiate the bot.
+        
+        Only the context arguments the constructor accepts are passed
+        (e.g. RoboQuant takes no seed), followed by the configured
+        options. The bot is named after the declaration, so one class
+        can be registered several times with different options.
+        
+        Strategies with an interval also get a matching decision cache
+        lifetime (cache_ttl, see ttl_for_interval) unless their options
+        set one.
+        
+        Args:
+            **context: Candidate arguments: name, client, seed, clock
+        
+        Returns:
+            TradingBot: New bot instance
+        """
+        factory = self.load()
+        if self.interval > 0:
+            context.setdefault('cache_ttl', ttl_for_interval(self.interval))
+        parameters = inspect.signature(factory).parameters
+        if not any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+            context = {key: value for key, value in context.items() if key in parameters}
+        bot = factory(**{**context, **self.options})
+        bot.name = self.name
+        return bot
+    
+    def is_due(self, last_run, now):
+        """
+        Whether a decision is due at `now`.
+        
+        Decisions are aligned to interval boundaries (like candle
+        closes), so a 12h strategy decides once per 00:00-12:00 and
+        12:00-24:00 UTC window even if runs start a few minutes late.
+        
+        Args:
+            last_run (float): Epoch seconds of the last decision (None = never)
+            now (float): Current epoch seconds
+        
+        Returns:
+            bool: True if the strategy should decide
+        """
+        if self.interval <= 0 or last_run is None:
+            return True
+        return now // self.interval > last_run // self.interval
+    
+    def __repr__(self):
+        return f"Strategy({self.name!r}, {self.target!r}, interval={self.interval:g})"
+
+
+class StrategyRegistry:
+    """
+    Ordered set of strategy declarations.
+    
+    Attributes:
+        strategies (dict): {name: Strategy} in declaration order
+    """
+    
+    def __init__(self, strategies=None):
+        """
+        Initialize registry.
+        
+        Args:
+            strategies (dict): {name: declaration dict}, e.g. BUILTIN_STRATEGIES
+        """
+        self.strategies = {}
+        self.configure(strategies or {})
+    
+    @classmethod
+    def from_env(cls, entry_points=True):
+        """
+        Registry of the built-in bots, installed entry points and the
+        STRATEGIES_FILE config (default strategies.json, if present).
+        """
+        registry = cls(BUILTIN_STRATEGIES)
+        if entry_points:
+            registry.load_entry_points()
+        path = os.getenv('STRATEGIES_FILE', 'strategies.json')
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                registry.configure(json.load(f))
+        return registry
+    
+    def register(self, name, target, interval=0, enabled=True, color=None, **options):
+        """
+        Declare a strategy, replacing any with the same name.
+        
+        Args:
+            name (str): Bot and wallet name
+            target (str or type): "module:Class" or the class itself
+            interval: Decision interval (see parse_interval)
+            enabled (bool): Whether runs create it
+            color (str): Chart line color
+            **options: Constructor keyword arguments
+        
+        Returns:
+            Strategy: The declaration
+        """
+        self.strategies[name] = Strategy(name, target, interval, enabled, color, options)
+        return self.strategies[name]
+    
+    def configure(self, config):
+        """
+        Add or update declarations from config data.
+        
+        Entries for known names only override the keys they set, so
+        {"WhaleHunter": {"enabled": false}} disables a built-in bot.
+        
+        Args:
+            config (dict): {name: {'target', 'interval', 'enabled', 'color', 'options'}}
+        
+        Raises:
+            ValueError: If a new strategy has no target
+        """
+        for name, entry in config.items():
+            strategy = self.strategies.get(name)
+            if strategy is None:
+                if 'target' not in entry:
+                    raise ValueError(f"Strategy {name} has no target")
+                strategy = self.register(name, entry['target'])
+            if 'target' in entry and entry['target'] != strategy.target:
+                strategy.target = entry['target']
+                strategy._factory = None
+            if 'interval' in entry:
+                strategy.interval = parse_interval(entry['interval'])
+            strategy.enabled = entry.get('enabled', strategy.enabled)
+            strategy.color = entry.get('color', strategy.color)
+            strategy.options.update(entry.get('options', {}))
+    
+    def load_entry_points(self, group=ENTRY_POINT_GROUP):
+        """
+        Declare the strategies installed packages advertise.
+        
+        Only the entry point names and values are read; the modules are
+        imported when the strategies are created.
+        """
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group=group):
+            if entry_point.name not in self.strategies:
+                self.register(entry_point.name, entry_point.value)
+    
+    def enabled(self):
+        """Names of the enabled strategies, in declaration order."""
+        return [name for name, strategy in self.strategies.items() if strategy.enabled]
+    
+    def due(self, schedule, now=None):
+        """
+        Enabled strategies that should decide now.
+        
+        Args:
+            schedule (dict): {name: epoch seconds of the last decision}
+            now (float): Current epoch seconds (default: time.time())
+        
+        Returns:
+            list: Strategy names
+        """
+        now = time.time() if now is None else now
+        return [name for name in self.enabled() if self.strategies[name].is_due(schedule.get(name), now)]
+    
+    def create_bots(self, names=None, llm_client=None, seed=None, clock=time.time):
+        """
+        Instantiate bots, importing only their modules.
+        
+        A strategy that fails to import or build (e.g. a bad target or
+        options) is reported and left out, so one broken declaration
+        does not stop the others.
+        
+        Args:
+            names (list): Strategies to create (default: all enabled)
+            llm_client: Anthropic-compatible client for LLM strategies
+            seed (int or str): Base seed; each bot that takes one gets
+                "<seed>:<name>" (None = unseeded)
+            clock (callable): Current time in seconds (simulated in replays)
+        
+        Returns:
+            dict: {name: TradingBot} of the strategies created
+        """
+        bots = {}
+        for name in self.enabled() if names is None else names:
+            bot_seed = None if seed is None else f"{seed}:{name}"
+            try:
+                bots[name] = self.strategies[name].create(name=name, client=llm_client, seed=bot_seed, clock=clock)
+            except Exception as e:
+                print(f"❌ Skipping strategy {name} ({self.strategies[name].target}): {e}")
+        return bots
+    
+    def colors(self, names):
+        """Chart color per strategy name (unknown names get palette colors too)."""
+        colors = {}
+        spare = iter(PALETTE * (len(names) // len(PALETTE) + 1))
+        for name in names:
+            strategy = self.strategies.get(name)
+            colors[name] = (strategy.color if strategy else None) or next(spare)
+        return colors
+    
+    def record_run(self, schedule, names, now):
+        """
+        Remember when interval strategies decided.
+        
+        Strategies deciding on every run are not recorded, so configs
+        without intervals keep the state unchanged.
+        
+        Args:
+            schedule (dict): {name: epoch seconds}, updated in place
+            names (list): Strategies that just decided
+            now (float): Epoch seconds of the decision
+        """
+        for name in names:
+            if self.strategies[name].interval > 0:
+                schedule[name] = now
+
+
+_default_registry = None
+
+
+def get_registry():
+    """
+    Shared StrategyRegistry for the current process (see from_env).
+    
+    Returns:
+        StrategyRegistry: The same instance on every call
+    """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = StrategyRegistry.from_env()
+    return _default_registry
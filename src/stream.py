@@ -0,0 +1,246 @@
+"""
+Stream Module
+Chunked simulation pipeline for minute and tick data with bounded memory
+
+Candles flow through the pipeline as chunks of NumPy columns (as
+returned by CandleStore.iter_chunks), never as one list or array of the
+whole dataset:
+    
+    store / ticks -> chunks -> bot signals -> wallet execution -> summary
+
+Each stage only carries a small state from one chunk to the next (the
+last candles an indicator needs, the wallet, the running peak), so
+memory depends on the chunk size, not on the number of rows.
+
+Usage:
+    python -m src.stream --symbol BTC/USDT --timeframe 1m --chunk-size 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import time
+
+import numpy as np
+
+from src.backtest import simulate
+from src.bots import SIGNAL_CODES, TradingBot, create_bots
+from src.features import FeatureStore, clear_cache
+from src.market import TIMEFRAME_MS
+from src.store import COLUMNS, CandleStore
+from src.wallet import VirtualWallet
+
+
+def rows_to_chunks(rows, chunk_size=100_000):
+    """
+    Group any iterable of OHLCV rows into column chunks.
+    
+    Args:
+        rows (iterable): [timestamp, open, high, low, close, volume] rows,
+            e.g. a generator paging through an exchange
+        chunk_size (int): Rows per chunk
+    
+    Yields:
+        dict: {column: np.ndarray}
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, chunk_size))
+        if not batch:
+            return
+        data = np.asarray(batch, dtype=np.float64)
+        yield {column: data[:, i].astype(dtype) for i, (column, dtype) in enumerate(COLUMNS)}
+
+
+def _aggregate(timestamps, prices, amounts, step):
+    """OHLCV columns of complete candle buckets (ticks sorted by time)."""
+    buckets = timestamps // step
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(prices)) - 1
+    return {
+        'timestamp': (buckets[starts] * step).astype('<i8'),
+        'open': prices[starts],
+        'high': np.maximum.reduceat(prices, starts),
+        'low': np.minimum.reduceat(prices, starts),
+        'close': prices[ends],
+        'volume': np.add.reduceat(amounts, starts)
+    }
+
+
+def ticks_to_candles(tick_chunks, timeframe='1m'):
+    """
+    Aggregate chunks of trades into candle chunks.
+    
+    Trades of the last candle of a chunk are held back until a later
+    trade shows the candle is complete, so candles spanning two chunks
+    come out whole. Periods without trades produce no candle, as on
+    exchanges.
+    
+    Args:
+        tick_chunks (iterable): Dicts of 'timestamp' (ms), 'price' and
+            'amount' arrays, sorted by timestamp
+        timeframe (str): Candle timeframe
+    
+    Yields:
+        dict: {column: np.ndarray} of complete candles
+    """
+    step = TIMEFRAME_MS[timeframe]
+    pending = (np.empty(0, dtype='<i8'), np.empty(0), np.empty(0))
+    for ticks in tick_chunks:
+        timestamps = np.concatenate([pending[0], np.asarray(ticks['timestamp'], dtype='<i8')])
+        prices = np.concatenate([pending[1], np.asarray(ticks['price'], dtype=np.float64)])
+        amounts = np.concatenate([pending[2], np.asarray(ticks['amount'], dtype=np.float64)])
+        if len(timestamps) == 0:
+            continue
+        cut = int(np.searchsorted(timestamps // step, timestamps[-1] // step, side='left'))
+        if cut:
+            yield _aggregate(timestamps[:cut], prices[:cut], amounts[:cut], step)
+        pending = (timestamps[cut:], prices[cut:], amounts[cut:])
+    if len(pending[0]):
+        yield _aggregate(*pending, step)
+
+
+def _decide_each(bot, ohlcv, first, window):
+    """Signals from decide() for candles first.. of ohlcv, each seeing the previous `window` candles."""
+    signals = np.zeros(len(ohlcv) - first, dtype=np.int8)
+    for i in range(first, len(ohlcv)):
+        history = FeatureStore(ohlcv[max(0, i - window + 1):i + 1])
+        signals[i - first] = SIGNAL_CODES.get(bot.decide(float(ohlcv[i, 4]), history), 0)
+    return signals
+
+
+def stream_signals(bot, chunks, window=100, quiet=True):
+    """
+    Decisions of a bot for every candle of a chunked series.
+    
+    Bots with a vectorized signals() get each chunk prefixed with the
+    last `bot.warmup` candles of the previous one, which gives the same
+    signals as one pass over the whole series as long as a signal only
+    depends on the `warmup` candles before it and random bots continue
+    one random stream across calls (as WhaleHunter does). The chunk is
+    passed as a FeatureStore (an (n, 6) array under np.asarray) whose
+    indicators are evicted afterwards. Other bots decide() once per
+    candle on a sliding window of `window` candles, like a live run.
+    
+    Args:
+        bot (TradingBot): Strategy
+        chunks (iterable): Column chunks
+        window (int): Candles passed to decide() (fallback path)
+        quiet (bool): Silence decide() output
+    
+    Yields:
+        tuple: (chunk, np.ndarray of SIGNAL_CODES for its candles)
+    """
+    carry = np.empty((0, len(COLUMNS)))
+    vectorized = True
+    for chunk in chunks:
+        rows = np.column_stack([chunk[column].astype(np.float64) for column, _ in COLUMNS])
+        ohlcv = np.concatenate([carry, rows])
+        first = len(carry)
+        
+        signals = None
+        if vectorized:
+            features = FeatureStore(ohlcv)
+            try:
+                signals = np.asarray(bot.signals(features), dtype=np.int8)[first:]
+            except NotImplementedError:
+                vectorized = False
+            finally:
+                clear_cache(features.key)  # Chunk indicators are never reused
+        if signals is None:
+            with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+                signals = _decide_each(bot, ohlcv, first, window)
+        
+        keep = bot.warmup if vectorized else window - 1
+        carry = ohlcv[len(ohlcv) - min(keep, len(ohlcv)):]
+        yield chunk, signals
+
+
+def simulate_stream(bot, chunks, wallet=None, symbol='BTC', window=100, quiet=True):
+    """
+    Run a bot's decisions through a wallet over a chunked series.
+    
+    Each chunk is executed with backtest.simulate at the close prices,
+    continuing from the wallet the previous chunk ended with; since a
+    BUY or SELL run that spans two chunks just continues in the next
+    one, the result equals simulating the whole series at once whenever
+    the signals do (see stream_signals). Only summary values are kept,
+    not the equity curve.
+    
+    Args:
+        bot (TradingBot): Strategy
+        chunks (iterable): Column chunks (e.g. CandleStore.iter_chunks())
+        wallet (VirtualWallet): Starting wallet, defaults to $1000 (not modified)
+        symbol (str): Holding traded by the signals
+        window (int): Candles passed to decide() for bots without signals()
+        quiet (bool): Silence decide() output
+    
+    Returns:
+        dict: {'candles', 'trades', 'final_value', 'usd_balance',
+            'holdings', 'peak_value', 'max_drawdown'}
+    """
+    wallet = wallet or VirtualWallet()
+    usd = wallet.usd_balance
+    held = wallet.holdings.get(symbol, 0.0)
+    candles = trades = 0
+    peak = 0.0
+    max_drawdown = 0.0
+    final_value = usd
+    
+    for chunk, signals in stream_signals(bot, chunks, window=window, quiet=quiet):
+        step_wallet = VirtualWallet(initial_usd=usd, fee_rate=wallet.fee_rate, slippage_rate=wallet.slippage_rate)
+        step_wallet.holdings[symbol] = held
+        result = simulate(chunk['close'], signals, wallet=step_wallet, symbol=symbol)
+        
+        equity = result['equity']
+        peaks = np.maximum.accumulate(np.maximum(equity, peak))
+        max_drawdown = max(max_drawdown, float(np.max(1.0 - equity / peaks)))
+        peak = float(peaks[-1])
+        
+        usd = float(result['usd_balance'][-1])
+        held = float(result['holdings'][-1])
+        final_value = result['final_value']
+        candles += len(equity)
+        trades += result['trades']
+    
+    return {
+        'candles': candles,
+        'trades': trades,
+        'final_value': final_value,
+        'usd_balance': usd,
+        'holdings': {symbol: held},
+        'peak_value': peak,
+        'max_drawdown': max_drawdown
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate the bots over a stored candle series in chunks')
+    parser.add_argument('--root', default='candles', help='Candle store directory')
+    parser.add_argument('--symbol', default='BTC/USDT', help='Trading pair')
+    parser.add_argument('--timeframe', default='1m', choices=sorted(TIMEFRAME_MS), help='Candle timeframe')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help='Candles per chunk')
+    parser.add_argument('--bot', action='append',
+                        help='Bot to simulate (default: all with signals(); others decide() per candle)')
+    args = parser.parse_args()
+    
+    store = CandleStore(args.root)
+    bots = create_bots()
+    names = args.bot
+    if not names:
+        names = [name for name, bot in bots.items() if type(bot).signals is not TradingBot.signals]
+        skipped = [name for name in bots if name not in names]
+        if skipped:
+            print(f"⏭️ Skipping {', '.join(skipped)}: no signals(), so one decide() per candle "
+                  f"(pass --bot to run anyway)")
+    for name in names:
+        start = time.perf_counter()
+        result = simulate_stream(bots[name], store.iter_chunks(args.symbol, args.timeframe, args.chunk_size))
+        elapsed = time.perf_counter() - start
+        print(f"{name}: ${result['final_value']:,.2f} after {result['candles']:,} candles, "
+              f"{result['trades']:,} trades, max drawdown {result['max_drawdown'] * 100:.1f}% ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Parameter Sweep Module
+Parallel grid search over RoboQuant's RSI length and thresholds
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.backtest import max_drawdown, rsi, simulate, threshold_signals
+from src.wallet import VirtualWallet
+
+
+# Drawdown floor of the risk-adjusted score, so near-zero drawdowns
+# (e.g. a single lucky trade) do not get unbounded scores
+MIN_DRAWDOWN = 0.01
+
+# Per-worker view of the shared close prices (set by _attach)
+_close = None
+_shm = None
+
+
+def risk_adjusted_score(total_return, drawdown):
+    """
+    Return per unit of risk (Calmar-style ratio).
+    
+    Args:
+        total_return (float): Final value / initial value - 1
+        drawdown (float): Max drawdown as a fraction
+    
+    Returns:
+        float: total_return / drawdown for gains (drawdown floored at
+            MIN_DRAWDOWN); losses keep their plain return, so they rank
+            below every gain and smaller losses rank higher
+    """
+    if total_return <= 0:
+        return total_return
+    return total_return / max(drawdown, MIN_DRAWDOWN)
+
+
+def _attach(name, length):
+    """Process pool initializer: map the shared close array once per worker."""
+    global _close, _shm
+    _shm = shared_memory.SharedMemory(name=name)
+    _close = np.ndarray((length,), dtype=np.float64, buffer=_shm.buf)
+
+
+def _evaluate(length, thresholds, fee_rate, slippage_rate, initial_usd, close=None):
+    """
+    Evaluate every (oversold, overbought) pair for one RSI length.
+    
+    The RSI series is computed once and reused for all thresholds.
+    
+    Returns:
+        list: One result dict per threshold pair
+    """
+    close = _close if close is None else close
+    values = rsi(close, length=length)
+    
+    results = []
+    for oversold, overbought in thresholds:
+        wallet = VirtualWallet(initial_usd=initial_usd, fee_rate=fee_rate, slippage_rate=slippage_rate)
+        outcome = simulate(close, threshold_signals(values, oversold, overbought), wallet=wallet)
+        total_return = outcome['final_value'] / initial_usd - 1
+        drawdown = max_drawdown(outcome['equity'])
+        results.append({
+            'length': length,
+            'oversold': oversold,
+            'overbought': overbought,
+            'final_value': outcome['final_value'],
+            'total_return': total_return,
+            'max_drawdown': drawdown,
+            'score': risk_adjusted_score(total_return, drawdown),
+            'trades': outcome['trades']
+        })
+    return results
+
+
+def sweep(ohlcv, lengths=(7, 14, 21, 28), oversold=(20, 25, 30, 35), overbought=(65, 70, 75, 80),
+          workers=None, wallet=None):
+    """
+    Backtest RoboQuant over a grid of (length, oversold, overbought).
+    
+    Close prices are copied once into shared memory and every worker
+    process maps that block instead of receiving a pickled copy per
+    task. Work is split into tasks of one RSI length and a slice of the
+    threshold pairs, so all cores stay busy even with few lengths.
+    
+    Args:
+        ohlcv (array-like): OHLCV rows [timestamp, open, high, low, close, volume]
+        lengths (list): RSI periods to try
+        oversold (list): BUY thresholds to try
+        overbought (list): SELL thresholds to try
+        workers (int): Worker processes (default: all cores, 1 = in-process)
+        wallet (VirtualWallet): Starting wallet and fee/slippage rates
+    
+    Returns:
+        list: Result dicts ranked by risk-adjusted score (descending, see
+            risk_adjusted_score), then by final value (descending)
+    """
+    wallet = wallet or VirtualWallet()
+    close = np.ascontiguousarray(np.asarray(ohlcv, dtype=np.float64)[:, 4])
+    workers = workers or os.cpu_count() or 1
+    pairs = [(lo, hi) for lo, hi in itertools.product(oversold, overbought) if lo < hi]
+    costs = (wallet.fee_rate, wallet.slippage_rate, wallet.usd_balance)
+    
+    # Enough tasks per worker to balance uneven lengths
+    chunk = max(1, len(pairs) * len(lengths) // (workers * 4))
+    tasks = [(length, pairs[i:i + chunk]) for length in lengths for i in range(0, len(pairs), chunk)]
+    
+    if workers == 1:
+        batches = [_evaluate(length, part, *costs, close=close) for length, part in tasks]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, close.nbytes))
+        try:
+            np.ndarray(close.shape, dtype=close.dtype, buffer=shm.buf)[:] = close
+            with ProcessPoolExecutor(workers, initializer=_attach, initargs=(shm.name, len(close))) as pool:
+                futures = [pool.submit(_evaluate, length, part, *costs) for length, part in tasks]
+                batches = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    results = [result for batch in batches for result in batch]
+    results.sort(key=lambda r: (-r['score'], -r['final_value']))
+    return results
@@ -3,25 +3,26 @@ Utility Functions Module
 Handles market data fetching, state persistence, and chart generation
 """
 
+import contextlib
 import json
 import os
 from datetime import datetime
-import ccxt
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from src.market import get_client
 
 
-def get_btc_price():
+def get_btc_price(client=None):
     """
     Fetch current BTC/USDT price from Binance.
     
+    Args:
+        client (MarketDataClient): Market data client, shared one by default
+    
     Returns:
         float: Current BTC price in USDT, or None if error
     """
     try:
-        exchange = ccxt.binance()
-        ticker = exchange.fetch_ticker('BTC/USDT')
-        price = ticker['last']
+        client = client or get_client()
+        price = client.get_price('BTC/USDT')
         print(f"📊 Current BTC Price: ${price:,.2f}")
         return price
     except Exception as e:
@@ -29,71 +30,188 @@ def get_btc_price():
         return None
 
 
-def get_historical_prices(symbol='BTC/USDT', timeframe='1h', limit=100):
+def get_historical_prices(symbol='BTC/USDT', timeframe='1h', limit=100, store=None, client=None, buffer=None):
     """
     Fetch historical OHLCV data for technical analysis.
     
+    With a CandleStore, only candles from the last stored timestamp on
+    are downloaded (the last one is re-fetched since it may still have
+    been open), appended to the store, and the result is read back from
+    the local file. Without one, `limit` candles are downloaded as-is.
+    
+    A CandleBuffer kept by a long-running caller also receives the new
+    candles (it is seeded from the store when empty), and the result is
+    then a zero-copy view of it instead of a list read from the store.
+    
     Args:
         symbol (str): Trading pair symbol
         timeframe (str): Candlestick timeframe (1m, 5m, 1h, 1d, etc.)
         limit (int): Number of candles to fetch
+        store (CandleStore): Optional local candle store
+        client (MarketDataClient): Market data client, shared one by default
+        buffer (CandleBuffer): Optional in-memory candles (requires a store)
     
     Returns:
-        list: List of OHLCV data [timestamp, open, high, low, close, volume]
+        list or FeatureStore: OHLCV data [timestamp, open, high, low, close, volume]
     """
     try:
-        exchange = ccxt.binance()
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-        print(f"📈 Fetched {len(ohlcv)} historical candles for {symbol}")
+        client = client or get_client()
+        
+        if store is None:
+            ohlcv = client.get_ohlcv(symbol, timeframe, limit=limit)
+            print(f"📈 Fetched {len(ohlcv)} historical candles for {symbol}")
+            return ohlcv
+        
+        stored = store.count(symbol, timeframe)
+        since = store.last_timestamp(symbol, timeframe)
+        pages = []
+        if since is None:
+            pages.append(client.get_ohlcv(symbol, timeframe, limit=limit))
+            store.append(symbol, timeframe, pages[-1])
+        else:
+            # Page forward until caught up with the exchange
+            page_limit = 1000
+            while True:
+                page = client.get_ohlcv(symbol, timeframe, since=since, limit=page_limit)
+                store.append(symbol, timeframe, page)
+                pages.append(page)
+                if len(page) < page_limit or page[-1][0] <= since:
+                    break
+                since = page[-1][0]
+        
+        if buffer is None:
+            ohlcv = store.read_rows(symbol, timeframe, limit=limit)
+        else:
+            if len(buffer) == 0:
+                buffer.extend(store.read_array(symbol, timeframe, limit=buffer.capacity))
+            else:
+                for page in pages:
+                    buffer.extend(page)
+            ohlcv = buffer.view(limit)
+        new_candles = store.count(symbol, timeframe) - stored
+        print(f"📈 Fetched {new_candles} new candles for {symbol}, {len(ohlcv)} served from local store")
         return ohlcv
     except Exception as e:
         print(f"❌ Error fetching historical data: {e}")
+        if buffer is not None and len(buffer):
+            return buffer.view(limit)
+        if store is not None:
+            return store.read_rows(symbol, timeframe, limit=limit)
         return []
 
 
+def get_prices(symbols, client=None):
+    """
+    Fetch last prices for several pairs with a single tickers request.
+    
+    Args:
+        symbols (list): Pair symbols, e.g. ['BTC/USDT', 'ETH/USDT']
+        client (MarketDataClient): Market data client, shared one by default
+    
+    Returns:
+        dict: {base symbol: price}, empty dict if error
+    """
+    try:
+        client = client or get_client()
+        prices = client.get_prices(symbols)
+        for symbol, price in prices.items():
+            print(f"📊 Current {symbol} Price: ${price:,.2f}")
+        return prices
+    except Exception as e:
+        print(f"❌ Error fetching prices: {e}")
+        return {}
+
+
+@contextlib.contextmanager
+def atomic_open(filename, mode='w'):
+    """
+    Open a temporary file that replaces `filename` once the block succeeds.
+    
+    The data is flushed to disk before the rename, so after a crash the
+    file holds either the previous or the new contents, never a mix.
+    
+    Args:
+        filename (str): Final path
+        mode (str): 'w' or 'wb'
+    """
+    tmp_path = filename + '.tmp'
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def save_state(data, filename='data.json'):
     """
-    Save trading state to JSON file.
+    Save trading state atomically (write to a temporary file, then rename).
+    
+    Filenames ending in .snap use the checksummed binary snapshot
+    format (see src.snapshot), anything else pretty-printed JSON.
     
     Args:
         data (dict): State data to save
         filename (str): Output filename
     """
     try:
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        if filename.endswith('.snap'):
+            from src.snapshot import write_snapshot
+            state = dict(data)
+            write_snapshot(filename, state, history=state.pop('history', None))
+        else:
+            with atomic_open(filename) as f:
+                json.dump(data, f, indent=2)
         print(f"💾 State saved to {filename}")
     except Exception as e:
         print(f"❌ Error saving state: {e}")
 
 
-def load_state(filename='data.json'):
+def load_state(filename='data.json', now=None, names=None):
     """
-    Load trading state from JSON file.
+    Load trading state from a JSON or binary (.snap) file.
     
     If file doesn't exist, returns initial state with $1000 per bot.
+    Strategies enabled since the state was saved get a new $1000 wallet.
     
     Args:
         filename (str): Input filename
+        now (datetime): Start date of a new state (default: current time)
+        names (list): Bot names (default: enabled strategies of the registry)
     
     Returns:
         dict: Loaded state or initial state
     """
+    if names is None:
+        from src.strategies import get_registry
+        names = get_registry().enabled()
+    
     if not os.path.exists(filename):
         print(f"📝 No existing state found. Initializing with $1000 per bot.")
         return {
-            'bots': {
-                'AgentClaude': {'usd_balance': 1000.0, 'holdings': {}},
-                'RoboQuant': {'usd_balance': 1000.0, 'holdings': {}},
-                'WhaleHunter': {'usd_balance': 1000.0, 'holdings': {}}
-            },
-            'history': [],
-            'start_date': datetime.now().isoformat()
+            'bots': {name: {'usd_balance': 1000.0, 'holdings': {}} for name in names},
+            'strategies': {},
+            'start_date': (now or datetime.now()).isoformat()
         }
     
     try:
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        if filename.endswith('.snap'):
+            from src.snapshot import SnapshotHistory, read_snapshot
+            snapshot = read_snapshot(filename)
+            data = snapshot['state']
+            if len(snapshot['history']):
+                data['history'] = SnapshotHistory(snapshot['history'], snapshot['bots'])  # Converted on access
+        else:
+            with open(filename, 'r') as f:
+                data = json.load(f)
+        for name in names:
+            if name not in data['bots']:
+                print(f"📝 New strategy {name}: starting with $1000")
+                data['bots'][name] = {'usd_balance': 1000.0, 'holdings': {}}
         print(f"📂 State loaded from {filename}")
         return data
     except Exception as e:
@@ -101,35 +219,53 @@ def load_state(filename='data.json'):
         return None
 
 
-def generate_chart(history, output_file='status.png'):
+def generate_chart(history, output_file='status.png', cache_file='.chart_cache.npz', max_points=1000, bots=None):
     """
     Generate performance comparison chart with dark theme.
     
+    Parsed series are cached in `cache_file` so only new snapshots are
+    parsed, and each line is reduced to at most `max_points` points with
+    LTTB, which keeps rendering time bounded as history grows.
+    
     Args:
         history (list): List of historical snapshots
         output_file (str): Output image filename
+        cache_file (str): Parsed-series cache, None to disable
+        max_points (int): Maximum points drawn per bot
+        bots (list): Bots to plot (default: enabled strategies of the registry)
     """
     if not history or len(history) < 2:
         print("⚠️ Not enough history data to generate chart")
         return
     
     try:
+        # Imported here so runs that never chart don't pay for matplotlib
+        import matplotlib.pyplot as plt
+        import matplotlib.dates as mdates
+        from src.charts import ChartCache, lttb
+        from src.strategies import get_registry
+        
         # Use dark background style
         plt.style.use('dark_background')
         
         # Create figure
         fig, ax = plt.subplots(figsize=(14, 8))
         
-        # Extract data
-        timestamps = [datetime.fromisoformat(h['timestamp']) for h in history]
+        bots = list(bots or get_registry().enabled())
+        colors = get_registry().colors(bots)
         
-        bots = ['AgentClaude', 'RoboQuant', 'WhaleHunter']
-        colors = ['#00FFFF', '#FF00FF', '#00FF00']  # Cyan, Magenta, Lime Green
+        # Extract data (only snapshots not in the cache are parsed)
+        cache = ChartCache(cache_file, bots=bots)
+        cache.update(history)
+        cache.save()
         
-        # Plot each bot's performance
-        for bot_name, color in zip(bots, colors):
-            values = [h['bots'][bot_name] for h in history]
-            ax.plot(timestamps, values, label=bot_name, color=color, linewidth=2.5, marker='o', markersize=4)
+        # Plot each bot's performance, downsampled for long histories
+        for bot_name, color in colors.items():
+            values = cache.values[bot_name]
+            kept = lttb(cache.timestamps, values, max_points)
+            timestamps = (cache.timestamps[kept] * 1e6).astype('datetime64[us]')
+            markers = {'marker': 'o', 'markersize': 4} if len(kept) <= 200 else {}
+            ax.plot(timestamps, values[kept], label=bot_name, color=color, linewidth=2.5, **markers)
         
         # Formatting
         ax.set_xlabel('Date', fontsize=12, fontweight='bold')
@@ -158,7 +294,7 @@ def generate_chart(history, output_file='status.png'):
         print(f"📊 Chart saved to {output_file}")
         
         plt.close()
-        
+    
     except Exception as e:
         print(f"❌ Error generating chart: {e}")
 
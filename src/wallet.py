@@ -3,6 +3,8 @@ Virtual Wallet Module
 Manages virtual portfolio with realistic trading costs (fees and slippage)
 """
 
+from src.orders import PROTECTIVE_KINDS, OrderBook
+
 
 class VirtualWallet:
     """
@@ -13,9 +15,10 @@ class VirtualWallet:
         holdings (dict): Dictionary of crypto holdings {symbol: amount}
         fee_rate (float): Trading fee percentage (default 0.1%)
         slippage_rate (float): Slippage percentage (default 0.05%)
+        order_book (OrderBook): Book holding this wallet's resting orders
     """
     
-    def __init__(self, initial_usd=1000.0, fee_rate=0.001, slippage_rate=0.0005):
+    def __init__(self, initial_usd=1000.0, fee_rate=0.001, slippage_rate=0.0005, order_book=None):
         """
         Initialize virtual wallet.
         
@@ -23,11 +26,30 @@ class VirtualWallet:
             initial_usd (float): Starting USD balance
             fee_rate (float): Trading fee as decimal (0.001 = 0.1%)
             slippage_rate (float): Slippage as decimal (0.0005 = 0.05%)
+            order_book (OrderBook): Shared book for resting orders, so one
+                candle can trigger orders of many wallets (default: own book)
         """
         self.usd_balance = initial_usd
         self.holdings = {}  # {symbol: amount}
         self.fee_rate = fee_rate
         self.slippage_rate = slippage_rate
+        self.order_book = order_book if order_book is not None else OrderBook()
+    
+    def _buy(self, symbol, effective_price, amount_usd):
+        """Spend `amount_usd` at an effective price. Returns (crypto amount, fee)."""
+        fee = amount_usd * self.fee_rate
+        crypto_amount = (amount_usd - fee) / effective_price
+        self.usd_balance -= amount_usd
+        self.holdings[symbol] = self.holdings.get(symbol, 0) + crypto_amount
+        return crypto_amount, fee
+    
+    def _sell(self, symbol, effective_price, crypto_amount):
+        """Sell `crypto_amount` at an effective price. Returns the fee."""
+        gross_usd = crypto_amount * effective_price
+        fee = gross_usd * self.fee_rate
+        self.usd_balance += gross_usd - fee
+        self.holdings[symbol] -= crypto_amount
+        return fee
     
     def buy(self, symbol, price, amount_usd):
         """
@@ -54,29 +76,22 @@ class VirtualWallet:
         # Calculate effective price with slippage (buying = higher price)
         effective_price = price * (1 + self.slippage_rate)
         
-        # Calculate fee
-        fee = amount_usd * self.fee_rate
-        
-        # Calculate amount of crypto to receive
-        net_usd = amount_usd - fee
-        crypto_amount = net_usd / effective_price
-        
-        # Update balances
-        self.usd_balance -= amount_usd
-        self.holdings[symbol] = self.holdings.get(symbol, 0) + crypto_amount
+        # Fee comes out of the USD spent
+        crypto_amount, fee = self._buy(symbol, effective_price, amount_usd)
         
         print(f"✅ BUY: {crypto_amount:.8f} {symbol} @ ${effective_price:.2f} (Fee: ${fee:.2f})")
         return True
     
-    def sell(self, symbol, price):
+    def sell(self, symbol, price, amount=None):
         """
-        Sell all holdings of a cryptocurrency.
+        Sell holdings of a cryptocurrency.
         
         Applies trading fee and slippage to simulate realistic costs.
         
         Args:
             symbol (str): Crypto symbol to sell
             price (float): Current price per unit
+            amount (float): Crypto amount to sell (None = all holdings)
         
         Returns:
             bool: True if sale successful, False otherwise
@@ -85,27 +100,119 @@ class VirtualWallet:
             print(f"❌ No {symbol} holdings to sell")
             return False
         
-        crypto_amount = self.holdings[symbol]
+        if amount is not None and not 0 < amount <= self.holdings[symbol]:
+            print(f"❌ Invalid amount: {amount} {symbol} (holding {self.holdings[symbol]:.8f})")
+            return False
+        
+        crypto_amount = self.holdings[symbol] if amount is None else amount
         
         # Calculate effective price with slippage (selling = lower price)
         effective_price = price * (1 - self.slippage_rate)
         
-        # Calculate gross USD received
-        gross_usd = crypto_amount * effective_price
+        # Fee comes out of the USD received
+        fee = self._sell(symbol, effective_price, crypto_amount)
+        if amount is None:
+            self.holdings[symbol] = 0
         
-        # Calculate fee
-        fee = gross_usd * self.fee_rate
+        print(f"✅ SELL: {crypto_amount:.8f} {symbol} @ ${effective_price:.2f} (Fee: ${fee:.2f})")
+        if self.holdings[symbol] <= 0:
+            self.cancel_protective_orders(symbol)
+        return True
+    
+    def place_order(self, symbol, kind, price, amount=None):
+        """
+        Place a resting order in the wallet's order book.
+        
+        Args:
+            symbol (str): Crypto symbol (e.g., 'BTC')
+            kind (str): 'limit_buy', 'limit_sell', 'stop_loss' or 'take_profit'
+            price (float): Limit or trigger price
+            amount (float): USD to spend for limit buys; crypto to sell
+                otherwise (None = whole position when triggered)
+        
+        Returns:
+            Order: The resting order
+        """
+        return self.order_book.place(self, symbol, kind, price, amount)
+    
+    def cancel_order(self, order_id):
+        """Cancel one of the wallet's open orders. Returns True if it was open."""
+        order = self.order_book.orders.get(order_id)
+        if order is None or order.wallet is not self:
+            return False
+        return self.order_book.cancel(order_id)
+    
+    def open_orders(self):
+        """List the wallet's open orders."""
+        return self.order_book.open_orders(self)
+    
+    def cancel_protective_orders(self, symbol):
+        """
+        Cancel the wallet's stop-losses and take-profits on a symbol.
         
-        # Calculate net USD received
-        net_usd = gross_usd - fee
+        Called when the position is closed, so they cannot trigger on a
+        later position (or be rejected for lack of holdings).
         
-        # Update balances
-        self.usd_balance += net_usd
-        self.holdings[symbol] = 0
+        Returns:
+            int: Number of orders cancelled
+        """
+        orders = [order for order in self.open_orders() if order.symbol == symbol and order.kind in PROTECTIVE_KINDS]
+        for order in orders:
+            self.order_book.cancel(order.id)
+        return len(orders)
+    
+    def fill_order(self, order, price):
+        """
+        Execute a triggered order (called by the order book).
         
-        print(f"✅ SELL: {crypto_amount:.8f} {symbol} @ ${effective_price:.2f} (Fee: ${fee:.2f})")
+        Limit and take-profit orders fill at their price; stop-losses
+        become market orders and also pay slippage. Fees apply to all.
+        
+        Args:
+            order (Order): Triggered order
+            price (float): Fill price before slippage
+        
+        Returns:
+            bool: True if filled, False if the wallet cannot cover it
+        """
+        if order.kind == 'stop_loss':
+            price = price * (1 - self.slippage_rate)
+        
+        if order.kind == 'limit_buy':
+            if order.amount > self.usd_balance:
+                return False
+            self._buy(order.symbol, price, order.amount)
+        else:
+            held = self.holdings.get(order.symbol, 0)
+            amount = held if order.amount is None else order.amount
+            if held <= 0 or amount > held:
+                return False
+            self._sell(order.symbol, price, amount)
+            if order.amount is None:
+                self.holdings[order.symbol] = 0
+        
+        order.fill_price = price
+        if order.kind != 'limit_buy' and self.holdings[order.symbol] <= 0:
+            # E.g. a filled stop-loss cancels the take-profit
+            self.cancel_protective_orders(order.symbol)
         return True
     
+    def process_candle(self, symbol, candle):
+        """
+        Trigger resting orders crossed by a candle.
+        
+        With a shared order book this fills the orders of every wallet
+        in it, not only this one.
+        
+        Args:
+            symbol (str): Crypto symbol of the candle
+            candle (list): [timestamp, open, high, low, close, volume]
+        
+        Returns:
+            list: Filled orders
+        """
+        return self.order_book.process_candle(symbol, candle)
+    
     def get_total_value(self, current_prices):
         """
         Calculate total portfolio value in USD.
@@ -131,10 +238,14 @@ class VirtualWallet:
         Returns:
             dict: Wallet state dictionary
         """
-        return {
+        state = {
             'usd_balance': self.usd_balance,
             'holdings': self.holdings.copy()
         }
+        orders = self.open_orders()
+        if orders:
+            state['orders'] = [order.get_state() for order in orders]
+        return state
     
     def load_state(self, state):
         """
@@ -145,6 +256,9 @@ class VirtualWallet:
         """
         self.usd_balance = state.get('usd_balance', 1000.0)
         self.holdings = state.get('holdings', {})
+        self.order_book.cancel_all(self)
+        for order in state.get('orders', []):
+            self.place_order(order['symbol'], order['kind'], order['price'], order.get('amount'))
     
     def __str__(self):
         """String representation of wallet."""
@@ -0,0 +1,81 @@
+"""
+Tests for the online performance statistics against full recomputation
+"""
+
+import json
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.analytics import PerformanceStats, full_stats, update_analytics
+
+
+BOTS = ['AgentClaude', 'RoboQuant', 'WhaleHunter']
+
+
+def random_history(n, seed):
+    """Snapshots at irregular intervals; bots join late, values sometimes stay flat."""
+    rng = random.Random(seed)
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    values = {name: 1000.0 for name in BOTS}
+    history = []
+    for i in range(n):
+        timestamp += timedelta(seconds=rng.choice([60, 3600, 43_200, rng.randint(1, 10 ** 6)]))
+        bots = {}
+        for j, name in enumerate(BOTS):
+            if i < 5 * j:
+                continue  # Not enabled yet
+            if rng.random() > 0.2:
+                values[name] *= math.exp(rng.gauss(0, 0.03))
+            bots[name] = values[name]
+        history.append({'timestamp': timestamp.isoformat(), 'btc_price': 42_000.0, 'bots': bots})
+    return history
+
+
+def assert_same(online, reference):
+    assert online.keys() == reference.keys()
+    for key, expected in reference.items():
+        if isinstance(expected, float) and math.isnan(expected):
+            assert math.isnan(online[key]), key
+        else:
+            assert online[key] == pytest.approx(expected, rel=1e-9, abs=1e-12), key
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_online_stats_match_full_recomputation_on_every_prefix(seed):
+    history = random_history(120, seed)
+    stats = {name: PerformanceStats() for name in BOTS}
+    
+    for i, snapshot in enumerate(history):
+        for name, value in snapshot['bots'].items():
+            stats[name].update(value, snapshot['timestamp'])
+        for name in BOTS:
+            reference = full_stats(history[:i + 1], name)
+            if reference is None:
+                assert stats[name].count == 0
+            else:
+                assert_same(stats[name].summary(), reference)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_persisted_analytics_match_full_recomputation(seed):
+    history = random_history(80, seed)
+    rng = random.Random(seed)
+    state = {}
+    
+    # Apply snapshots in random batches, through a JSON round trip of the state each time
+    i = 0
+    while i < len(history):
+        batch = history[i:i + rng.randint(1, 7)]
+        state = json.loads(json.dumps(state))
+        stats = update_analytics(state, batch)
+        i += len(batch)
+        for name, bot_stats in stats.items():
+            assert_same(bot_stats.summary(), full_stats(history[:i], name))
+    
+    for name in BOTS:
+        restored = PerformanceStats()
+        restored.load_state(state['analytics'][name])
+        assert_same(restored.summary(), full_stats(history, name))
@@ -0,0 +1,142 @@
+"""
+Tests for the paginated candle backfill
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from src.backfill import RateLimiter, backfill, to_ms
+from src.fakes import FakeExchange, NetworkError, ThrottledExchange
+from src.market import TIMEFRAME_MS, MarketDataClient
+from src.store import CandleStore
+
+
+HOUR = TIMEFRAME_MS['1h']
+NOW = to_ms(datetime(2024, 2, 1, tzinfo=timezone.utc))
+
+
+def run(store, start, end, **kwargs):
+    client = MarketDataClient(FakeExchange(now_ms=NOW))
+    return backfill(store, 'BTC/USDT', '1h', start=start, end=end, client=client, page_limit=50, rate=1e6,
+                    **kwargs)
+
+
+def timestamps(store):
+    return store.read_array('BTC/USDT', '1h')[:, 0].astype(np.int64)
+
+
+def test_backfill_downloads_every_candle_in_order(tmp_path):
+    store = CandleStore(str(tmp_path))
+    
+    stats = run(store, '2024-01-01', '2024-01-10')
+    
+    stamps = timestamps(store)
+    assert stats['candles'] == 9 * 24
+    assert stamps[0] == to_ms('2024-01-01') and stamps[-1] == to_ms('2024-01-10') - HOUR
+    assert np.all(np.diff(stamps) == HOUR)
+
+
+def test_backfill_resumes_at_the_newest_candle(tmp_path):
+    store = CandleStore(str(tmp_path))
+    run(store, '2024-01-01', '2024-01-03')
+    
+    stats = run(store, '2024-01-02', '2024-01-05')
+    
+    stamps = timestamps(store)
+    assert stats['candles'] == 2 * 24 + 1  # The newest candle is replaced
+    assert np.all(np.diff(stamps) == HOUR)
+
+
+def test_backfill_fills_the_gap_before_a_later_start(tmp_path, capsys):
+    store = CandleStore(str(tmp_path))
+    run(store, '2024-01-01', '2024-01-03')
+    
+    run(store, '2024-01-10', '2024-01-12')
+    
+    stamps = timestamps(store)
+    assert "filling the gap" in capsys.readouterr().out
+    assert stamps[0] == to_ms('2024-01-01') and stamps[-1] == to_ms('2024-01-12') - HOUR
+    assert np.all(np.diff(stamps) == HOUR)
+
+
+class FakeClock:
+    """Monotonic clock advanced only by its own sleep()."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def flaky_client(failure_rate):
+    exchange = ThrottledExchange(latency=0.0, rate_limit=None, failure_rate=failure_rate, now_ms=NOW, seed=4)
+    return exchange, MarketDataClient(exchange)
+
+
+def test_failed_pages_are_retried_until_complete(tmp_path):
+    store = CandleStore(str(tmp_path))
+    exchange, client = flaky_client(failure_rate=0.3)
+    clock = FakeClock()
+    
+    stats = backfill(store, 'BTC/USDT', '1h', start='2024-01-01', end='2024-01-10', client=client, workers=1,
+                     page_limit=24, rate=1e6, retries=10, backoff=0.5, sleep=clock.sleep)
+    
+    assert exchange.failed > 0
+    assert stats['retries'] == exchange.failed == len(clock.sleeps)
+    assert stats['requests'] == stats['pages'] + stats['retries']
+    assert stats['candles'] == 9 * 24
+    assert np.all(np.diff(timestamps(store)) == HOUR)
+
+
+def test_retry_delays_double_and_the_last_error_is_raised(tmp_path):
+    store = CandleStore(str(tmp_path))
+    exchange, client = flaky_client(failure_rate=1.0)
+    clock = FakeClock()
+    
+    with pytest.raises(NetworkError):
+        backfill(store, 'BTC/USDT', '1h', start='2024-01-01', end='2024-01-02', client=client, workers=1,
+                 page_limit=24, rate=1e6, retries=4, backoff=0.5, sleep=clock.sleep)  # A single page
+    
+    assert exchange.failed == 5  # The first try and 4 retries
+    assert len(clock.sleeps) == 4
+    for attempt, delay in enumerate(clock.sleeps):
+        base = 0.5 * 2 ** attempt
+        assert base <= delay < 2 * base  # Doubling delay plus up to 100% jitter
+    assert store.last_timestamp('BTC/USDT', '1h') is None
+
+
+def test_rate_limiter_paces_requests_at_the_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=10.0, burst=1.0, clock=clock, sleep=clock.sleep)
+    
+    times = []
+    for _ in range(6):
+        limiter.acquire()
+        times.append(clock.now)
+    
+    np.testing.assert_allclose(times, [0.0, 0.1, 0.2, 0.3, 0.4, 0.5])
+
+
+def test_rate_limiter_allows_a_burst_after_idling():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=4.0, burst=3.0, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == []
+    
+    limiter.acquire()
+    assert clock.now == pytest.approx(0.25)
+    
+    clock.now += 10.0  # Idle: the bucket refills up to the burst only
+    start = clock.now
+    for _ in range(5):
+        limiter.acquire()
+    assert clock.now - start == pytest.approx(2 / 4.0)
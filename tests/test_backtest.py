@@ -0,0 +1,69 @@
+"""
+Tests for the run-based backtest engine against per-candle wallet execution
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from src.backtest import simulate
+from src.bots import SIGNAL_CODES
+from src.runner import execute_decision
+from src.wallet import VirtualWallet
+
+
+DECISIONS = {code: name for name, code in SIGNAL_CODES.items()}
+
+
+def random_signals(n, rng):
+    """Signal runs of random length, so repeated BUYs drain the balance below the minimum."""
+    signals = []
+    while len(signals) < n:
+        signals.extend([rng.choice([-1, 0, 1])] * int(rng.integers(1, 40)))
+    return np.array(signals[:n], dtype=np.int8)
+
+
+def per_candle(close, signals, wallet):
+    """The original semantics: execute_decision on a VirtualWallet, candle by candle."""
+    equity, trades = [], 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for price, code in zip(close.tolist(), signals.tolist()):
+            trades += bool(execute_decision(wallet, DECISIONS[code], price))
+            equity.append(wallet.usd_balance + wallet.holdings.get('BTC', 0.0) * price)
+    return np.array(equity), trades
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('fee_rate, slippage_rate', [(0.001, 0.0005), (0.0, 0.0), (0.01, 0.002)])
+def test_simulate_matches_per_candle_execution(seed, fee_rate, slippage_rate):
+    rng = np.random.default_rng(seed)
+    n = 2_000
+    close = 42_000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    signals = random_signals(n, rng)
+    start = VirtualWallet(initial_usd=1000.0, fee_rate=fee_rate, slippage_rate=slippage_rate)
+    if seed % 2:
+        start.holdings['BTC'] = 0.01  # Starting with an open position
+    
+    result = simulate(close, signals, wallet=start)
+    wallet = VirtualWallet(initial_usd=1000.0, fee_rate=fee_rate, slippage_rate=slippage_rate)
+    wallet.holdings.update(start.holdings)
+    equity, trades = per_candle(close, signals, wallet)
+    
+    assert result['trades'] == trades
+    np.testing.assert_allclose(result['equity'], equity, rtol=1e-12)
+    assert result['usd_balance'][-1] == pytest.approx(wallet.usd_balance, rel=1e-12, abs=1e-9)
+    assert result['holdings'][-1] == pytest.approx(wallet.holdings.get('BTC', 0.0), rel=1e-12, abs=1e-15)
+    assert start.usd_balance == 1000.0  # Not modified
+
+
+def test_repeated_buys_stop_at_the_minimum_trade():
+    close = np.full(100, 50_000.0)
+    signals = np.full(100, SIGNAL_CODES["BUY"], dtype=np.int8)
+    
+    result = simulate(close, signals)
+    
+    # 1000 * 0.1^k > 10 for k = 0, 1: two BUYs, then $10 left is not enough
+    assert result['trades'] == 2
+    assert result['usd_balance'][-1] == pytest.approx(10.0)
@@ -0,0 +1,150 @@
+"""
+Tests for the decision cache and batched AgentClaude requests
+"""
+
+import json
+
+from src.bots import AgentClaude
+from src.cache import RUN_INTERVAL, DecisionCache, ttl_for_interval
+from src.fakes import FakeAnthropic
+from src.strategies import StrategyRegistry
+
+
+class ManualClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+def test_cache_entries_expire_after_ttl():
+    clock = ManualClock()
+    cache = DecisionCache(ttl=60, clock=clock)
+    cache.put('k', "BUY")
+    
+    clock.now += 60
+    assert cache.get('k') == "BUY"
+    clock.now += 1
+    assert cache.get('k') is None
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 0)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = DecisionCache(max_size=2, clock=ManualClock())
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_cache_state_drops_expired_entries():
+    clock = ManualClock()
+    cache = DecisionCache(ttl=60, clock=clock)
+    cache.put('old', "SELL")
+    clock.now += 30
+    cache.put('new', "BUY")
+    clock.now += 40
+    
+    restored = DecisionCache(ttl=60, clock=clock)
+    restored.load_state(json.loads(json.dumps(cache.get_state())))
+    
+    assert list(restored.entries) == ['new']
+    assert restored.get('new') == "BUY"
+
+
+def test_repeated_market_is_answered_from_cache():
+    clock = ManualClock()
+    client = FakeAnthropic(seed=1)
+    bot = AgentClaude(client=client, cache_ttl=3600, clock=clock)
+    
+    first = bot.decide_batch({'BTC': (100_000.0, 1.0)})
+    # Same price to 3 significant digits and change to 0.25 points
+    second = bot.decide_batch({'BTC': (100_040.0, 1.1)})
+    
+    assert first == second
+    assert client.calls == 1
+    assert bot.cache.hits == 1
+
+
+def test_expired_decision_is_requested_again():
+    clock = ManualClock()
+    client = FakeAnthropic(seed=1)
+    bot = AgentClaude(client=client, cache_ttl=3600, clock=clock)
+    
+    bot.decide_batch({'BTC': (100_000.0, 1.0)})
+    clock.now += 3601
+    bot.decide_batch({'BTC': (100_000.0, 1.0)})
+    
+    assert client.calls == 2
+
+
+def test_batch_sends_only_uncached_symbols_in_one_request():
+    clock = ManualClock()
+    client = FakeAnthropic(seed=2)
+    bot = AgentClaude(client=client, clock=clock)
+    bot.decide_batch({'BTC': (100_000.0, 0.0)})
+    
+    markets = {'BTC': (100_000.0, 0.0), 'ETH': (3_000.0, -2.0), 'SOL': (150.0, 5.0)}
+    decisions = bot.decide_batch(markets)
+    
+    assert client.calls == 2  # One for BTC alone, one for ETH and SOL together
+    assert set(decisions) == set(markets)
+    assert all(decision in ("BUY", "SELL", "HOLD") for decision in decisions.values())
+    
+    bot.decide_batch(markets)
+    assert client.calls == 2
+
+
+def test_cache_survives_a_restart_through_state():
+    clock = ManualClock()
+    client = FakeAnthropic(seed=3)
+    bot = AgentClaude(client=client, clock=clock)
+    decision = bot.decide_batch({'BTC': (100_000.0, 0.5)})
+    
+    restarted = AgentClaude(client=client, clock=clock)
+    restarted.load_state(json.loads(json.dumps(bot.get_state())))
+    clock.now += 600
+    
+    assert restarted.decide_batch({'BTC': (100_000.0, 0.5)}) == decision
+    assert client.calls == 1
+
+
+def test_default_ttl_outlives_the_scheduled_run_interval():
+    clock = ManualClock()
+    client = FakeAnthropic(seed=1)
+    bot = AgentClaude(client=client, clock=clock)
+    
+    bot.decide_batch({'BTC': (100_000.0, 1.0)})
+    clock.now += RUN_INTERVAL + 600  # Next run, started 10 minutes late
+    bot.decide_batch({'BTC': (100_000.0, 1.0)})
+    assert client.calls == 1
+    
+    clock.now += RUN_INTERVAL
+    bot.decide_batch({'BTC': (100_000.0, 1.0)})
+    assert client.calls == 2
+
+
+def test_registry_ties_ttl_to_the_strategy_interval():
+    registry = StrategyRegistry({
+        'Hourly': {'target': 'src.bots:AgentClaude', 'interval': '1h'},
+        'Fixed': {'target': 'src.bots:AgentClaude', 'interval': '1h', 'options': {'cache_ttl': 60}},
+        'EveryRun': {'target': 'src.bots:AgentClaude'}
+    })
+    
+    bots = registry.create_bots(llm_client=FakeAnthropic(seed=1))
+    
+    assert bots['Hourly'].cache.ttl == ttl_for_interval(3600)
+    assert bots['Fixed'].cache.ttl == 60
+    assert bots['EveryRun'].cache.ttl == ttl_for_interval(RUN_INTERVAL)
+
+
+def test_registry_skips_ttl_for_bots_without_a_cache():
+    registry = StrategyRegistry({'RoboQuant': {'target': 'src.bots:RoboQuant', 'interval': '4h'}})
+    
+    bot = registry.create_bots()['RoboQuant']
+    
+    assert not hasattr(bot, 'cache')
@@ -0,0 +1,102 @@
+"""
+Tests for the CandleBuffer ring buffer and its zero-copy views
+"""
+
+import numpy as np
+import pytest
+
+from src.candles import CandleBuffer
+
+
+HOUR = 3_600_000
+
+
+def candles(start, n):
+    """n hourly candles from open-time index `start`, values derived from the index."""
+    return [[(start + i) * HOUR, 100.0 + start + i, 101.0 + start + i, 99.0 + start + i, 100.5 + start + i, 1.0]
+            for i in range(n)]
+
+
+def test_wraparound_keeps_the_newest_candles_contiguous():
+    buffer = CandleBuffer(capacity=5)
+    rows = candles(0, 13)
+    
+    for i, row in enumerate(rows):
+        buffer.append(row)
+        n = min(i + 1, 5)
+        np.testing.assert_array_equal(buffer.array(), rows[i + 1 - n:i + 1])
+    
+    assert len(buffer) == 5 and buffer.count == 13
+    assert buffer.last_timestamp == 12 * HOUR
+    # Every candle is mirrored at slot i + capacity
+    np.testing.assert_array_equal(buffer._data[:5], buffer._data[5:])
+    np.testing.assert_array_equal(buffer._data[13 % 5 - 1], rows[-1])
+
+
+def test_extend_longer_than_capacity_keeps_the_tail():
+    buffer = CandleBuffer(capacity=4)
+    buffer.extend(candles(0, 3))
+    buffer.extend(candles(3, 10))
+    
+    np.testing.assert_array_equal(buffer.array(), candles(9, 4))
+    assert buffer.count == 13
+
+
+def test_resent_open_candle_is_replaced_in_place():
+    buffer = CandleBuffer(capacity=3)
+    buffer.extend(candles(0, 4))  # Newest candle sits in a wrapped slot
+    updated = list(candles(3, 1)[0])
+    updated[2], updated[4] = 120.0, 115.0
+    
+    buffer.extend([updated] + candles(4, 1))
+    assert buffer.count == 5
+    np.testing.assert_array_equal(buffer.array(), candles(2, 1) + [updated] + candles(4, 1))
+    
+    buffer.append(candles(4, 1)[0][:4] + [99.0, 2.0])
+    assert buffer.count == 5
+    assert buffer.array()[-1].tolist() == candles(4, 1)[0][:4] + [99.0, 2.0]
+    np.testing.assert_array_equal(buffer._data[:3], buffer._data[3:])
+
+
+def test_rows_older_than_the_newest_are_skipped():
+    buffer = CandleBuffer(capacity=10)
+    buffer.extend(candles(5, 3))
+    
+    buffer.extend(candles(0, 6))  # Entirely older
+    buffer.extend(candles(6, 4))  # Overlaps: 6 is older, 7 replaces, 8 and 9 are new
+    
+    assert buffer.count == 5
+    np.testing.assert_array_equal(buffer.array(), candles(5, 5))
+
+
+def test_view_indexes_like_the_list_of_rows():
+    buffer = CandleBuffer(capacity=6)
+    rows = candles(0, 9)
+    buffer.extend(rows)
+    expected = rows[-4:]
+    
+    view = buffer.view(4)
+    
+    assert len(view) == 4
+    assert view[-2][4] == expected[-2][4]
+    assert view[0] == expected[0]
+    assert view[1:3] == expected[1:3]
+    assert list(view) == expected
+    assert isinstance(view[-1][0], int)
+    np.testing.assert_array_equal(view.close, [row[4] for row in expected])
+
+
+def test_array_is_a_read_only_view_of_the_buffer():
+    buffer = CandleBuffer(capacity=5)
+    buffer.extend(candles(0, 7))
+    
+    window = buffer.array(3)
+    
+    assert np.shares_memory(window, buffer._data)
+    assert window.base is buffer._data
+    assert not window.flags.writeable
+    with pytest.raises(ValueError):
+        window[0, 4] = 0.0
+    assert np.shares_memory(np.asarray(buffer.view(3)), buffer._data)
+    assert buffer.array(100).shape == (5, 6)
+    assert CandleBuffer(capacity=5).array().shape == (0, 6)
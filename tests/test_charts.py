@@ -0,0 +1,111 @@
+"""
+Tests for chart downsampling and the parsed-series cache
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src import charts
+from src.charts import ChartCache, lttb
+
+
+BOTS = ['AgentClaude', 'RoboQuant']
+
+
+def history(n, start=datetime(2024, 1, 1)):
+    rng = np.random.default_rng(n)
+    return [
+        {'timestamp': (start + timedelta(hours=12 * i)).isoformat(), 'btc_price': 42_000.0,
+         'bots': {bot: float(value) for bot, value in zip(BOTS, 1000 + rng.normal(0, 10, len(BOTS)))}}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize('n, threshold', [(1000, 100), (10_001, 997), (50, 3), (7, 6)])
+def test_lttb_keeps_endpoints_and_exactly_threshold_points(n, threshold):
+    x = np.arange(n, dtype=np.float64)
+    y = np.random.default_rng(0).normal(size=n).cumsum()
+    
+    kept = lttb(x, y, threshold)
+    
+    assert len(kept) == threshold
+    assert kept[0] == 0 and kept[-1] == n - 1
+    assert np.all(np.diff(kept) > 0)  # Sorted and distinct
+
+
+@pytest.mark.parametrize('n, threshold', [(10, 10), (10, 50), (0, 5), (1, 5)])
+def test_lttb_returns_everything_when_small(n, threshold):
+    x = np.arange(n, dtype=np.float64)
+    
+    assert lttb(x, x, threshold).tolist() == list(range(n))
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[537] = 100.0
+    
+    assert 537 in lttb(x, y, 50)
+
+
+def test_update_only_parses_new_snapshots(monkeypatch):
+    parsed = []
+    wall_seconds = charts.wall_seconds
+    monkeypatch.setattr(charts, 'wall_seconds', lambda timestamp: parsed.append(timestamp) or wall_seconds(timestamp))
+    snapshots = history(30)
+    cache = ChartCache(path=None, bots=BOTS)
+    
+    assert cache.update(snapshots[:20]) == 20
+    assert cache.update(snapshots) == 10
+    
+    assert parsed == [s['timestamp'] for s in snapshots]  # Each snapshot parsed once
+    # A changed prefix (e.g. after compaction) is parsed again from scratch
+    assert cache.update(snapshots[5:]) == 25
+
+
+def test_saved_cache_equals_a_fresh_parse(tmp_path):
+    path = str(tmp_path / 'cache.npz')
+    snapshots = history(40)
+    cache = ChartCache(path=path, bots=BOTS)
+    cache.update(snapshots[:25])
+    cache.save()
+    
+    loaded = ChartCache(path=path, bots=BOTS)
+    assert loaded.update(snapshots) == 15
+    fresh = ChartCache(path=None, bots=BOTS)
+    fresh.update(snapshots)
+    
+    np.testing.assert_array_equal(loaded.timestamps, fresh.timestamps)
+    for bot in BOTS:
+        np.testing.assert_array_equal(loaded.values[bot], fresh.values[bot])
+
+
+def test_cache_for_other_bots_is_ignored(tmp_path):
+    path = str(tmp_path / 'cache.npz')
+    cache = ChartCache(path=path, bots=BOTS)
+    cache.update(history(10))
+    cache.save()
+    
+    assert ChartCache(path=path, bots=['WhaleHunter']).update(history(10)) == 10
+
+
+def test_failed_save_keeps_the_previous_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.npz')
+    cache = ChartCache(path=path, bots=BOTS)
+    cache.update(history(10))
+    cache.save()
+    
+    def torn_savez(f, **arrays):
+        f.write(b'PK\x03\x04 partial')
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(np, 'savez', torn_savez)
+    cache.update(history(20))
+    with pytest.raises(OSError):
+        cache.save()
+    monkeypatch.undo()
+    
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['cache.npz']
+    assert ChartCache(path=path, bots=BOTS).update(history(20)) == 10
@@ -0,0 +1,99 @@
+"""
+Tests for the long-running daemon against a simulated clock and fake exchange
+"""
+
+import json
+from datetime import datetime
+
+from src.bots import RoboQuant
+from src.daemon import TradingDaemon
+from src.fakes import FakeAnthropic, FakeExchange, SimulatedClock
+from src.history import HistoryLog
+from src.market import MarketDataClient
+from src.utils import save_state
+
+
+def make_daemon(timeframe='1m', checkpoint_interval=600.0, start=datetime(2024, 1, 1, 0, 0, 30)):
+    exchange = FakeExchange(volatility=0.003)
+    clock = SimulatedClock(start, exchange=exchange)
+    daemon = TradingDaemon(
+        MarketDataClient(exchange), FakeAnthropic(), timeframe=timeframe, checkpoint_interval=checkpoint_interval,
+        clock=clock.now, sleep=clock.sleep, seed=1, chart=False, metrics_dir=None
+    )
+    return daemon, exchange, clock
+
+
+def test_daemon_decides_once_per_candle_close(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    daemon, exchange, clock = make_daemon()
+    
+    daemon.run(max_ticks=30)
+    
+    assert daemon.ticks == 30
+    assert clock.now() == datetime(2024, 1, 1, 0, 30, 5)  # 30 closes plus the 5 s grace
+    assert exchange.calls['fetch_tickers'] == 30
+    assert exchange.calls['fetch_ohlcv'] == 30  # One top-up per tick
+    
+    history = HistoryLog().read()
+    assert len(history) == 30
+    assert all(datetime.fromisoformat(s['timestamp']).second == 5 for s in history)
+    
+    with open('data.json') as f:
+        state = json.load(f)
+    assert set(state['bots']) == {'AgentClaude', 'RoboQuant', 'WhaleHunter'}
+    assert state['analytics']['RoboQuant']['count'] == 30
+
+
+def test_checkpoints_follow_the_interval(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    daemon, _, _ = make_daemon(checkpoint_interval=600.0)
+    saves = []
+    checkpoint = daemon.checkpoint
+    monkeypatch.setattr(daemon, 'checkpoint', lambda now=None: (saves.append(now), checkpoint(now)))
+    
+    daemon.run(max_ticks=25)
+    
+    # Ticks at minutes 10 and 20 reach the interval, plus the final one on exit
+    assert len(saves) == 3
+
+
+def test_indicator_state_is_kept_per_timeframe(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    hourly = RoboQuant()
+    candles = FakeExchange(volatility=0.003, now_ms=1_704_067_200_000).fetch_ohlcv('BTC/USDT', '1h', limit=100)
+    hourly.decide(candles[-1][4], candles)
+    hourly_state = json.loads(json.dumps(hourly.get_state()))
+    save_state({
+        'bots': {name: {'usd_balance': 1000.0, 'holdings': {}} for name in ('AgentClaude', 'RoboQuant', 'WhaleHunter')},
+        'strategies': {'RoboQuant': hourly_state},
+        'start_date': '2024-01-01T00:00:00'
+    }, 'data.json')
+    
+    daemon, _, _ = make_daemon()
+    daemon.run(max_ticks=5)
+    
+    with open('data.json') as f:
+        saved = json.load(f)['strategies']['RoboQuant']['timeframes']
+    assert saved['1h'] == hourly_state['timeframes']['1h']
+    assert saved['1m']['last_timestamp'] > hourly_state['timeframes']['1h']['last_timestamp']
+    
+    # State written before the keying is read as the hourly one
+    legacy = RoboQuant()
+    legacy.load_state(hourly_state['timeframes']['1h'])
+    assert legacy.get_state() == hourly_state
+
+
+def test_resting_orders_trigger_on_closed_candles(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    bots = {name: {'usd_balance': 1000.0, 'holdings': {}} for name in ('AgentClaude', 'RoboQuant', 'WhaleHunter')}
+    bots['RoboQuant']['orders'] = [{'symbol': 'BTC', 'kind': 'limit_buy', 'price': 1e9, 'amount': 100.0}]
+    save_state({'bots': bots, 'strategies': {}, 'start_date': '2024-01-01T00:00:00'}, 'data.json')
+    daemon, _, _ = make_daemon()
+    
+    daemon.run(max_ticks=2)
+    
+    assert "🎯 RoboQuant: limit_buy BTC filled" in capsys.readouterr().out
+    with open('data.json') as f:
+        state = json.load(f)
+    assert 'orders' not in state['bots']['RoboQuant']
+    assert state['last_order_candle'] == daemon.candles.view(2)[0][0]
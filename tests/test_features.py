@@ -0,0 +1,120 @@
+"""
+Tests for the feature store against the pandas-ta reference formulas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features import FeatureStore, clear_cache
+from tests.test_indicators import reference_rsi
+
+
+def reference_ema(values, length):
+    """pandas-ta ema() (non-talib path): SMA seed, then span-based EWM without adjustment."""
+    close = pd.Series(values, dtype=float)
+    seeded = close.copy()
+    seeded.iloc[:length - 1] = np.nan
+    seeded.iloc[length - 1] = close.iloc[:length].mean()
+    return seeded.ewm(span=length, adjust=False).mean().to_numpy()
+
+
+def reference_true_range(high, low, close):
+    """pandas-ta true_range(): NaN for the first candle."""
+    high, low, close = (pd.Series(v, dtype=float) for v in (high, low, close))
+    prev_close = close.shift(1)
+    ranges = pd.concat([high - low, high - prev_close, prev_close - low], axis=1).abs().max(axis=1)
+    ranges.iloc[:1] = np.nan
+    return ranges.to_numpy()
+
+
+def reference_atr(high, low, close, length):
+    """pandas-ta atr() with its default RMA smoothing."""
+    tr = pd.Series(reference_true_range(high, low, close))
+    return tr.ewm(alpha=1 / length, min_periods=length).mean().to_numpy()
+
+
+def random_ohlcv(n, seed=0):
+    """Random candles with overnight-style gaps between close and next open."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * np.exp(rng.normal(0, 0.005, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, n)))
+    timestamps = np.arange(n) * 3_600_000.0
+    return np.column_stack([timestamps, open_, high, low, close, rng.uniform(1, 100, n)])
+
+
+def assert_matches(values, expected):
+    np.testing.assert_array_equal(np.isnan(values), np.isnan(expected))
+    np.testing.assert_allclose(values, expected, rtol=0, atol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize('length', [2, 7, 14, 50])
+def test_indicators_match_pandas_ta_formulas(length):
+    ohlcv = random_ohlcv(2000, seed=length)
+    features = FeatureStore(ohlcv)
+    high, low, close = ohlcv[:, 2], ohlcv[:, 3], ohlcv[:, 4]
+    
+    assert_matches(features.rsi(length), reference_rsi(close, length))
+    assert_matches(features.ema(length), reference_ema(close, length))
+    assert_matches(features.true_range(), reference_true_range(high, low, close))
+    assert_matches(features.atr(length), reference_atr(high, low, close, length))
+    assert np.isnan(features.atr(length)[length - 1]) and not np.isnan(features.atr(length)[length])
+
+
+def test_returns_match_pandas():
+    ohlcv = random_ohlcv(500)
+    features = FeatureStore(ohlcv)
+    close = pd.Series(ohlcv[:, 4])
+    
+    assert_matches(features.returns(), close.pct_change().to_numpy())
+    assert_matches(features.returns(5, log=True), np.log(close / close.shift(5)).to_numpy())
+
+
+def test_matches_pandas_ta_when_installed():
+    ta = pytest.importorskip('pandas_ta')
+    if not hasattr(ta, 'atr'):
+        pytest.skip('pandas_ta without atr()')
+    ohlcv = random_ohlcv(1000, seed=9)
+    frame = pd.DataFrame(ohlcv[:, 1:5], columns=['open', 'high', 'low', 'close'])
+    features = FeatureStore(ohlcv)
+    
+    assert_matches(features.rsi(14), ta.rsi(frame['close'], length=14).to_numpy())
+    assert_matches(features.ema(10), ta.ema(frame['close'], length=10).to_numpy())
+    assert_matches(features.atr(14), ta.atr(frame['high'], frame['low'], frame['close'], length=14).to_numpy())
+
+
+def test_stores_of_the_same_candles_share_indicators():
+    clear_cache()
+    ohlcv = random_ohlcv(300)
+    first = FeatureStore(ohlcv)
+    second = FeatureStore(ohlcv.tolist())
+    
+    assert first.key == second.key
+    assert second.rsi(14) is first.rsi(14)
+
+
+def test_moving_open_candle_changes_the_key():
+    ohlcv = random_ohlcv(300)
+    moved = ohlcv.copy()
+    moved[-1, 2] *= 1.01  # Open candle makes a new high, same close
+    appended = np.vstack([ohlcv[1:], ohlcv[-1:] + [3_600_000.0, 0, 0, 0, 0, 0]])
+    
+    keys = {FeatureStore(ohlcv).key, FeatureStore(moved).key, FeatureStore(appended).key}
+    
+    assert len(keys) == 3
+    assert not np.array_equal(FeatureStore(moved).atr(14), FeatureStore(ohlcv).atr(14))
+
+
+def test_changed_middle_candle_changes_the_key():
+    clear_cache()
+    ohlcv = random_ohlcv(300)
+    corrected = ohlcv.copy()
+    corrected[150, 4] *= 1.05  # Same length and ends, different close in the middle
+    
+    original, changed = FeatureStore(ohlcv), FeatureStore(corrected)
+    
+    assert original.key != changed.key
+    assert not np.array_equal(original.rsi(14), changed.rsi(14), equal_nan=True)
+    np.testing.assert_array_equal(changed.rsi(14), FeatureStore(corrected.tolist()).rsi(14))
@@ -0,0 +1,105 @@
+"""
+Tests for the segmented history log and its rollups
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from src.history import HistoryLog, downsample
+
+
+START = datetime(2024, 1, 1)
+
+
+def snapshots(n, start=START, step=timedelta(hours=12)):
+    return [{'timestamp': (start + i * step).isoformat(), 'btc_price': 42_000.0 + i, 'bots': {'RoboQuant': 1000.0 + i}}
+            for i in range(n)]
+
+
+def files(directory):
+    return sorted(os.listdir(directory))
+
+
+def test_append_and_read(tmp_path):
+    log = HistoryLog(str(tmp_path / 'history'), clock=lambda: START)
+    history = snapshots(5)
+    
+    assert log.read() == [] and log.last() is None
+    log.append(history[0])
+    log.extend(history[1:])
+    
+    assert log.read() == history
+    assert log.last() == history[-1]
+    assert files(log.directory) == ['segment-000001.jsonl']
+
+
+def test_full_segments_are_sealed_and_compacted(tmp_path):
+    history = snapshots(25, step=timedelta(hours=1))
+    log = HistoryLog(str(tmp_path / 'history'), segment_size=10, clock=lambda: START + timedelta(days=1))
+    
+    for snapshot in history:
+        log.append(snapshot)
+    
+    # Two sealed segments folded into a rollup, the third one still active
+    assert files(log.directory) == ['rollup-000002.jsonl', 'segment-000003.jsonl']
+    assert log.read() == history  # Everything is within raw_days: nothing downsampled
+    assert log.last() == history[-1]
+
+
+def test_compaction_downsamples_old_snapshots(tmp_path):
+    now = START + timedelta(days=400)
+    history = snapshots(800, step=timedelta(hours=12))  # 400 days, twice a day
+    log = HistoryLog(str(tmp_path / 'history'), segment_size=100, clock=lambda: now)
+    
+    log.extend(history)
+    
+    # Reading gives the rollup tiers of the compacted part plus the raw active segment
+    sealed = history[:700]
+    assert log.read() == downsample(sealed, now) + history[700:]
+
+
+def test_downsample_tiers():
+    now = START + timedelta(days=400)
+    history = snapshots(24 * 400, step=timedelta(hours=1))
+    
+    result = downsample(history, now, raw_days=30, daily_days=365)
+    
+    times = [datetime.fromisoformat(s['timestamp']) for s in result]
+    raw = [t for t in times if t >= now - timedelta(days=30)]
+    daily = [t for t in times if now - timedelta(days=365) <= t < now - timedelta(days=30)]
+    weekly = [t for t in times if t < now - timedelta(days=365)]
+    assert len(raw) == 24 * 30
+    assert len({t.date() for t in daily}) == len(daily)  # One per day, the last one of the day
+    assert all(t.hour == 23 for t in daily[:-1])
+    assert len({t.isocalendar()[:2] for t in weekly}) == len(weekly)
+    assert times == sorted(times)
+    assert downsample(result, now) == result  # Idempotent
+
+
+def test_partial_last_line_is_dropped_before_appending(tmp_path):
+    log = HistoryLog(str(tmp_path / 'history'), clock=lambda: START)
+    history = snapshots(4)
+    log.extend(history[:2])
+    path = os.path.join(log.directory, 'segment-000001.jsonl')
+    with open(path, 'a') as f:
+        f.write('{"timestamp": "2024-01-02T00:00:00", "btc_pr')  # Crash mid-write
+    
+    assert log.read() == history[:2]
+    log.extend(history[2:])
+    
+    assert log.read() == history
+    with open(path) as f:
+        assert len(f.read().splitlines()) == 4
+
+
+def test_partial_line_does_not_undercount_the_segment(tmp_path):
+    log = HistoryLog(str(tmp_path / 'history'), segment_size=3, clock=lambda: START)
+    history = snapshots(4)
+    log.extend(history[:2])
+    with open(os.path.join(log.directory, 'segment-000001.jsonl'), 'a') as f:
+        f.write('{"timest')
+    
+    log.extend(history[2:])
+    
+    assert log.read() == history
+    assert files(log.directory)[-1] == 'segment-000002.jsonl'  # Sealed after 3 snapshots
@@ -0,0 +1,90 @@
+"""
+Tests for the streaming RSI against the pandas-ta computation it replaced
+"""
+
+import contextlib
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.bots import RoboQuant
+from src.indicators import StreamingRSI
+
+
+def reference_rsi(closes, length=14):
+    """pandas-ta's rsi() (non-talib path), as RoboQuant computed it before streaming."""
+    close = pd.Series(closes, dtype=float)
+    negative = close.diff(1)
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+    positive_avg = positive.ewm(alpha=1 / length, min_periods=length).mean()
+    negative_avg = negative.ewm(alpha=1 / length, min_periods=length).mean()
+    return (100 * positive_avg / (positive_avg + negative_avg.abs())).to_numpy()
+
+
+def random_closes(n, seed=0):
+    """Random walk with flat runs (zero changes are an edge case of the EWM)."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.01, n)
+    steps[rng.random(n) < 0.1] = 0.0
+    return 100 * np.exp(np.cumsum(steps))
+
+
+def candles(closes, step=3_600_000):
+    return [[i * step, c, c, c, c, 1.0] for i, c in enumerate(closes)]
+
+
+def test_streaming_rsi_matches_pandas_ta_per_close():
+    closes = random_closes(3000)
+    expected = reference_rsi(closes)
+    rsi = StreamingRSI(14)
+    
+    values = np.array([rsi.update(close) for close in closes])
+    
+    np.testing.assert_array_equal(np.isnan(values), np.isnan(expected))
+    np.testing.assert_allclose(values, expected, rtol=0, atol=1e-10, equal_nan=True)
+
+
+def test_peek_does_not_consume_the_close():
+    closes = random_closes(100, seed=1)
+    rsi = StreamingRSI(14)
+    for close in closes[:-1]:
+        rsi.update(close)
+    state = rsi.get_state()
+    
+    peeked = rsi.peek(closes[-1])
+    
+    assert rsi.get_state() == state
+    assert abs(peeked - reference_rsi(closes)[-1]) < 1e-10
+
+
+def test_roboquant_runs_with_persisted_state_match_full_recomputation():
+    closes = random_closes(600, seed=2)
+    rows = candles(closes)
+    state = {}
+    for end in range(100, len(rows) + 1, 7):
+        bot = RoboQuant()
+        bot.load_state(json.loads(json.dumps(state)))  # Through data.json
+        window = rows[end - 100:end]
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot.decide(closes[end - 1], window)
+        state = bot.get_state()
+        
+        # Closed candles come from the whole history; the open one is only peeked at
+        expected = reference_rsi(closes[:end])[-1]
+        assert abs(bot.rsi['1h'].peek(closes[end - 1]) - expected) < 1e-10
+
+
+def test_batch_roboquant_decides_like_the_pandas_ta_version():
+    closes = random_closes(2000, seed=3)
+    rows = candles(closes)
+    bot = RoboQuant(streaming=False)
+    for end in range(100, len(rows) + 1, 5):
+        window = rows[end - 100:end]
+        value = reference_rsi(closes[end - 100:end])[-1]
+        expected = "BUY" if value < 30 else "SELL" if value > 70 else "HOLD"
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert bot.decide(closes[end - 1], window) == expected
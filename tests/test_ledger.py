@@ -0,0 +1,118 @@
+"""
+Tests for the vectorized PortfolioLedger against VirtualWallet
+"""
+
+import contextlib
+import io
+
+import numpy as np
+
+from src.backtest import max_drawdown, simulate, simulate_batch
+from src.bots import SIGNAL_CODES
+from src.ledger import PortfolioLedger
+from src.runner import execute_decision
+from src.wallet import VirtualWallet
+
+DECISIONS = {code: name for name, code in SIGNAL_CODES.items()}
+
+
+def test_random_trades_match_virtual_wallets():
+    rng = np.random.default_rng(0)
+    n = 50
+    wallets = [
+        VirtualWallet(initial_usd=float(rng.uniform(5, 5000)), fee_rate=float(rng.choice([0.0, 0.001, 0.0025])),
+                      slippage_rate=float(rng.choice([0.0, 0.0005, 0.002])))
+        for _ in range(n)
+    ]
+    ledger = PortfolioLedger.from_wallets(wallets, symbols=['BTC'])
+    
+    price = 40_000.0
+    for _ in range(500):
+        price *= float(np.exp(rng.normal(0, 0.02)))
+        codes = rng.choice([-1, 0, 1], size=n, p=[0.3, 0.4, 0.3]).astype(np.int8)
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = [execute_decision(w, DECISIONS[int(c)], price) for w, c in zip(wallets, codes)]
+        bought, sold = ledger.apply(codes, 'BTC', price)
+        
+        np.testing.assert_array_equal(bought | sold, expected)
+        np.testing.assert_allclose(ledger.usd_balance, [w.usd_balance for w in wallets], rtol=1e-12)
+        np.testing.assert_allclose(ledger.holdings[:, 0], [w.holdings.get('BTC', 0) for w in wallets],
+                                   rtol=1e-12, atol=1e-18)
+    
+    np.testing.assert_allclose(ledger.get_total_value({'BTC': price}),
+                               [w.get_total_value({'BTC': price}) for w in wallets], rtol=1e-12)
+    assert ledger.trades.sum() > 0
+
+
+def test_fees_and_slippage_are_charged_like_virtual_wallet():
+    wallet = VirtualWallet(fee_rate=0.01, slippage_rate=0.02)
+    ledger = PortfolioLedger(1, fee_rate=0.01, slippage_rate=0.02)
+    with contextlib.redirect_stdout(io.StringIO()):
+        wallet.buy('BTC', 100.0, 900.0)
+        wallet.sell('BTC', 100.0)
+    ledger.apply([SIGNAL_CODES["BUY"]], 'BTC', 100.0)
+    ledger.apply([SIGNAL_CODES["SELL"]], 'BTC', 100.0)
+    
+    # $900 at 102 less 1%, sold at 98 less 1%
+    expected = 100.0 + 900.0 * 0.99 / 102.0 * 98.0 * 0.99
+    assert abs(wallet.usd_balance - expected) < 1e-9
+    assert abs(ledger.usd_balance[0] - expected) < 1e-9
+    assert list(ledger.trades) == [2]
+
+
+def test_from_wallets_adds_unlisted_symbols():
+    a = VirtualWallet()
+    a.holdings = {'ETH': 2.0}
+    b = VirtualWallet()
+    b.holdings = {'BTC': 0.5, 'SOL': 3.0}
+    
+    ledger = PortfolioLedger.from_wallets([a, b], symbols=['BTC'])
+    
+    assert ledger.symbols == ['BTC', 'ETH', 'SOL']
+    np.testing.assert_array_equal(ledger.holdings, [[0.0, 2.0, 0.0], [0.5, 0.0, 3.0]])
+    assert ledger.to_wallet(1).holdings == {'BTC': 0.5, 'SOL': 3.0}
+
+
+def test_write_back_keeps_orders_and_other_holdings():
+    wallet = VirtualWallet()
+    wallet.holdings = {'BTC': 0.01, 'ETH': 1.0}
+    wallet.place_order('BTC', 'stop_loss', 90_000.0)
+    wallet.place_order('ETH', 'stop_loss', 3_000.0)
+    wallet.place_order('BTC', 'limit_buy', 80_000.0, 100.0)
+    ledger = PortfolioLedger.from_wallets([wallet])
+    
+    ledger.apply([SIGNAL_CODES["SELL"]], 'BTC', 100_000.0)
+    ledger.write_back(wallet, 0)
+    
+    assert wallet.holdings == {'BTC': 0.0, 'ETH': 1.0}
+    assert wallet.usd_balance > 1000.0
+    # The closed BTC position loses its stop-loss; other orders stay
+    assert [(order.symbol, order.kind) for order in wallet.open_orders()] == [('ETH', 'stop_loss'), ('BTC', 'limit_buy')]
+
+
+def test_write_back_keeps_orders_of_open_positions():
+    wallet = VirtualWallet()
+    wallet.holdings = {'BTC': 0.01}
+    wallet.place_order('BTC', 'take_profit', 120_000.0)
+    ledger = PortfolioLedger.from_wallets([wallet])
+    
+    ledger.apply([SIGNAL_CODES["HOLD"]], 'BTC', 100_000.0)
+    ledger.write_back(wallet, 0)
+    
+    assert len(wallet.open_orders()) == 1
+
+
+def test_simulate_batch_matches_simulate_per_path():
+    rng = np.random.default_rng(1)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.01, 700)))
+    signals = rng.choice([-1, 0, 1], size=(700, 40), p=[0.05, 0.9, 0.05]).astype(np.int8)
+    wallet = VirtualWallet(initial_usd=500.0)
+    wallet.holdings = {'BTC': 0.01}
+    
+    result = simulate_batch(close, signals, wallet=wallet, chunk_size=64)
+    
+    for path in range(signals.shape[1]):
+        expected = simulate(close, signals[:, path], wallet=wallet)
+        assert np.isclose(result['final_value'][path], expected['final_value'], rtol=1e-10, atol=0)
+        assert result['trades'][path] == expected['trades']
+        assert np.isclose(result['max_drawdown'][path], max_drawdown(expected['equity']), rtol=1e-10, atol=1e-12)
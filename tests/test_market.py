@@ -0,0 +1,61 @@
+"""
+Tests for the shared market-data client and its batched requests
+"""
+
+from src.fakes import FakeExchange
+from src.market import MarketDataClient, held_symbols
+from src.store import CandleStore
+from src.utils import get_historical_prices, get_prices
+
+
+def test_held_symbols_always_includes_btc():
+    assert held_symbols([{}, {}]) == ['BTC/USDT']
+
+
+def test_held_symbols_skips_closed_positions_and_deduplicates():
+    holdings = [{'ETH': 0.5, 'SOL': 0.0}, {'ETH': 1.0, 'BTC': 0.1}, {'ADA': 10}]
+    assert held_symbols(holdings) == ['ADA/USDT', 'BTC/USDT', 'ETH/USDT']
+    assert held_symbols([{'ETH': 1}], quote='EUR', base_symbols=()) == ['ETH/EUR']
+
+
+def test_get_prices_uses_one_tickers_request():
+    exchange = FakeExchange(prices={'BTC/USDT': 100_000.0, 'ETH/USDT': 3_000.0, 'SOL/USDT': 150.0})
+    client = MarketDataClient(exchange)
+    
+    prices = get_prices(['BTC/USDT', 'ETH/USDT', 'SOL/USDT'], client=client)
+    
+    assert prices == {'BTC': 100_000.0, 'ETH': 3_000.0, 'SOL': 150.0}
+    assert exchange.calls == {'fetch_tickers': 1}
+
+
+def test_client_reuses_one_exchange_session():
+    exchange = FakeExchange()
+    client = MarketDataClient(exchange)
+    
+    client.get_price('BTC/USDT')
+    client.get_prices(['BTC/USDT'])
+    client.get_ohlcv('BTC/USDT', '1h', limit=10)
+    
+    assert client.exchange is exchange
+    assert exchange.calls == {'fetch_ticker': 1, 'fetch_tickers': 1, 'fetch_ohlcv': 1}
+
+
+def test_get_prices_returns_empty_dict_on_error():
+    client = MarketDataClient(FakeExchange(prices={'BTC/USDT': 1.0}))
+    
+    assert get_prices(['DOGE/USDT'], client=client) == {}
+
+
+def test_historical_prices_top_up_only_new_candles(tmp_path):
+    exchange = FakeExchange()
+    client = MarketDataClient(exchange)
+    store = CandleStore(str(tmp_path))
+    
+    first = get_historical_prices(limit=100, store=store, client=client)
+    exchange.now_ms += 3 * 3_600_000
+    second = get_historical_prices(limit=100, store=store, client=client)
+    
+    assert len(first) == len(second) == 100
+    assert second[-1][0] - first[-1][0] == 3 * 3_600_000
+    assert store.count('BTC/USDT', '1h') == 103
+    assert exchange.calls['fetch_ohlcv'] == 2
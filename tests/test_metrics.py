@@ -0,0 +1,95 @@
+"""
+Tests for run metrics: phases, bot decision hooks and the output files
+"""
+
+import json
+import pstats
+
+from src.bots import TradingBot
+from src.metrics import PROMETHEUS_PREFIX, RunMetrics
+
+
+class EchoBot(TradingBot):
+    def __init__(self, name):
+        super().__init__(name)
+    
+    def decide(self, current_price, historical_data):
+        return "HOLD"
+
+
+def test_from_env_defaults(monkeypatch):
+    for name in ('METRICS_DIR', 'METRICS_MEMORY', 'PROFILE'):
+        monkeypatch.delenv(name, raising=False)
+    
+    metrics = RunMetrics.from_env()
+    
+    assert (metrics.directory, metrics.memory, metrics.profile) == ('metrics', False, False)
+    monkeypatch.setenv('METRICS_MEMORY', '1')
+    monkeypatch.setenv('METRICS_DIR', '')
+    assert RunMetrics.from_env().memory is True
+    assert RunMetrics.from_env().directory is None
+
+
+def test_phase_records_times_and_memory_only_when_enabled():
+    metrics = RunMetrics(directory=None, memory=True)
+    with metrics.session():
+        with metrics.phase('load'):
+            data = [0] * 100_000
+        with metrics.phase('empty'):
+            pass
+    plain = RunMetrics(directory=None)
+    with plain.session(), plain.phase('load'):
+        pass
+    
+    assert set(metrics.phases) == {'load', 'empty'}
+    assert metrics.phases['load']['wall_seconds'] >= 0
+    assert metrics.phases['load']['peak_memory_bytes'] >= 8 * len(data)
+    assert metrics.totals['peak_memory_bytes'] == max(record['peak_memory_bytes'] for record in metrics.phases.values())
+    assert 'peak_memory_bytes' not in plain.phases['load']
+
+
+def test_bot_hook_times_decisions_during_the_session():
+    metrics = RunMetrics(directory=None)
+    bots = [EchoBot('A'), EchoBot('B')]
+    
+    with metrics.session():
+        for bot in bots:
+            bot.decide(100.0, [])
+    EchoBot('C').decide(100.0, [])  # After the session: not recorded
+    
+    assert set(metrics.bots) == {'A', 'B'}
+    assert all(set(record) == {'wall_seconds', 'cpu_seconds'} for record in metrics.bots.values())
+    assert metrics.bot_hook not in TradingBot.decide_hooks
+
+
+def test_prometheus_output():
+    metrics = RunMetrics(directory=None)
+    metrics.totals = {'wall_seconds': 1.5, 'cpu_seconds': 0.5}
+    metrics.phases = {'decide': {'wall_seconds': 0.25, 'cpu_seconds': 0.125}}
+    metrics.bots = {'RoboQuant': {'wall_seconds': 0.0625, 'cpu_seconds': 0.03125}}
+    
+    lines = metrics.to_prometheus().splitlines()
+    
+    name = f"{PROMETHEUS_PREFIX}_phase_wall_seconds"
+    assert f"# HELP {name} Wall time per run phase" in lines
+    assert f"# TYPE {name} gauge" in lines
+    assert f'{name}{{phase="decide"}} 0.25' in lines
+    assert f'{PROMETHEUS_PREFIX}_bot_decide_cpu_seconds{{bot="RoboQuant"}} 0.03125' in lines
+    assert f"{PROMETHEUS_PREFIX}_run_wall_seconds 1.5" in lines
+    # Families without samples are left out
+    assert not any('peak_memory' in line or 'timestamp' in line for line in lines)
+
+
+def test_session_writes_the_files(tmp_path):
+    metrics = RunMetrics(directory=str(tmp_path / 'metrics'), profile=True)
+    
+    with metrics.session():
+        with metrics.phase('work'):
+            sum(range(1000))
+    
+    with open(tmp_path / 'metrics' / 'metrics.json') as f:
+        assert json.load(f)['phases']['work']['cpu_seconds'] >= 0
+    with open(tmp_path / 'metrics' / 'metrics.prom') as f:
+        assert f.read() == metrics.to_prometheus()
+    assert pstats.Stats(str(tmp_path / 'metrics' / 'profile.pstats')).total_calls > 0
+    assert sorted(p.name for p in (tmp_path / 'metrics').iterdir()) == ['metrics.json', 'metrics.prom', 'profile.pstats']
@@ -0,0 +1,63 @@
+"""
+Tests for the Monte Carlo simulation against scalar backtests
+"""
+
+import numpy as np
+import pytest
+
+from src.backtest import backtest, max_drawdown
+from src.bots import TradingBot, WhaleHunter
+from src.montecarlo import monte_carlo
+
+
+class ReplayBot(TradingBot):
+    """Scalar bot whose signals() are a fixed decision series."""
+    
+    def __init__(self, signals):
+        super().__init__("Replay")
+        self.series = signals
+    
+    def decide(self, current_price, historical_data):
+        return "HOLD"
+    
+    def signals(self, ohlcv):
+        return self.series[:len(ohlcv)]
+
+
+def random_ohlcv(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 42_000 * np.exp(np.cumsum(rng.normal(0, 0.006, n)))
+    return np.column_stack([np.arange(n) * 3_600_000.0, close, close, close, close, np.ones(n)])
+
+
+def sampled_signals(bot, seed, n_paths, n_candles, chunk_size):
+    """Decisions monte_carlo() draws for its first block of paths, in the same chunks."""
+    block_seed = np.random.SeedSequence(seed).spawn(1)[0]
+    sample = bot.signal_sampler(n_paths, np.random.default_rng(block_seed))
+    return np.concatenate([sample(min(chunk_size, n_candles - start)) for start in range(0, n_candles, chunk_size)])
+
+
+@pytest.mark.parametrize('seed', [0, 7, 42])
+def test_single_path_equals_scalar_backtest(seed):
+    ohlcv = random_ohlcv(1_000)
+    
+    result = monte_carlo(WhaleHunter(), ohlcv, n_paths=1, seed=seed, chunk_size=64)
+    signals = sampled_signals(WhaleHunter(), seed, 1, len(ohlcv), 64)[:, 0]
+    expected = backtest(ReplayBot(signals), ohlcv)
+    
+    assert expected['trades'] > 0
+    assert result['trades'][0] == expected['trades']
+    assert result['final_value'][0] == pytest.approx(expected['final_value'], rel=1e-9)
+    assert result['max_drawdown'][0] == pytest.approx(max_drawdown(expected['equity']), rel=1e-9, abs=1e-12)
+
+
+def test_every_path_equals_its_scalar_backtest():
+    ohlcv = random_ohlcv(500, seed=1)
+    
+    result = monte_carlo(WhaleHunter(), ohlcv, n_paths=50, seed=3, chunk_size=100)
+    signals = sampled_signals(WhaleHunter(), 3, 50, len(ohlcv), 100)
+    
+    for path in range(50):
+        expected = backtest(ReplayBot(signals[:, path]), ohlcv)
+        assert result['trades'][path] == expected['trades']
+        assert result['final_value'][path] == pytest.approx(expected['final_value'], rel=1e-9)
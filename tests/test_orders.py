@@ -0,0 +1,209 @@
+"""
+Tests for the resting order book and its wiring into runs and backtests
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from src.backtest import simulate, simulate_orders
+from src.orders import OrderBook
+from src.runner import process_orders
+from src.wallet import VirtualWallet
+
+
+def candle(open_, high, low, close, timestamp=0):
+    return [timestamp, open_, high, low, close, 1.0]
+
+
+def quiet(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def test_up_candle_fills_the_low_before_the_high():
+    wallet = VirtualWallet(fee_rate=0.0, slippage_rate=0.0)
+    buy = wallet.place_order('BTC', 'limit_buy', 95.0, 500.0)
+    take_profit = wallet.place_order('BTC', 'take_profit', 110.0)
+    
+    # open -> low -> high: the buy fills first, then the take-profit sells it
+    fills = wallet.process_candle('BTC', candle(100.0, 112.0, 94.0, 105.0))
+    
+    assert fills == [buy, take_profit]
+    assert wallet.holdings['BTC'] == 0
+    assert wallet.usd_balance == pytest.approx(500.0 + 500.0 / 95.0 * 110.0)
+
+
+def test_down_candle_fills_the_high_before_the_low():
+    wallet = VirtualWallet(fee_rate=0.0, slippage_rate=0.0)
+    wallet.holdings['BTC'] = 1.0
+    buy = wallet.place_order('BTC', 'limit_buy', 95.0, 500.0)
+    take_profit = wallet.place_order('BTC', 'take_profit', 110.0)
+    
+    # open -> high -> low: the position is sold before the buy fills
+    fills = wallet.process_candle('BTC', candle(100.0, 112.0, 94.0, 96.0))
+    
+    assert fills == [take_profit, buy]
+    assert wallet.holdings['BTC'] == pytest.approx(500.0 / 95.0)
+
+
+def test_untouched_levels_stay_open():
+    wallet = VirtualWallet()
+    wallet.holdings['BTC'] = 1.0
+    stop = wallet.place_order('BTC', 'stop_loss', 90.0)
+    
+    assert wallet.process_candle('BTC', candle(100.0, 101.0, 90.5, 99.0)) == []
+    assert wallet.open_orders() == [stop]
+    assert wallet.process_candle('ETH', candle(100.0, 101.0, 80.0, 99.0)) == []
+
+
+def test_gap_through_the_level_fills_at_the_open():
+    wallet = VirtualWallet(fee_rate=0.0, slippage_rate=0.001)
+    wallet.holdings['BTC'] = 1.0
+    stop = wallet.place_order('BTC', 'stop_loss', 90.0)
+    buyer = VirtualWallet(fee_rate=0.0, slippage_rate=0.0, order_book=wallet.order_book)
+    buy = buyer.place_order('BTC', 'limit_buy', 95.0, 100.0)
+    
+    wallet.process_candle('BTC', candle(80.0, 85.0, 78.0, 84.0))
+    
+    # Stop-losses become market orders and pay slippage; limits fill at the better open
+    assert stop.fill_price == pytest.approx(80.0 * (1 - 0.001))
+    assert buy.fill_price == 80.0
+    assert buyer.holdings['BTC'] == pytest.approx(100.0 / 80.0)
+
+
+def test_orders_the_wallet_cannot_cover_are_rejected():
+    wallet = VirtualWallet(initial_usd=100.0)
+    buy = wallet.place_order('BTC', 'limit_buy', 95.0, 500.0)
+    sell = wallet.place_order('BTC', 'limit_sell', 105.0, 1.0)
+    
+    assert wallet.process_candle('BTC', candle(100.0, 110.0, 90.0, 100.0)) == []
+    assert (buy.status, sell.status) == ('rejected', 'rejected')
+    assert wallet.usd_balance == 100.0
+    assert wallet.open_orders() == []
+
+
+def test_cancelled_orders_never_fill():
+    book = OrderBook()
+    wallet = VirtualWallet(order_book=book)
+    other = VirtualWallet(order_book=book)
+    order = wallet.place_order('BTC', 'limit_buy', 95.0, 100.0)
+    
+    assert not other.cancel_order(order.id)  # Not its order
+    assert wallet.cancel_order(order.id)
+    assert not wallet.cancel_order(order.id)
+    assert order.status == 'cancelled'
+    assert wallet.process_candle('BTC', candle(100.0, 100.0, 90.0, 95.0)) == []
+    assert wallet.usd_balance == 1000.0
+
+
+def test_mass_cancellation_compacts_the_heaps():
+    book = OrderBook()
+    wallet = VirtualWallet(initial_usd=1e9, order_book=book)
+    orders = [wallet.place_order('BTC', 'limit_buy', 50.0 + i * 0.01, 1.0) for i in range(3000)]
+    for order in orders[:2000]:
+        wallet.cancel_order(order.id)
+    
+    heap = book._heaps[('BTC', 'below')]
+    assert len(heap) < 3000  # Rebuilt once the dead entries outnumbered the live ones
+    fills = wallet.process_candle('BTC', candle(100.0, 100.0, 0.0, 50.0))
+    assert sorted(order.id for order in fills) == sorted(order.id for order in orders[2000:])
+
+
+def test_orders_are_rebuilt_from_state():
+    wallet = VirtualWallet(fee_rate=0.0, slippage_rate=0.0)
+    wallet.holdings['BTC'] = 2.0
+    wallet.place_order('BTC', 'stop_loss', 90.0, 1.0)
+    wallet.place_order('BTC', 'take_profit', 120.0)
+    wallet.place_order('BTC', 'limit_buy', 80.0, 200.0)
+    
+    restored = VirtualWallet(fee_rate=0.0, slippage_rate=0.0)
+    restored.load_state(wallet.get_state())
+    restored.load_state(wallet.get_state())  # Loading again replaces, not duplicates
+    
+    assert [order.get_state() for order in restored.open_orders()] == wallet.get_state()['orders']
+    fills = restored.process_candle('BTC', candle(100.0, 100.0, 85.0, 86.0))
+    assert [order.kind for order in fills] == ['stop_loss']
+    assert restored.holdings['BTC'] == pytest.approx(1.0)
+
+
+def test_closing_a_position_cancels_its_protective_orders():
+    wallet = VirtualWallet()
+    wallet.holdings = {'BTC': 1.0, 'ETH': 1.0}
+    wallet.place_order('BTC', 'stop_loss', 90.0)
+    wallet.place_order('BTC', 'take_profit', 120.0)
+    wallet.place_order('ETH', 'stop_loss', 2_000.0)
+    buy = wallet.place_order('BTC', 'limit_buy', 80.0, 100.0)
+    
+    quiet(wallet.sell, 'BTC', 100.0, 0.5)  # Partial sale keeps them
+    assert len(wallet.open_orders()) == 4
+    quiet(wallet.sell, 'BTC', 100.0)
+    
+    assert [order.kind for order in wallet.open_orders()] == ['stop_loss', 'limit_buy']
+    assert wallet.open_orders()[0].symbol == 'ETH'
+    assert buy.status == 'open'
+
+
+def test_filled_stop_loss_cancels_the_take_profit():
+    wallet = VirtualWallet()
+    wallet.holdings['BTC'] = 1.0
+    wallet.place_order('BTC', 'stop_loss', 90.0)
+    take_profit = wallet.place_order('BTC', 'take_profit', 120.0)
+    
+    wallet.process_candle('BTC', candle(100.0, 100.0, 85.0, 88.0))
+    
+    assert take_profit.status == 'cancelled'
+    assert wallet.open_orders() == []
+    # The next position is not closed by the old take-profit
+    quiet(wallet.buy, 'BTC', 100.0, 500.0)
+    assert wallet.process_candle('BTC', candle(100.0, 130.0, 100.0, 125.0)) == []
+
+
+def test_process_orders_runs_only_closed_candles_once():
+    book = OrderBook()
+    wallets = {'A': VirtualWallet(order_book=book)}
+    wallets['A'].place_order('BTC', 'limit_buy', 95.0, 100.0)
+    candles = [candle(100.0, 100.0, 99.0, 99.5, timestamp=t) for t in (0, 1, 2)]
+    candles.append(candle(100.0, 100.0, 90.0, 92.0, timestamp=3))  # Still open
+    
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert process_orders(book, wallets, candles) == 2
+        assert len(book) == 1
+        
+        # Next run: the candle that was open has closed and a new one opened
+        candles.append(candle(92.0, 93.0, 91.0, 92.0, timestamp=4))
+        assert process_orders(book, wallets, candles, last_timestamp=2) == 3
+        assert process_orders(book, wallets, candles, last_timestamp=3) == 3
+    
+    assert len(book) == 0
+    assert output.getvalue().count("🎯 A: limit_buy BTC filled @ $95.00") == 1
+
+
+def test_backtest_loop_triggers_orders_before_signals():
+    rng = np.random.default_rng(0)
+    n = 500
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    ohlcv = np.column_stack([np.arange(n), close, close * 1.01, close * 0.99, close, np.ones(n)])
+    signals = np.zeros(n, dtype=np.int8)
+    
+    wallet = VirtualWallet()
+    wallet.holdings['BTC'] = 5.0
+    wallet.place_order('BTC', 'stop_loss', close.min() * 1.05)
+    
+    result = simulate_orders(ohlcv, signals, wallet)
+    
+    assert result['fills'] == 1
+    assert result['holdings'][-1] == 0
+    assert result['open_orders'] == []
+    assert len(wallet.open_orders()) == 1  # Not modified
+    
+    # Without orders it matches the run-based simulation
+    plain = VirtualWallet()
+    signals = rng.choice([-1, 0, 1], size=n, p=[0.05, 0.9, 0.05]).astype(np.int8)
+    expected = simulate(close, signals, wallet=plain)
+    result = simulate_orders(ohlcv, signals, plain)
+    np.testing.assert_allclose(result['equity'], expected['equity'], rtol=1e-12)
+    assert result['trades'] == expected['trades']
@@ -0,0 +1,64 @@
+"""
+End-to-end tests of the offline replay: same tape and seed, same results
+"""
+
+import contextlib
+import io
+import os
+
+from src.fakes import FakeExchange
+from src.replay import RUN_INTERVAL_MS, Tape, replay
+
+
+def record_tape(runs=6, start_ms=1_700_006_400_000):
+    """Record one frame per scheduled run from a FakeExchange, as the live bot would see it."""
+    exchange = FakeExchange(prices={'BTC/USDT': 100_000.0}, seed=3, volatility=0.02)
+    tape = Tape('1h')
+    for i in range(runs):
+        exchange.now_ms = start_ms + i * RUN_INTERVAL_MS
+        candles = {'BTC/USDT': exchange.fetch_ohlcv('BTC/USDT', '1h', limit=100)}
+        prices = {'BTC/USDT': candles['BTC/USDT'][-1][4]}
+        tape.add_frame(exchange.now_ms, prices, candles)
+    return tape
+
+
+def run(tape, directory, seed):
+    """Replay into a directory, returning the decision logs printed by the runs."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        replay(tape, str(directory), seed=seed, verbose=True)
+    return output.getvalue()
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def history_files(directory):
+    root = os.path.join(directory, 'history')
+    return {name: read(os.path.join(root, name)) for name in sorted(os.listdir(root))}
+
+
+def test_same_tape_and_seed_give_identical_runs(tmp_path):
+    tape = record_tape()
+    tape_path = tmp_path / 'tape.json'
+    tape.save(tape_path)
+    
+    first = run(Tape.load(tape_path), tmp_path / 'first', seed=7)
+    second = run(Tape.load(tape_path), tmp_path / 'second', seed=7)
+    
+    assert read(tmp_path / 'first' / 'data.json') == read(tmp_path / 'second' / 'data.json')
+    assert history_files(tmp_path / 'first') == history_files(tmp_path / 'second')
+    assert history_files(tmp_path / 'first')
+    assert first == second
+    assert first.count('🤖 AgentClaude') + first.count('💾 AgentClaude') >= len(tape)
+
+
+def test_different_seeds_give_different_decisions(tmp_path):
+    tape = record_tape()
+    
+    first = run(tape, tmp_path / 'first', seed=7)
+    second = run(tape, tmp_path / 'second', seed=8)
+    
+    assert first != second
@@ -0,0 +1,107 @@
+"""
+Tests for concurrent bot decisions with per-bot deadlines
+"""
+
+import sys
+import threading
+import time
+
+from src.bots import TradingBot
+from src.runner import decide_all
+
+
+class ScriptedBot(TradingBot):
+    """Prints, waits for `delay` seconds or an event, then answers."""
+    
+    def __init__(self, name, decision="BUY", delay=0.0, release=None, timeout=None):
+        super().__init__(name, timeout=timeout)
+        self.decision = decision
+        self.delay = delay
+        self.release = release
+        self.calls = 0
+        self.finished = threading.Event()
+    
+    def decide(self, current_price, historical_data):
+        print(f"{self.name} deciding")
+        if self.release is not None:
+            self.release.wait(5)
+        time.sleep(self.delay)
+        self.calls += 1
+        print(f"{self.name} done")
+        self.finished.set()
+        return self.decision
+
+
+class FailingBot(TradingBot):
+    def decide(self, current_price, historical_data):
+        raise RuntimeError("boom")
+
+
+def test_decisions_and_logs_per_bot(capsys):
+    bots = {'A': ScriptedBot('A', "BUY"), 'B': ScriptedBot('B', "SELL"), 'C': FailingBot('C')}
+    
+    decisions, logs = decide_all(bots, 100.0, [], timeout=5.0)
+    
+    assert decisions == {'A': "BUY", 'B': "SELL", 'C': "HOLD"}
+    assert logs['A'] == "A deciding\nA done\n"
+    assert "Decision failed - boom" in logs['C']
+    assert capsys.readouterr().out == ""  # Bot output only goes to the logs
+    assert set(bots) == {'A', 'B', 'C'}
+
+
+def test_timed_out_bot_is_held_and_discarded(capsys):
+    release = threading.Event()
+    slow = ScriptedBot('Slow', "BUY", release=release)
+    bots = {'Fast': ScriptedBot('Fast', "SELL"), 'Slow': slow}
+    
+    decisions, logs = decide_all(bots, 100.0, [], timeout=0.2)
+    
+    assert decisions == {'Fast': "SELL", 'Slow': "HOLD"}
+    assert "No decision after 0.2s" in logs['Slow']
+    assert list(bots) == ['Fast']  # The caller must not persist or reuse Slow
+    
+    # The abandoned call finishes later and prints to the restored stream
+    release.set()
+    slow.finished.wait(5)
+    print("main thread")
+    assert slow.calls == 1
+    assert capsys.readouterr().out == "Slow done\nmain thread\n"
+
+
+def test_zero_bot_timeout_is_not_the_default():
+    release = threading.Event()
+    bot = ScriptedBot('Impatient', "BUY", release=release, timeout=0.0)
+    
+    started = time.monotonic()
+    decisions, _ = decide_all({'Impatient': bot}, 100.0, [], timeout=30.0)
+    release.set()
+    bot.finished.wait(5)
+    
+    assert decisions == {'Impatient': "HOLD"}
+    assert time.monotonic() - started < 5.0
+
+
+def test_other_threads_write_through(capsys):
+    release = threading.Event()
+    bots = {'A': ScriptedBot('A', release=release)}
+    
+    def other():
+        print("from another thread")
+        release.set()
+    
+    thread = threading.Thread(target=other)
+    thread.start()
+    decisions, logs = decide_all(bots, 100.0, [], timeout=5.0)
+    thread.join()
+    
+    assert decisions == {'A': "BUY"}
+    assert "from another thread" not in logs['A']
+    assert capsys.readouterr().out == "from another thread\n"
+
+
+def test_stdout_is_restored():
+    original = sys.stdout
+    
+    decide_all({'A': ScriptedBot('A'), 'B': FailingBot('B')}, 100.0, [], timeout=5.0)
+    
+    assert sys.stdout is original
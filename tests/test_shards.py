@@ -0,0 +1,108 @@
+"""
+Tests for sharded state: concurrent runners and incremental merges
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+from datetime import datetime, timedelta
+
+from src.fakes import FakeAnthropic, FakeExchange, SimulatedClock
+from src.history import HistoryLog
+from src.market import MarketDataClient
+from src.shards import ShardStore, merge, run_shards
+
+
+NAMES = ['AgentClaude', 'RoboQuant', 'WhaleHunter']
+
+
+def run_cycles(root, cycles, seed=0, start=datetime(2024, 1, 1)):
+    """`cycles` runs of every strategy, 12 simulated hours apart (also a process target)."""
+    exchange = FakeExchange(seed=seed, volatility=0.01)
+    clock = SimulatedClock(start, exchange=exchange)
+    client = MarketDataClient(exchange)
+    llm_client = FakeAnthropic(seed=seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(cycles):
+            run_shards(NAMES, root=root, market_client=client, llm_client=llm_client, clock=clock.now, seed=seed,
+                       candle_root=os.path.join(root, 'candles'))
+            clock.sleep(timedelta(hours=12).total_seconds())
+    return clock.now()
+
+
+def test_concurrent_runners_lose_no_updates(tmp_path):
+    root = str(tmp_path / 'shards')
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=run_cycles, args=(root, 5, seed)) for seed in (1, 2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+    
+    shards = ShardStore(root)
+    assert shards.names() == NAMES
+    for name in NAMES:
+        with open(shards.state_file(name)) as f:
+            state = json.load(f)
+        # Every cycle of both runners is in the state and history of every shard
+        assert state['analytics'][name]['count'] == 10
+        assert len(shards.history(name).read()) == 10
+
+
+def test_incremental_merge_equals_full_merge(tmp_path):
+    root = str(tmp_path / 'shards')
+    incremental = (str(tmp_path / 'data.json'), str(tmp_path / 'history'))
+    full = (str(tmp_path / 'full.json'), str(tmp_path / 'full_history'))
+    
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        end = run_cycles(root, 3)
+        merge(root, *incremental)
+        run_cycles(root, 2, start=end)
+        merge(root, *incremental)
+        merge(root, *incremental)  # Nothing new: nothing appended
+        board = merge(root, *full)
+    
+    merges = [line for line in output.getvalue().splitlines() if line.startswith('🔀')]
+    assert [line.split('(')[1] for line in merges] == [
+        '3 new snapshots)', '2 new snapshots)', '0 new snapshots)', '5 new snapshots)'
+    ]
+    history = HistoryLog(incremental[1]).read()
+    assert len(history) == 5
+    assert history == HistoryLog(full[1]).read()
+    assert set(history[-1]['bots']) == set(NAMES)
+    with open(incremental[0]) as f:
+        assert json.load(f)['leaderboard'] == board
+
+
+def test_merge_recovers_from_an_interrupted_swap(tmp_path):
+    root = str(tmp_path / 'shards')
+    history_dir = str(tmp_path / 'history')
+    for leftover in (history_dir + '.old', history_dir + '.tmp'):
+        os.makedirs(leftover)
+        with open(os.path.join(leftover, 'segment-000001.jsonl'), 'w') as f:
+            f.write('{"timestamp": "2020-01-01T00:00:00", "btc_price": 1.0, "bots": {}}\n')
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_cycles(root, 2)
+        merge(root, str(tmp_path / 'data.json'), history_dir)
+    
+    assert len(HistoryLog(history_dir).read()) == 2
+    assert not os.path.exists(history_dir + '.old') and not os.path.exists(history_dir + '.tmp')
+
+
+def test_merge_skips_unreadable_shards(tmp_path, capsys):
+    root = str(tmp_path / 'shards')
+    run_cycles(root, 2)
+    with open(ShardStore(root).state_file('WhaleHunter'), 'w') as f:
+        f.write('{"bots": ')  # Truncated by hand
+    
+    board = merge(root, str(tmp_path / 'data.json'), str(tmp_path / 'history'))
+    
+    out = capsys.readouterr().out
+    assert "Skipping shard WhaleHunter" in out
+    assert {row['name'] for row in board} == {'AgentClaude', 'RoboQuant'}
+    assert "🥈 2." in out and "🥉" not in out
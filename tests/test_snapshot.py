@@ -0,0 +1,93 @@
+"""
+Tests for binary state snapshots and their lazy history
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.daemon import TradingDaemon
+from src.fakes import FakeAnthropic, FakeExchange, SimulatedClock
+from src.history import HistoryLog
+from src.market import MarketDataClient
+from src.snapshot import SnapshotHistory, read_snapshot, to_snapshots
+from src.utils import load_state, save_state
+
+
+BOTS = ['AgentClaude', 'RoboQuant', 'WhaleHunter']
+
+
+def make_state(n):
+    start = datetime(2024, 1, 1)
+    history = [
+        {
+            'timestamp': (start + timedelta(hours=12 * i)).isoformat(),
+            'btc_price': 42_000.0 + i,
+            'bots': {name: 1000.0 + i * j for j, name in enumerate(BOTS)}
+        }
+        for i in range(n)
+    ]
+    return {'bots': {name: {'usd_balance': 1000.0, 'holdings': {}} for name in BOTS}, 'strategies': {},
+            'history': history}
+
+
+def test_history_is_loaded_lazily(tmp_path):
+    path = str(tmp_path / 'data.snap')
+    state = make_state(25_000)
+    save_state(state, path)
+    
+    loaded = load_state(path, names=BOTS)
+    history = loaded['history']
+    assert isinstance(history, SnapshotHistory)
+    assert isinstance(history.records, np.memmap)
+    assert len(history) == 25_000
+    assert history[0] == state['history'][0]
+    assert history[-1] == state['history'][-1]
+    assert list(history[100:200]) == state['history'][100:200]
+    assert list(history) == state['history']
+
+
+def test_history_survives_a_save(tmp_path):
+    path = str(tmp_path / 'data.snap')
+    save_state(make_state(1_000), path)
+    loaded = load_state(path, names=BOTS)
+    loaded['bots']['RoboQuant']['usd_balance'] = 500.0
+    
+    save_state(loaded, str(tmp_path / 'copy.snap'))
+    
+    original = read_snapshot(path)
+    copy = read_snapshot(str(tmp_path / 'copy.snap'))
+    assert np.array_equal(copy['history'], original['history'])
+    assert copy['state']['bots']['RoboQuant']['usd_balance'] == 500.0
+
+
+def test_daemon_keeps_snapshots_it_cannot_migrate(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = make_state(100)
+    save_state(state, 'data.snap')
+    HistoryLog().append(state['history'][0])  # A log that already has history
+    
+    exchange = FakeExchange(volatility=0.003)
+    clock = SimulatedClock(datetime(2024, 3, 1, 0, 0, 30), exchange=exchange)
+    daemon = TradingDaemon(MarketDataClient(exchange), FakeAnthropic(), timeframe='1m', clock=clock.now,
+                           sleep=clock.sleep, seed=1, chart=False, metrics_dir=None, state_file='data.snap')
+    daemon.run(max_ticks=2)
+    
+    saved = read_snapshot('data.snap')
+    assert to_snapshots(saved['history'], saved['bots']) == state['history']
+    assert len(HistoryLog().read()) == 3
+
+
+def test_daemon_migrates_into_an_empty_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = make_state(100)
+    save_state(state, 'data.snap')
+    
+    exchange = FakeExchange(volatility=0.003)
+    clock = SimulatedClock(datetime(2024, 3, 1, 0, 0, 30), exchange=exchange)
+    daemon = TradingDaemon(MarketDataClient(exchange), FakeAnthropic(), timeframe='1m', clock=clock.now,
+                           sleep=clock.sleep, seed=1, chart=False, metrics_dir=None, state_file='data.snap')
+    daemon.run(max_ticks=1)
+    
+    assert HistoryLog().read()[:100] == state['history']
+    assert len(read_snapshot('data.snap')['history']) == 0
@@ -0,0 +1,104 @@
+"""
+Tests for the columnar candle store
+"""
+
+import os
+
+import numpy as np
+
+from src.store import COLUMNS, ITEMSIZE, CandleStore
+
+
+SYMBOL, TIMEFRAME = 'BTC/USDT', '1h'
+HOUR = 3_600_000
+
+
+def rows(start, stop, base=100.0):
+    """Candles with hourly timestamps start..stop-1 (in hours) and recognisable prices."""
+    return [[i * HOUR, base + i, base + i + 1, base + i - 1, base + i + 0.5, float(i)] for i in range(start, stop)]
+
+
+def test_append_and_read_round_trip(tmp_path):
+    store = CandleStore(str(tmp_path))
+    
+    assert store.append(SYMBOL, TIMEFRAME, rows(0, 10)) == 10
+    
+    assert store.count(SYMBOL, TIMEFRAME) == 10
+    assert store.last_timestamp(SYMBOL, TIMEFRAME) == 9 * HOUR
+    assert store.read_rows(SYMBOL, TIMEFRAME) == rows(0, 10)
+    assert store.read_rows(SYMBOL, TIMEFRAME, limit=3) == rows(7, 10)
+    assert store.read_array(SYMBOL, TIMEFRAME, limit=3).shape == (3, 6)
+    assert store.read(SYMBOL, TIMEFRAME)['timestamp'].dtype == np.dtype('<i8')
+
+
+def test_empty_series(tmp_path):
+    store = CandleStore(str(tmp_path))
+    
+    assert store.count(SYMBOL, TIMEFRAME) == 0
+    assert store.last_timestamp(SYMBOL, TIMEFRAME) is None
+    assert store.read_rows(SYMBOL, TIMEFRAME) == []
+    assert store.read_array(SYMBOL, TIMEFRAME).shape == (0, 6)
+    assert list(store.iter_chunks(SYMBOL, TIMEFRAME)) == []
+    assert store.append(SYMBOL, TIMEFRAME, []) == 0
+
+
+def test_overlapping_append_replaces_the_tail(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append(SYMBOL, TIMEFRAME, rows(0, 10))
+    
+    # Re-sent candles 5..9 (with new prices) plus new ones up to 12
+    assert store.append(SYMBOL, TIMEFRAME, rows(5, 13, base=200.0)) == 13
+    
+    assert store.read_rows(SYMBOL, TIMEFRAME) == rows(0, 5) + rows(5, 13, base=200.0)
+    for column, _ in COLUMNS:
+        assert os.path.getsize(store._path(SYMBOL, TIMEFRAME, column)) == 13 * ITEMSIZE
+
+
+def test_reappending_the_open_candle_updates_it(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append(SYMBOL, TIMEFRAME, rows(0, 5))
+    
+    store.append(SYMBOL, TIMEFRAME, rows(4, 5, base=300.0))
+    
+    assert store.count(SYMBOL, TIMEFRAME) == 5
+    assert store.read_rows(SYMBOL, TIMEFRAME)[-1] == rows(4, 5, base=300.0)[0]
+
+
+def test_interrupted_write_is_repaired_by_the_next_append(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append(SYMBOL, TIMEFRAME, rows(0, 10))
+    
+    # A crash after the first columns of a 3-candle write, the last one cut mid-value
+    for column, dtype in COLUMNS[:2]:
+        with open(store._path(SYMBOL, TIMEFRAME, column), 'ab') as f:
+            f.write(np.zeros(3, dtype=dtype).tobytes())
+    with open(store._path(SYMBOL, TIMEFRAME, COLUMNS[2][0]), 'ab') as f:
+        f.write(b'\0' * 12)
+    
+    assert store.count(SYMBOL, TIMEFRAME) == 10  # Shortest column wins
+    assert store.read_rows(SYMBOL, TIMEFRAME) == rows(0, 10)
+    
+    store.append(SYMBOL, TIMEFRAME, rows(10, 12))
+    
+    assert store.read_rows(SYMBOL, TIMEFRAME) == rows(0, 12)
+    for column, _ in COLUMNS:
+        assert os.path.getsize(store._path(SYMBOL, TIMEFRAME, column)) == 12 * ITEMSIZE
+
+
+def test_iter_chunks_boundaries(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append(SYMBOL, TIMEFRAME, rows(0, 10))
+    expected = store.read_array(SYMBOL, TIMEFRAME)
+    
+    for chunk_size in (1, 3, 5, 10, 11):
+        chunks = list(store.iter_chunks(SYMBOL, TIMEFRAME, chunk_size=chunk_size))
+        assert [len(chunk['close']) for chunk in chunks] == [
+            min(chunk_size, 10 - offset) for offset in range(0, 10, chunk_size)
+        ]
+        joined = np.column_stack([np.concatenate([chunk[c] for chunk in chunks]).astype(np.float64)
+                                  for c, _ in COLUMNS])
+        assert np.array_equal(joined, expected)
+    
+    chunks = list(store.iter_chunks(SYMBOL, TIMEFRAME, chunk_size=4, start=7))
+    assert [chunk['timestamp'].tolist() for chunk in chunks] == [[7 * HOUR, 8 * HOUR, 9 * HOUR]]
+    assert list(store.iter_chunks(SYMBOL, TIMEFRAME, start=10)) == []
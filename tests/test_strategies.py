@@ -0,0 +1,156 @@
+"""
+Tests for the declarative strategy registry
+"""
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from src.bots import RoboQuant, WhaleHunter
+from src.strategies import BUILTIN_STRATEGIES, ENTRY_POINT_GROUP, Strategy, StrategyRegistry, parse_interval
+
+
+HOUR = 3600
+
+
+@pytest.mark.parametrize('value, seconds', [
+    ("30m", 1800), ("12h", 12 * HOUR), ("1d", 86400), ("1w", 604800), ("45s", 45), (" 4h ", 4 * HOUR),
+    ("1.5h", 5400), (90, 90), (2.5, 2.5), ("120", 120), (None, 0), (0, 0)
+])
+def test_parse_interval(value, seconds):
+    assert parse_interval(value) == seconds
+
+
+def test_is_due_once_per_interval_window():
+    strategy = Strategy('S', RoboQuant, interval='12h')
+    day = 1_704_067_200  # 2024-01-01 00:00 UTC
+    
+    assert strategy.is_due(None, day)
+    # A run late in the 00:00-12:00 window, then the next scheduled one a few minutes late
+    assert not strategy.is_due(day + 5 * 60, day + 11 * HOUR)
+    assert strategy.is_due(day + 5 * 60, day + 12 * HOUR + 3 * 60)
+    assert not strategy.is_due(day + 12 * HOUR + 3 * 60, day + 23 * HOUR + 59 * 60)
+    assert strategy.is_due(day + 12 * HOUR + 3 * 60, day + 24 * HOUR)
+    assert Strategy('Always', RoboQuant).is_due(day, day)
+
+
+def test_configure_overrides_only_the_keys_it_sets():
+    registry = StrategyRegistry(BUILTIN_STRATEGIES)
+    
+    registry.configure({
+        'RoboQuant': {'interval': '4h', 'options': {'length': 21}},
+        'WhaleHunter': {'enabled': False},
+        'Momentum': {'target': 'src.bots:RoboQuant', 'interval': '1d', 'color': '#FFAA00'}
+    })
+    
+    robo = registry.strategies['RoboQuant']
+    assert (robo.target, robo.interval, robo.options, robo.color) == ('src.bots:RoboQuant', 4 * HOUR, {'length': 21}, '#FF00FF')
+    assert registry.enabled() == ['AgentClaude', 'RoboQuant', 'Momentum']
+    assert registry.colors(['Momentum'])['Momentum'] == '#FFAA00'
+    with pytest.raises(ValueError):
+        registry.configure({'NoTarget': {'interval': '1h'}})
+
+
+def test_changing_the_target_reloads_the_class():
+    registry = StrategyRegistry({'Bot': {'target': 'src.bots:RoboQuant'}})
+    assert registry.strategies['Bot'].load() is RoboQuant
+    
+    registry.configure({'Bot': {'target': 'src.bots:WhaleHunter'}})
+    
+    assert registry.strategies['Bot'].load() is WhaleHunter
+
+
+def test_create_passes_only_accepted_context_then_options():
+    received = {}
+    
+    def factory(name, length=14):
+        received.update(name=name, length=length)
+        return SimpleNamespace(name=name)
+    
+    def flexible(**kwargs):
+        received.update(kwargs)
+        return SimpleNamespace(name=None)
+    
+    bot = Strategy('Tuned', factory, options={'length': 7}).create(name='Tuned', client=object(), seed='s', clock=None)
+    assert received == {'name': 'Tuned', 'length': 7}
+    assert bot.name == 'Tuned'
+    
+    received.clear()
+    Strategy('Any', flexible, options={'seed': 'override'}).create(name='Any', seed='s')
+    assert received == {'name': 'Any', 'seed': 'override'}
+
+
+def test_create_names_the_bot_after_the_declaration():
+    registry = StrategyRegistry({
+        'RSI-7': {'target': 'src.bots:RoboQuant', 'options': {'length': 7}},
+        'RSI-21': {'target': 'src.bots:RoboQuant', 'options': {'length': 21}}
+    })
+    
+    bots = registry.create_bots(seed=1)  # RoboQuant takes no seed
+    
+    assert {name: (bot.name, bot.length) for name, bot in bots.items()} == {'RSI-7': ('RSI-7', 7), 'RSI-21': ('RSI-21', 21)}
+
+
+def test_modules_are_imported_only_when_created(tmp_path, monkeypatch):
+    module = 'lazy_strategy_under_test'
+    (tmp_path / f"{module}.py").write_text(
+        "from src.bots import RoboQuant\n\n\nclass LazyBot(RoboQuant):\n    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, module, raising=False)
+    
+    registry = StrategyRegistry({
+        'Lazy': {'target': f"{module}:LazyBot", 'interval': '1h'},
+        'Off': {'target': 'lazy_disabled_module:Bot', 'enabled': False}
+    })
+    assert registry.due({}, 0.0) == ['Lazy']
+    assert registry.colors(registry.enabled())
+    assert module not in sys.modules
+    
+    bots = registry.create_bots()
+    
+    assert module in sys.modules
+    assert type(bots['Lazy']).__name__ == 'LazyBot'
+    assert 'lazy_disabled_module' not in sys.modules
+    sys.modules.pop(module)
+
+
+def test_entry_points_are_declared_without_importing(monkeypatch):
+    import importlib.metadata
+    
+    groups = []
+    
+    def entry_points(group):
+        groups.append(group)
+        return [
+            SimpleNamespace(name='Plugin', value='plugin_package.bots:PluginBot'),
+            SimpleNamespace(name='RoboQuant', value='plugin_package.bots:Shadow')
+        ]
+    
+    monkeypatch.setattr(importlib.metadata, 'entry_points', entry_points)
+    registry = StrategyRegistry(BUILTIN_STRATEGIES)
+    
+    registry.load_entry_points()
+    
+    assert groups == [ENTRY_POINT_GROUP]
+    assert registry.strategies['Plugin'].target == 'plugin_package.bots:PluginBot'
+    assert registry.strategies['RoboQuant'].target == 'src.bots:RoboQuant'  # Built-ins are not replaced
+    assert 'plugin_package' not in sys.modules
+
+
+def test_broken_strategies_are_skipped(capsys):
+    registry = StrategyRegistry({
+        'Missing': {'target': 'no_such_strategy_module:Bot'},
+        'Typo': {'target': 'src.bots:RoboQuan'},
+        'BadOptions': {'target': 'src.bots:RoboQuant', 'options': {'lenght': 7}},
+        'RoboQuant': {'target': 'src.bots:RoboQuant'}
+    })
+    
+    bots = registry.create_bots()
+    
+    assert list(bots) == ['RoboQuant']
+    out = capsys.readouterr().out
+    assert "❌ Skipping strategy Missing (no_such_strategy_module:Bot)" in out
+    assert "❌ Skipping strategy Typo" in out
+    assert "❌ Skipping strategy BadOptions" in out
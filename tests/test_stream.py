@@ -0,0 +1,56 @@
+"""
+Tests for the chunked simulation pipeline against one-pass backtests
+"""
+
+import sys
+
+import numpy as np
+import pytest
+
+from src import stream
+from src.backtest import backtest
+from src.bots import RoboQuant, WhaleHunter
+from src.store import CandleStore
+
+
+def random_ohlcv(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 42_000 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.concatenate([[42_000.0], close[:-1]])
+    return np.column_stack([
+        np.arange(n) * 60_000.0, open_, np.maximum(open_, close), np.minimum(open_, close), close, rng.random(n)
+    ])
+
+
+def chunks_of(ohlcv, chunk_size):
+    for start in range(0, len(ohlcv), chunk_size):
+        rows = ohlcv[start:start + chunk_size]
+        yield {column: rows[:, i].astype(dtype) for i, (column, dtype) in enumerate(stream.COLUMNS)}
+
+
+@pytest.mark.parametrize('make_bot', [lambda: RoboQuant(length=7), lambda: WhaleHunter(seed=3)])
+@pytest.mark.parametrize('chunk_size', [97, 500, 5_000])
+def test_stream_matches_one_pass_backtest(make_bot, chunk_size):
+    ohlcv = random_ohlcv(3_000)
+    expected = backtest(make_bot(), ohlcv)
+    
+    result = stream.simulate_stream(make_bot(), chunks_of(ohlcv, chunk_size))
+    
+    assert result['candles'] == len(ohlcv)
+    assert result['trades'] == expected['trades']
+    assert result['final_value'] == pytest.approx(expected['final_value'], rel=1e-9)
+    equity = expected['equity']
+    max_drawdown = np.max(1.0 - equity / np.maximum.accumulate(equity))
+    assert result['max_drawdown'] == pytest.approx(max_drawdown, rel=1e-9)
+
+
+def test_cli_skips_bots_without_signals(tmp_path, monkeypatch, capsys):
+    CandleStore(str(tmp_path)).append('BTC/USDT', '1m', random_ohlcv(500))
+    monkeypatch.setattr(sys, 'argv', ['stream', '--root', str(tmp_path), '--chunk-size', '100'])
+    
+    stream.main()
+    
+    out = capsys.readouterr().out
+    assert "Skipping AgentClaude" in out
+    assert not any(line.startswith('AgentClaude:') for line in out.splitlines())
+    assert any(line.startswith('WhaleHunter:') for line in out.splitlines())
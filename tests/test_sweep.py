@@ -0,0 +1,61 @@
+"""
+Tests for the RoboQuant parameter sweep and its risk-adjusted ranking
+"""
+
+import numpy as np
+import pytest
+
+from src.backtest import backtest, max_drawdown
+from src.bots import RoboQuant
+from src.sweep import MIN_DRAWDOWN, risk_adjusted_score, sweep
+
+
+GRID = dict(lengths=(7, 14, 21), oversold=(25, 30), overbought=(70, 75))
+
+
+def random_walk(n=3_000, seed=0):
+    """Random-walk candles, 1 hour apart."""
+    rng = np.random.default_rng(seed)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    timestamps = np.arange(n, dtype=np.float64) * 3_600_000
+    return np.column_stack([timestamps, close, close, close, close, np.ones(n)])
+
+
+def by_params(results):
+    return {(r['length'], r['oversold'], r['overbought']): r for r in results}
+
+
+def test_workers_over_shared_memory_match_in_process_and_backtest():
+    ohlcv = random_walk()
+    
+    serial = sweep(ohlcv, workers=1, **GRID)
+    parallel = sweep(ohlcv, workers=2, **GRID)
+    
+    assert serial == parallel
+    assert len(serial) == 3 * 2 * 2
+    for (length, oversold, overbought), result in by_params(serial).items():
+        outcome = backtest(RoboQuant(length=length, oversold=oversold, overbought=overbought), ohlcv)
+        assert result['final_value'] == pytest.approx(outcome['final_value'], rel=1e-9)
+        assert result['max_drawdown'] == pytest.approx(max_drawdown(outcome['equity']), rel=1e-9)
+        assert result['trades'] == outcome['trades']
+
+
+def test_results_are_ranked_by_risk_adjusted_score():
+    results = sweep(random_walk(seed=3), workers=1, **GRID)
+    
+    scores = [r['score'] for r in results]
+    assert scores == sorted(scores, reverse=True)
+    for r in results:
+        assert r['total_return'] == pytest.approx(r['final_value'] / 1000.0 - 1)
+        assert r['score'] == risk_adjusted_score(r['total_return'], r['max_drawdown'])
+
+
+def test_score_prefers_lower_risk_over_higher_return():
+    steady = risk_adjusted_score(0.10, 0.05)
+    volatile = risk_adjusted_score(0.20, 0.40)
+    
+    assert steady > volatile
+    # Gains always rank above losses; among losses the smaller one wins
+    assert risk_adjusted_score(0.01, 0.9) > risk_adjusted_score(-0.01, 0.02) > risk_adjusted_score(-0.05, 0.05)
+    # Near-zero drawdowns are floored
+    assert risk_adjusted_score(0.05, 0.0) == pytest.approx(0.05 / MIN_DRAWDOWN)